@@ -2,6 +2,10 @@ from transformer.tfspec import TransformerSpec, TransformerOption
 from transformer.tfdraft import TransformerDraft
 from transformer.core import Core, Material
 from data.core_repo import CoreRepository
+from bobbin.option import default_wire_catalog
+from utils.profiling import StageProfiler
+from pipeline.graph import design_graph
+from pipeline.result_cache import ResultCache
 import numpy as np
 
 class DesignState:
@@ -15,8 +19,8 @@ class DesignState:
         self.tf_option: TransformerOption = None
         self.material: Material = None
         self.catalog = None
-        omit_values = [0.26e-3, 0.29e-3, 0.31e-3, 0.33e-3, 0.34e-3, 0.36e-3] # diameters that are not used
-        full_range = np.arange(0.1e-3, 0.38e-3, 0.01e-3)
-        mask = ~np.any(np.isclose(full_range[:, None], omit_values, rtol=0, atol=1e-10), axis=1)
-        self.catalog = full_range[mask]
+        self.catalog = default_wire_catalog()
+        self.profiler = StageProfiler()    # opt-in stage timings, see the Tools menu
+        self.result_cache = ResultCache()    # turns and wire results kept on disk across sessions
+        self.graph = design_graph(profiler = self.profiler, result_cache = self.result_cache)    # cached turns design, recomputed per changed input
         # print("[DEBUG] Initial catalog:", self.catalog)
\ No newline at end of file
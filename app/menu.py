@@ -5,6 +5,10 @@ from app.workspace_io import (
     import_workspace_from_yaml,
 )
 from app.notebook import TransformerApp
+from utils.profiling import PROFILE_CAPTURE_CPROFILE
+from utils.log import get_logger
+
+logger = get_logger(__name__)
 
 
 class AppMenu:
@@ -13,6 +17,7 @@ class AppMenu:
         self.app = app
         self.menu_bar = tk.Menu(master)
         self._create_file_menu()
+        self._create_tools_menu()
         # Add more menus here later if needed
 
         master.config(menu=self.menu_bar)
@@ -25,6 +30,36 @@ class AppMenu:
         file_menu.add_command(label="Exit", command=self.master.quit)
         self.menu_bar.add_cascade(label="File", menu=file_menu)
 
+    def _create_tools_menu(self):
+        tools_menu = tk.Menu(self.menu_bar, tearoff=0)
+        self.profiling_var = tk.BooleanVar(value = self.app.state.profiler.enabled)
+        tools_menu.add_checkbutton(label="Record Stage Timings", variable=self.profiling_var, command=self.toggle_profiling)
+        tools_menu.add_command(label="Show Stage Timings", command=self.show_stage_timings)
+        tools_menu.add_command(label="Reset Stage Timings", command=self.app.state.profiler.reset)
+        tools_menu.add_separator()
+        tools_menu.add_command(label="Profile Next Run (cProfile)", command=self.capture_next_run)
+        self.menu_bar.add_cascade(label="Tools", menu=tools_menu)
+
+    def toggle_profiling(self):
+        self.app.state.profiler.enabled = self.profiling_var.get()
+
+    def show_stage_timings(self):
+        profiler = self.app.state.profiler
+        if not profiler.enabled and not profiler.stages:
+            messagebox.showinfo("Stage Timings", "Stage timings are off. Enable Tools > Record Stage Timings first.")
+            return
+        logger.info("%s", profiler.report())
+        if profiler.last_capture:
+            logger.info("Last profile capture:\n%s", profiler.last_capture)
+        messagebox.showinfo("Stage Timings", profiler.report() + ("\n\nThe last profile capture was written to the log." if profiler.last_capture else ""))
+
+    def capture_next_run(self):
+        profiler = self.app.state.profiler
+        profiler.enabled = True
+        self.profiling_var.set(True)
+        profiler.capture_next(PROFILE_CAPTURE_CPROFILE)
+        messagebox.showinfo("Profile Next Run", "The next design step (repo load, spec submit, turns design or wire optimization) will be profiled. See Tools > Show Stage Timings afterwards.")
+
     def export_workspace(self):
         filepath = filedialog.asksaveasfilename(defaultextension=".yaml", filetypes=[("YAML Files", "*.yaml")])
         if not filepath:
@@ -1,14 +1,18 @@
 import json, os
-import pandas as pd
 import tkinter as tk
 from tkinter import filedialog, ttk
 from transformer.tfspec import TransformerSpec, TransformerOption
 from transformer.core import Core, Material
 from transformer.tfdraft import TransformerDraft
-from data.core_repo import CoreRepository
+from transformer.sweep import sweep_cores, rank_sweep_results
+from data.core_repo import CoreRepository, ALL_SHEETS, sheet_label
+from data.fileloader import list_sheet_names
 from app.design_state import DesignState
+from app.worker import BusyIndicator
 from app.tooltips import Tooltip
 from utils.tooltips_text import TOOLTIPS_TRANSFORMER, ordinal
+from utils.profiling import STAGE_REPO_LOAD, STAGE_SPEC_SUBMIT
+from pipeline.graph import design_inputs, NODE_DRAFT, NODE_SOLUTIONS
 
 class TransformerDesignTab(tk.Frame):
     def __init__(self, master, state: DesignState, app):
@@ -81,27 +85,59 @@ class TransformerDesignTab(tk.Frame):
 
         # selected_core = self.repo.get_by_model(selected_model)
 
-        # Draft creation and turn design
-        self.state.tf_draft = TransformerDraft()
         if self.state.tf_option is None:
             self.state.tf_option = TransformerOption(turn_use_tolerance = False)
         # self.state.tf_option = TransformerOption(turn_use_tolerance = False)
-        self.state.tf_draft.create_draft(spec=self.state.spec, options=self.state.tf_option)  # Assume tf_option is predefined or optional
-        # self.tf_draft.get_core(selected_core)
-        self.state.tf_draft.get_core(self.state.core)
-        self.state.tf_draft.get_material(self.state.material)
-        self.state.tf_draft.update_draft_n0_min()
-        self.state.solutions = self.state.tf_draft.determine_draft_turns()
-
-        for sol in self.state.solutions:
-            sol.update_draft_windings()
-        self.state.tf_draft.update_draft_windings()
-
-        # Feedback
-        tk.messagebox.showinfo("Success", f"Found {len(self.state.solutions)} design solution(s).")
-        print(f"[INFO] Turns design complete. Found {len(self.state.solutions)} design solution(s)")
-
-        self.solution_select_frame.update_solutions()
+        spec, options, core, material = self.state.spec, self.state.tf_option, self.state.core, self.state.material
+        graph = self.state.graph
+
+        # Turn design off the Tk thread. The design graph only reruns the stages whose inputs changed since the
+        # last run, e.g. editing kl_list only rebuilds the windings and reuses the turns search.
+        def work(task):
+            graph.update(**design_inputs(spec = spec, material = material, core = core, options = options))
+            return graph.get(NODE_DRAFT), graph.get(NODE_SOLUTIONS)
+
+        def done(result):
+            self.state.tf_draft, self.state.solutions = result
+            # Feedback
+            tk.messagebox.showinfo("Success", f"Found {len(self.state.solutions)} design solution(s).")
+            print(f"[INFO] Turns design complete. Found {len(self.state.solutions)} design solution(s)")
+            self.solution_select_frame.update_solutions()
+
+        def failed(e):
+            tk.messagebox.showerror("Turns Design Failed", str(e))
+
+        self.core_select_frame.busy_indicator.run(work, on_done = done, on_error = failed, message = f"Designing turns for {core.name}...")
+
+    def sweep_all_cores(self):
+        if self.state.spec is None or self.state.repo is None:
+            tk.messagebox.showwarning("Missing Data", "Please input spec and load core repo first.")
+            return
+        if self.state.tf_option is None:
+            self.state.tf_option = TransformerOption(turn_use_tolerance = False)
+        spec, options, material, repo = self.state.spec, self.state.tf_option, self.state.material, self.state.repo
+        cache = self.state.result_cache
+
+        def work(task):
+            # Cores run one at a time in this thread so the sweep can be cancelled between cores.
+            results = []
+            total = len(repo.all)
+            for result in sweep_cores(spec, material, repo, options = options, max_workers = 1, cache = cache):
+                task.check_cancelled()
+                results.append(result)
+                task.report(len(results), total, f"Swept {len(results)}/{total} cores")
+            return rank_sweep_results(results)
+
+        def done(results):
+            feasible = [r for r in results if r.feasible]
+            top = "\n".join(str(r) for r in feasible[:10])
+            print(f"[INFO] Core sweep complete. {len(feasible)} of {len(results)} core(s) have a turns solution")
+            tk.messagebox.showinfo("Sweep Complete", f"{len(feasible)} of {len(results)} core(s) have a turns solution.\n\nSmallest feasible cores:\n{top}")
+
+        def failed(e):
+            tk.messagebox.showerror("Sweep Failed", str(e))
+
+        self.core_select_frame.busy_indicator.run(work, on_done = done, on_error = failed, message = "Sweeping cores...")
     
     def to_export(self):
 
@@ -247,6 +283,10 @@ class SpecInputFrame(tk.LabelFrame):
                 self.list_fields[list_field][i].delete(0, tk.END)
     
     def submit_spec(self):
+        with self.state.profiler.stage(STAGE_SPEC_SUBMIT):
+            self._submit_spec()
+
+    def _submit_spec(self):
         try:
 
             kwargs = self.capture_fields()
@@ -456,17 +496,32 @@ class RepoFrame(tk.LabelFrame):
         self.repo_status = tk.Label(self, text="❌ Repo not loaded", fg="red")
         self.repo_status.pack()
 
+        self.busy_indicator = BusyIndicator(self, buttons = [load_btn])
+        self.busy_indicator.pack(pady = 5)
+
     def access_repo(self, path: str, sheet: str):
-        try:
-            self.state.repo = CoreRepository(path, sheet)
+        profiler = self.state.profiler
+
+        # Parsing a workbook (several sheets in worker processes) runs off the Tk thread; the core list is filled in on it.
+        def work(task):
+            with profiler.stage(STAGE_REPO_LOAD):
+                return CoreRepository(path, sheet)
+
+        def done(repo):
+            self.state.repo = repo
             self.core_model_list = [core.name for core in self.state.repo.all]
             self.tab.core_select_frame.core_combobox["values"] = self.core_model_list
             self.tab.core_select_frame.core_combobox["state"] = "readonly"
-            self.repo_status.config(text=f"✅ Repo loaded: {os.path.basename(path)} ({sheet})", fg="green")
+            self.repo_status.config(text=f"✅ Repo loaded: {os.path.basename(path)} ({sheet_label(sheet)}, {len(self.core_model_list)} cores)", fg="green")
+            if self.state.repo.skipped_sheets:
+                print(f"[INFO] Skipped sheets without a core table: {', '.join(self.state.repo.skipped_sheets)}")
             print(f"[INFO] Successfully loaded core repo and updated core list from {path}.")
-        except Exception as e:
-            # tk.messagebox.showerror("Load Error", f"Failed to access repository:\n{e}")
+
+        def failed(e):
             print(f"[ERROR] Failed to access repository: {e}")
+            tk.messagebox.showerror("Load Error", f"Failed to access repository:\n{path}, sheet: {sheet_label(sheet)}\n{e}\nPlease load the core repository manually.")
+
+        self.busy_indicator.run(work, on_done = done, on_error = failed, message = f"Loading {os.path.basename(path)} ({sheet_label(sheet)})...")
 
 
     def load_repo(self):
@@ -474,24 +529,32 @@ class RepoFrame(tk.LabelFrame):
         filepath = os.path.relpath(filepath, start = os.getcwd())
         if filepath:
             try:
-                xls = pd.ExcelFile(filepath)
-                sheet_names = xls.sheet_names
+                sheet_names = list_sheet_names(filepath)
 
                 sheet_selection_window = tk.Toplevel(self.master)
                 sheet_selection_window.title("Select Sheet")
 
-                tk.Label(sheet_selection_window, text="Choose a sheet:").pack(padx=10, pady=5)
-                selected_sheet = tk.StringVar(sheet_selection_window)
-                combo = ttk.Combobox(sheet_selection_window, textvariable=selected_sheet, values=sheet_names, state="readonly")
-                combo.pack(padx=10, pady=5)
-                combo.set(sheet_names[0])  # Default selection
+                tk.Label(sheet_selection_window, text="Choose one or more sheets (Ctrl/Shift-click):").pack(padx=10, pady=5)
+                listbox = tk.Listbox(sheet_selection_window, selectmode=tk.EXTENDED, exportselection=False, height=min(len(sheet_names), 12))
+                for name in sheet_names:
+                    listbox.insert(tk.END, name)
+                listbox.pack(padx=10, pady=5, fill="both", expand=True)
+                listbox.selection_set(0)  # Default selection
 
                 def confirm_selection():
-                    sheet_name = selected_sheet.get()
-                    self.access_repo(filepath, sheet_name)
+                    selected = [sheet_names[i] for i in listbox.curselection()]
+                    if not selected:
+                        return
+                    # Several sheets are loaded in parallel and merged into one repository.
+                    self.access_repo(filepath, selected[0] if len(selected) == 1 else selected)
                     sheet_selection_window.destroy()
 
-                tk.Button(sheet_selection_window, text="OK", command=confirm_selection).pack(pady=10)
+                def load_all_sheets():
+                    self.access_repo(filepath, ALL_SHEETS)
+                    sheet_selection_window.destroy()
+
+                tk.Button(sheet_selection_window, text="OK", command=confirm_selection).pack(side="left", padx=10, pady=10)
+                tk.Button(sheet_selection_window, text="All sheets", command=load_all_sheets).pack(side="right", padx=10, pady=10)
 
             except Exception as e:
                 tk.messagebox.showerror("Load Error", f"Failed to load Excel file:\n{e}")
@@ -502,12 +565,8 @@ class RepoFrame(tk.LabelFrame):
             if "filepath" in data and data["filepath"]:
                 filepath = data["filepath"]
                 if "sheet_name" in data and data["sheet_name"]:
-                    sheet_name = data["sheet_name"]
-                    try:
-                        self.access_repo(filepath, sheet_name)
-                    except Exception as e:
-                        tk.messagebox.showerror("Load Error", f"Failed to access repository:\n{filepath}, sheet: {sheet_name}\n. Please load core repository manually.")    
-        print("[INFO] Successfully imported core repository.")
+                    # The repository loads in the background; access_repo reports the outcome once it finishes.
+                    self.access_repo(filepath, data["sheet_name"])
 
     def capture_fields(self):
         """
@@ -537,6 +596,12 @@ class CoreSelectFrame(tk.LabelFrame):
         self.start_design_button = tk.Button(self, text = "Start designing turns", command = self.tab.design_turns)
         self.start_design_button.pack(pady = 5)
 
+        self.sweep_button = tk.Button(self, text = "Sweep all cores", command = self.tab.sweep_all_cores)
+        self.sweep_button.pack(pady = 5)
+
+        self.busy_indicator = BusyIndicator(self, buttons = [self.start_design_button, self.sweep_button])
+        self.busy_indicator.pack(pady = 5)
+
     def on_core_selected(self, event):
         selected = self.core_combobox.get()
         self.state.core = self.state.repo.get_by_model(selected)
@@ -611,22 +676,24 @@ class SolutionSelectFrame(tk.LabelFrame):
     def update_solutions(self):
         self.tree.delete(*self.tree.get_children())
 
-        for sol_idx, draft in enumerate(self.state.solutions):
+        for sol_idx, solution in enumerate(self.state.solutions):
             # Insert parent solution node
             sol_id = self.tree.insert("", "end", text=f"Solution {sol_idx+1}", values=("", "", "", ""))
-            self.tree.insert(sol_id, "end", text = f"Gap length (mm): {draft.lg * 1e3:.3f}") # unit conversion: m -> mm for displaying gap length
+            self.tree.insert(sol_id, "end", text = f"Gap length (mm): {solution.lg * 1e3:.3f}") # unit conversion: m -> mm for displaying gap length
 
-            for w_idx, winding in enumerate(draft.winding_list):
+            # Solutions are lightweight records; windings are computed without expanding them into drafts.
+            turns_list, _, irms_list = solution.winding_values()
+            for w_idx, (turns, i_rms) in enumerate(zip(turns_list, irms_list)):
                 # Calculate turns ratio = winding turns / input winding turns (assumed index 0)
-                turns_ratio = (winding.turns / draft.winding_list[0].turns) if draft.winding_list else 0
+                turns_ratio = turns / turns_list[0]
                 self.tree.insert(
                     sol_id, "end",
                     text=f"Winding {w_idx}",
                     values=(
-                        winding.role,
-                        winding.turns,
+                        "primary" if w_idx == 0 else "secondary",
+                        turns,
                         f"{turns_ratio:.3f}",
-                        f"{winding.i_rms:.3f}"
+                        f"{i_rms:.3f}"
                     )
                 )
             # Expand solution by default
@@ -652,7 +719,7 @@ class SolutionSelectFrame(tk.LabelFrame):
             tk.messagebox.showerror("Selection error", "Could not find selected solution.")
             return
 
-        self.state.selected_solution = self.state.solutions[idx]
+        self.state.selected_solution = self.state.solutions[idx].to_draft()
         self.status_label.config(text=f"✅ Solution {idx+1} selected", fg="green")
         print(f"[INFO] Selected solution {idx+1}.")
 
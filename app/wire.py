@@ -2,15 +2,20 @@ import tkinter as tk
 from tkinter import ttk, messagebox
 import json, os
 import numpy as np
-from bobbin.ector import fit_wire_ector
-from bobbin.kf_method import fit_wire_kf
-from bobbin.option import WireOption
+from bobbin.option import WireOption, BASIC_WIRE_CONFIG
+from pipeline.result_cache import cached_fit_wire
 from app.design_state import DesignState
 from transformer.tfdraft import TransformerDraft
 from transformer.winding import Winding
 from transformer.core import Core
 from app.tooltips import Tooltip
+from app.worker import BusyIndicator
 from utils.tooltips_text import TOOLTIPS_WIRE
+from utils.log import get_logger
+from utils.serialization import make_yaml_serializable
+from utils.profiling import STAGE_WIRE_FIT
+
+logger = get_logger(__name__)
 
 class WireDesignTab(tk.Frame):
     def __init__(self, master, state: DesignState, app):
@@ -56,7 +61,7 @@ class WireDesignFrame(tk.LabelFrame):
             "use_advanced": False
         }
         self.config["basic"] = self.get_basic_config()
-        print(self.config)
+        logger.debug("Wire design config: %s", self.config)
         self.scalar_field = ["lt", "wb", "hb"]
         self.advanced_field = ["insulator_thickness", "khb", "kwb", "ht", "kf", "Aw"]
         self.list_field = []
@@ -65,15 +70,7 @@ class WireDesignFrame(tk.LabelFrame):
         self.load_wire_cache()
     
     def get_basic_config(self):
-        return {
-            "khb": 0.8,
-            "kwb": 0.9,
-            "insulator_thickness": 3e-5,
-            "ht": 5e-5,
-            "kf": -1,
-            "Aw": -1,
-            "method": "ector_discrete"
-        }
+        return dict(BASIC_WIRE_CONFIG)
 
     def get_effective_config(self):
         return self.config["advanced"] if self.config["use_advanced"] else self.config["basic"]
@@ -127,6 +124,8 @@ class WireDesignFrame(tk.LabelFrame):
 
         run_btn = tk.Button(self, text="Run Optimization", command=self.run_wire_optimization)
         run_btn.grid(row=row, column=1, pady=5, sticky = 'w')
+        self.busy_indicator = BusyIndicator(self, buttons = [run_btn])
+        self.busy_indicator.grid(row=row+1, column=0, columnspan=6, sticky="w")
 
         adv_btn = tk.Button(self, text="Advanced Settings", command=self.open_advanced_settings)
         adv_btn.grid(row=row, column=2, pady=5, sticky="w")
@@ -214,8 +213,7 @@ class WireDesignFrame(tk.LabelFrame):
 
         compiled = {**fundamental, **config_to_use}
 
-        print("[DEBUG] Below is compiled")
-        print(compiled)
+        logger.debug("Compiled wire inputs: %s", compiled)
 
     # if self.state.selected_solution is None:
         winding_list = []
@@ -238,28 +236,33 @@ class WireDesignFrame(tk.LabelFrame):
         )
 
         method = compiled["method"]
-        try:
-            if self.state.selected_solution is None:
+        draft, catalog, profiler, cache = self.state.selected_solution, self.state.catalog, self.state.profiler, self.state.result_cache
+
+        # The solver runs on a worker thread; the result is displayed back on the Tk thread.
+        def work(task):
+            if draft is None:
                 raise Exception("No transformer draft available for optimization.")
             
-            print(f"[INFO] Attempting to optimize wire diameter using method: {method}")
-            if method == "ector_continuous":
-                self.result = fit_wire_ector(self.state.selected_solution, wire_option, discrete=False)
-            elif method == "ector_discrete":
-                self.result = fit_wire_ector(self.state.selected_solution, wire_option, discrete=True, catalog = self.state.catalog)
-            elif method == "kf":
-                self.result = fit_wire_kf(self.state.selected_solution, wire_option)
-            else:
-                raise ValueError("Invalid optimization method")
-            
-            print(f"[INFO] Optimization finished with status: {self.result["status"]}.")
-            self._display_wire_result(self.result, compiled)
+            logger.info("Attempting to optimize wire diameter using method: %s", method)
+            with profiler.stage(STAGE_WIRE_FIT):
+                return cached_fit_wire(draft, wire_option, method, catalog = catalog, cache = cache)
 
+        def done(result):
+            try:
+                self.result = result
+                logger.info("Optimization finished with status: %s.", self.result["status"])
+                self._display_wire_result(self.result, compiled)
 
-            self.save_wire_cache()
-        except Exception as e:
+
+                self.save_wire_cache()
+            except Exception as e:
+                messagebox.showerror("Optimization Failed", str(e))
+
+        def failed(e):
             messagebox.showerror("Optimization Failed", str(e))
 
+        self.busy_indicator.run(work, on_done = done, on_error = failed, message = f"Optimizing wires ({method})...")
+
     def _display_wire_result(self, result_dict, compiled):
         self.output_tree.delete(*self.output_tree.get_children())
 
@@ -629,17 +632,6 @@ class WireAdvancedOptionsWindow(tk.Toplevel):
         except Exception as e:
             tk.messagebox.showerror("Error", f"Failed to apply catalogue:\n{e}")
 
-def make_yaml_serializable(obj):
-    if isinstance(obj, np.ndarray):
-        return obj.tolist()
-    elif isinstance(obj, (np.float32, np.float64, np.int32, np.int64)):
-        return obj.item()
-    elif isinstance(obj, dict):
-        return {k: make_yaml_serializable(v) for k, v in obj.items()}
-    elif isinstance(obj, list):
-        return [make_yaml_serializable(v) for v in obj]
-    else:
-        return obj
 def trim_none_tail(lst):
     """Trim trailing None values from a list."""
     while lst and lst[-1] is None:
@@ -0,0 +1,188 @@
+import queue
+import threading
+import tkinter as tk
+from tkinter import ttk
+from utils.log import get_logger
+
+logger = get_logger(__name__)
+
+# How long BusyIndicator shows that a second task was refused before the running task's status comes back [ms]
+REFUSED_NOTICE_MS = 3000
+
+class TaskCancelled(Exception):
+    """
+    Raised inside a background task by BackgroundTask.check_cancelled once cancel() has been requested.
+    """
+    pass
+
+
+class BackgroundTask:
+    """
+    Runs a function on a worker thread and delivers its progress, result or error back on the Tk thread.
+    The worker never touches Tk: it puts messages on a queue which is polled with widget.after(), so every
+    callback runs on the main loop and may update widgets freely.
+
+    The function is called as fn(task) and may call task.report(done, total, message) for progress and
+    task.check_cancelled() between steps. Cancelling is cooperative: a step that is already running
+    (e.g. one solver call) finishes, but its result is discarded.
+
+    Attributes:
+        widget (tk.Misc): Any widget, used for after() scheduling.
+        cancel_event (threading.Event): Set by cancel().
+    """
+    def __init__(self, widget, fn, on_done = None, on_error = None, on_progress = None, on_cancel = None, poll_ms: int = 50):
+        self.widget = widget
+        self.fn = fn
+        self.on_done = on_done
+        self.on_error = on_error
+        self.on_progress = on_progress
+        self.on_cancel = on_cancel
+        self.poll_ms = poll_ms
+        self.cancel_event = threading.Event()
+        self._queue = queue.Queue()
+        self._thread = None
+
+    @property
+    def running(self) -> bool:
+        return self._thread is not None and self._thread.is_alive()
+
+    @property
+    def cancelled(self) -> bool:
+        return self.cancel_event.is_set()
+
+    def start(self):
+        self._thread = threading.Thread(target = self._run, daemon = True)
+        self._thread.start()
+        self.widget.after(self.poll_ms, self._poll)
+        return self
+
+    def cancel(self):
+        self.cancel_event.set()
+
+    # --- worker thread side ---
+    def report(self, done = None, total = None, message: str = None):
+        self._queue.put(("progress", (done, total, message)))
+
+    def check_cancelled(self):
+        if self.cancelled:
+            raise TaskCancelled()
+
+    def _run(self):
+        try:
+            result = self.fn(self)
+        except TaskCancelled:
+            self._queue.put(("cancelled", None))
+        except Exception as e:
+            logger.exception("Background task failed")
+            self._queue.put(("error", e))
+        else:
+            self._queue.put(("cancelled", None) if self.cancelled else ("done", result))
+
+    # --- Tk thread side ---
+    def _poll(self):
+        try:
+            while True:
+                kind, payload = self._queue.get_nowait()
+                if kind == "progress":
+                    if self.on_progress and not self.cancelled:
+                        self.on_progress(*payload)
+                    continue
+                if kind == "done" and self.on_done:
+                    self.on_done(payload)
+                elif kind == "error" and self.on_error:
+                    self.on_error(payload)
+                elif kind == "cancelled" and self.on_cancel:
+                    self.on_cancel()
+                return
+        except queue.Empty:
+            pass
+        self.widget.after(self.poll_ms, self._poll)
+
+
+class BusyIndicator(tk.Frame):
+    """
+    Progress bar, status text and Cancel button for one BackgroundTask at a time.
+    The bar runs indeterminate until the task reports a total, and the given buttons are disabled while busy.
+    """
+    def __init__(self, master, buttons: list = None):
+        super().__init__(master)
+        self.buttons = buttons if buttons is not None else []
+        self.task = None
+        self.progressbar = ttk.Progressbar(self, mode = "indeterminate", length = 200)
+        self.progressbar.pack(side = "left", padx = 5)
+        self.status_label = tk.Label(self, text = "")
+        self.status_label.pack(side = "left", padx = 5)
+        self.cancel_button = tk.Button(self, text = "Cancel", command = self.cancel, state = "disabled")
+        self.cancel_button.pack(side = "left", padx = 5)
+
+    @property
+    def busy(self) -> bool:
+        return self.task is not None
+
+    def run(self, fn, on_done = None, on_error = None, message: str = "Working...") -> BackgroundTask | None:
+        """
+        Start fn(task) in the background. on_done(result) / on_error(exception) are called on the Tk thread.
+
+        Returns:
+            BackgroundTask: The started task, or None if another task is still running. The refusal is logged and
+            shown in the status label; the running task is not affected.
+        """
+        if self.busy:
+            logger.warning("Not starting '%s': a background task is still running", message)
+            previous, notice = self.status_label.cget("text"), f"Still busy, not started: {message} Wait or press Cancel."
+            self.status_label.config(text = notice)
+            # Restore the running task's status unless it has reported something newer (or finished) meanwhile
+            self.after(REFUSED_NOTICE_MS, lambda: self.status_label.cget("text") == notice and self.status_label.config(text = previous))
+            return None
+
+        def finish(callback):
+            def handler(*args):
+                self._set_idle()
+                if callback:
+                    callback(*args)
+            return handler
+
+        def cancelled():
+            self._set_idle()
+            self.status_label.config(text = "Cancelled")
+            logger.info("Background task cancelled")
+
+        self.task = BackgroundTask(
+            widget = self,
+            fn = fn,
+            on_done = finish(on_done),
+            on_error = finish(on_error),
+            on_progress = self.update_progress,
+            on_cancel = cancelled
+        )
+        for button in self.buttons:
+            button.config(state = "disabled")
+        self.cancel_button.config(state = "normal")
+        self.status_label.config(text = message)
+        self.progressbar.config(mode = "indeterminate", value = 0)
+        self.progressbar.start(10)
+        return self.task.start()
+
+    def update_progress(self, done = None, total = None, message: str = None):
+        if total:
+            if str(self.progressbar.cget("mode")) != "determinate":
+                self.progressbar.stop()
+                self.progressbar.config(mode = "determinate", maximum = total)
+            self.progressbar.config(value = done or 0)
+        if message:
+            self.status_label.config(text = message)
+
+    def cancel(self):
+        if self.task is not None:
+            self.task.cancel()
+            self.status_label.config(text = "Cancelling...")
+            self.cancel_button.config(state = "disabled")
+
+    def _set_idle(self):
+        self.task = None
+        self.progressbar.stop()
+        self.progressbar.config(mode = "determinate", value = 0)
+        self.status_label.config(text = "")
+        self.cancel_button.config(state = "disabled")
+        for button in self.buttons:
+            button.config(state = "normal")
@@ -0,0 +1,102 @@
+"""
+Cold-start import benchmark. Each entry module is imported in a fresh interpreter, so nothing is cached
+between runs, and the median wall time is checked against a budget. Headless entry points must also not
+load tkinter, pandas or cvxpy; those are imported lazily on first use (see utils/lazy.py).
+
+Usage (from the repository root):
+    python benchmarks/import_time.py
+    python benchmarks/import_time.py --repeat 10 --budget-scale 1.5
+"""
+import argparse
+import os
+import statistics
+import subprocess
+import sys
+import time
+
+REPO_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+# Cold-start budget per entry module [s], measured as the whole interpreter run (startup included).
+IMPORT_BUDGETS = {
+    "cli": 0.6,
+    "pipeline.workspace": 0.6,
+    "pipeline.pareto": 0.6,
+    "bobbin.ector": 0.5,
+    "bobbin.kf_method": 0.5,
+    "data.core_repo": 0.5,
+    "circuit.flyback": 0.5,
+    "circuit.forward": 0.5
+}
+
+# Heavy dependencies that a headless import must not load.
+HEAVY_MODULES = ("tkinter", "pandas", "cvxpy")
+
+_PROBE = (
+    "import sys, time\n"
+    "start = time.perf_counter()\n"
+    "import {module}\n"
+    "elapsed = time.perf_counter() - start\n"
+    "print(elapsed, ','.join(m for m in {heavy!r} if m in sys.modules))\n"
+)
+
+
+def measure_import(module: str, repeat: int = 5) -> dict:
+    """
+    Import module in repeat fresh interpreters.
+
+    Returns:
+        dict: "total" (median wall time of the whole run [s]), "import" (median time of the import statement [s])
+        and "heavy" (heavy modules that ended up in sys.modules).
+    """
+    totals, imports, heavy = [], [], set()
+    code = _PROBE.format(module = module, heavy = HEAVY_MODULES)
+    for _ in range(repeat):
+        start = time.perf_counter()
+        out = subprocess.run([sys.executable, "-c", code], cwd = REPO_ROOT, capture_output = True, text = True)
+        totals.append(time.perf_counter() - start)
+        if out.returncode != 0:
+            raise RuntimeError(f"Importing {module} failed:\n{out.stderr}")
+        elapsed, loaded = (out.stdout.strip().splitlines()[-1].split(" ") + [""])[:2]
+        imports.append(float(elapsed))
+        heavy.update(m for m in loaded.split(",") if m)
+    return {"total": statistics.median(totals), "import": statistics.median(imports), "heavy": sorted(heavy)}
+
+
+def run(modules: dict, repeat: int = 5, budget_scale: float = 1.0) -> tuple[dict, list[str]]:
+    """
+    Measure every module and compare it with its budget.
+
+    Returns:
+        tuple: (results by module, list of failure messages)
+    """
+    results, failures = {}, []
+    for module, budget in modules.items():
+        result = measure_import(module, repeat = repeat)
+        result["budget"] = budget * budget_scale
+        results[module] = result
+        if result["total"] > result["budget"]:
+            failures.append(f"{module}: {result['total']:.3f} s is over the budget of {result['budget']:.3f} s")
+        if result["heavy"]:
+            failures.append(f"{module}: loads {', '.join(result['heavy'])} at import time")
+    return results, failures
+
+
+def main(argv = None) -> int:
+    parser = argparse.ArgumentParser(description = "Check the cold-start import time of the headless entry points.")
+    parser.add_argument("modules", nargs = "*", help = "Modules to measure (default: all budgeted modules).")
+    parser.add_argument("--repeat", type = int, default = 5, help = "Fresh interpreters per module (default: 5).")
+    parser.add_argument("--budget-scale", type = float, default = 1.0, help = "Multiply every budget, e.g. on slow machines.")
+    args = parser.parse_args(argv)
+
+    modules = {m: IMPORT_BUDGETS.get(m, max(IMPORT_BUDGETS.values())) for m in args.modules} or IMPORT_BUDGETS
+    results, failures = run(modules, repeat = args.repeat, budget_scale = args.budget_scale)
+    print(f"{'module':<22}{'total [s]':>12}{'import [s]':>12}{'budget [s]':>12}  heavy")
+    for module, r in results.items():
+        print(f"{module:<22}{r['total']:>12.3f}{r['import']:>12.3f}{r['budget']:>12.3f}  {', '.join(r['heavy']) or '-'}")
+    for failure in failures:
+        print(f"[FAIL] {failure}", file = sys.stderr)
+    return 1 if failures else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
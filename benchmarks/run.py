@@ -0,0 +1,322 @@
+"""
+Benchmark suite for the design pipeline hot paths, with a machine-readable baseline.
+
+Usage (from the repository root):
+    python benchmarks/run.py                                   # run and print
+    python benchmarks/run.py --save benchmarks/baseline.json   # record a new baseline
+    python benchmarks/run.py --compare benchmarks/baseline.json --threshold 1.3
+    python benchmarks/run.py -k wire                           # only benchmarks whose name contains "wire"
+
+Compare mode exits with 1 when a benchmark's median is more than threshold times its baseline median.
+Timings depend on the machine, so compare against a baseline recorded on the same machine.
+"""
+import argparse
+import atexit
+import datetime
+import json
+import os
+import platform
+import shutil
+import statistics
+import sys
+import tempfile
+import time
+
+REPO_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+if REPO_ROOT not in sys.path:
+    sys.path.insert(0, REPO_ROOT)
+
+from benchmarks.import_time import measure_import
+
+EXAMPLE_WORKSPACE = os.path.join(REPO_ROOT, "example", "pmp22345", "pmp22345.yaml")
+CORE_DATA = os.path.join(REPO_ROOT, "data", "core_data.xls")
+CORE_SHEET = "Sheet1"
+BASELINE_VERSION = 1
+
+# Entry modules whose cold-start import time is tracked alongside the hot paths
+IMPORT_BENCHMARKS = ("cli", "pipeline.workspace")
+
+BENCHMARKS = {}
+
+
+def benchmark(name: str):
+    """
+    Register a benchmark. The decorated function does the setup and returns the callable that is timed.
+    """
+    def register(setup):
+        BENCHMARKS[name] = setup
+        return setup
+    return register
+
+
+def _example():
+    # Spec, material, core, turns draft and wire option of the example workspace, as the CLI builds them.
+    import yaml
+    from transformer.tfspec import TransformerSpec, TransformerOption
+    from transformer.core import Core, Material
+    from transformer.winding import Winding
+    from transformer.tfdraft import TransformerDraft
+    from bobbin.option import WireOption, BASIC_WIRE_CONFIG
+    from pipeline.graph import MATERIAL_INPUTS
+
+    with open(EXAMPLE_WORKSPACE, "r") as f:
+        data = yaml.safe_load(f)
+    spec_kwargs = dict(data["transformer"]["spec"])
+    material = Material(**{key: spec_kwargs.pop(key, None) for key in MATERIAL_INPUTS})
+    wire_spec = data["wire"]["wire_spec"]
+    core = Core.from_dict(data["transformer"]["core"]["core"])
+    wire_draft = TransformerDraft(
+        winding_list = [Winding(turns = n, i_rms = i) for n, i in zip(wire_spec["ni_list"], wire_spec["irms_list"])],
+        core = Core(window_area = core.window_area, winding_width = wire_spec["wb"], winding_height = wire_spec["hb"])
+    )
+    wire_option = WireOption(
+        ji_list = wire_spec["ji_list"],
+        pi_list = wire_spec["pi_list"],
+        spi_list = wire_spec["spi_list"],
+        lt = wire_spec["lt"],
+        insulator_thickness = BASIC_WIRE_CONFIG["insulator_thickness"],
+        kwb = BASIC_WIRE_CONFIG["kwb"],
+        khb = BASIC_WIRE_CONFIG["khb"],
+        ht = BASIC_WIRE_CONFIG["ht"],
+        kf = 0.3
+    )
+    return {
+        "data": data,
+        "spec": TransformerSpec(**spec_kwargs),
+        "material": material,
+        "core": core,
+        "options": TransformerOption(turn_use_tolerance = True),
+        "wire_draft": wire_draft,
+        "wire_option": wire_option
+    }
+
+
+@benchmark("core_repo.load_uncached")
+def bench_core_repo_uncached():
+    from data.core_repo import CoreRepository
+    return lambda: CoreRepository(CORE_DATA, CORE_SHEET, use_cache = False)
+
+
+@benchmark("core_repo.load_cached")
+def bench_core_repo_cached():
+    from data.core_repo import CoreRepository
+    cache_dir = tempfile.mkdtemp(prefix = "core_db_")
+    atexit.register(shutil.rmtree, cache_dir, True)
+    CoreRepository(CORE_DATA, CORE_SHEET, cache_dir = cache_dir)    # writes the cache into a temporary directory
+    return lambda: CoreRepository(CORE_DATA, CORE_SHEET, cache_dir = cache_dir)
+
+
+@benchmark("turns.determine_draft_turns")
+def bench_determine_draft_turns():
+    from transformer.tfdraft import TransformerDraft
+    ex = _example()
+
+    def run():
+        draft = TransformerDraft()
+        draft.create_draft(spec = ex["spec"], options = ex["options"])
+        draft.get_core(ex["core"])
+        draft.get_material(ex["material"])
+        draft.update_draft_n0_min()
+        return draft.determine_draft_turns()
+    return run
+
+
+@benchmark("turns.sweep_sheet")
+def bench_sweep_sheet():
+    from data.core_repo import CoreRepository
+    from transformer.sweep import sweep_cores
+    ex = _example()
+    repo = CoreRepository(CORE_DATA, CORE_SHEET)
+    return lambda: list(sweep_cores(ex["spec"], ex["material"], repo, options = ex["options"]))
+
+
+@benchmark("wire.optimize_diameter")
+def bench_optimize_diameter():
+    from bobbin.ector import compile_opt_prob, optimize_diameter
+    ex = _example()
+    compiled = compile_opt_prob(ex["wire_draft"], ex["wire_option"])
+    return lambda: optimize_diameter(compiled)
+
+
+@benchmark("wire.optimize_diameter_cvxpy")
+def bench_optimize_diameter_cvxpy():
+    from bobbin.ector import compile_opt_prob, optimize_diameter, ECTOR_SOLVER_CVXPY
+    ex = _example()
+    compiled = compile_opt_prob(ex["wire_draft"], ex["wire_option"])
+    return lambda: optimize_diameter(compiled, solver = ECTOR_SOLVER_CVXPY)
+
+
+@benchmark("wire.optimize_diameter_discrete")
+def bench_optimize_diameter_discrete():
+    from bobbin.ector import compile_opt_prob, optimize_diameter_discrete
+    from bobbin.option import default_wire_catalog
+    ex = _example()
+    compiled = compile_opt_prob(ex["wire_draft"], ex["wire_option"])
+    catalog = default_wire_catalog()
+    return lambda: optimize_diameter_discrete(compiled, catalog = catalog)
+
+
+@benchmark("wire.optimize_diameter_discrete_cvxpy")
+def bench_optimize_diameter_discrete_cvxpy():
+    from bobbin.ector import compile_opt_prob, optimize_diameter_discrete, ECTOR_SOLVER_CVXPY
+    from bobbin.option import default_wire_catalog
+    ex = _example()
+    compiled = compile_opt_prob(ex["wire_draft"], ex["wire_option"])
+    catalog = default_wire_catalog()
+    return lambda: optimize_diameter_discrete(compiled, catalog = catalog, solver = ECTOR_SOLVER_CVXPY)
+
+
+@benchmark("wire.fit_wire_kf")
+def bench_fit_wire_kf():
+    from bobbin.kf_method import fit_wire_kf
+    ex = _example()
+    return lambda: fit_wire_kf(ex["wire_draft"], ex["wire_option"])
+
+
+@benchmark("workspace.pmp22345")
+def bench_workspace():
+    from pipeline.workspace import run_workspace
+    ex = _example()
+    return lambda: run_workspace(ex["data"])
+
+
+def time_callable(fn, repeat: int = 7, min_time: float = 0.05) -> dict:
+    """
+    Time fn like timeit: the loop count is doubled until one round takes min_time, then repeat rounds are run.
+
+    Returns:
+        dict: "median" and "min" seconds per call, "loops" per round and "repeat".
+    """
+    fn()    # warm-up, e.g. lazy imports and caches
+    loops = 1
+    while True:
+        start = time.perf_counter()
+        for _ in range(loops):
+            fn()
+        elapsed = time.perf_counter() - start
+        if elapsed >= min_time:
+            break
+        loops *= 2
+    rounds = [elapsed / loops]
+    for _ in range(repeat - 1):
+        start = time.perf_counter()
+        for _ in range(loops):
+            fn()
+        rounds.append((time.perf_counter() - start) / loops)
+    return {"median": statistics.median(rounds), "min": min(rounds), "loops": loops, "repeat": repeat}
+
+
+def run_benchmarks(pattern: str = None, repeat: int = 7, imports: bool = True) -> dict:
+    """
+    Run the registered benchmarks (and the import benchmarks) whose name contains pattern.
+    Runs inside a temporary working directory so the core cache does not land in the tree.
+    """
+    results = {}
+    cwd = os.getcwd()
+    with tempfile.TemporaryDirectory() as workdir:
+        os.chdir(workdir)
+        try:
+            for name, setup in BENCHMARKS.items():
+                if pattern and pattern not in name:
+                    continue
+                results[name] = time_callable(setup(), repeat = repeat)
+                print(f"{name:<42}{_format_time(results[name]['median']):>12}", file = sys.stderr)
+        finally:
+            os.chdir(cwd)
+    if imports:
+        for module in IMPORT_BENCHMARKS:
+            name = f"import.{module}"
+            if pattern and pattern not in name:
+                continue
+            measured = measure_import(module, repeat = repeat)
+            results[name] = {"median": measured["total"], "min": measured["total"], "loops": 1, "repeat": repeat}
+            print(f"{name:<42}{_format_time(measured['total']):>12}", file = sys.stderr)
+    return results
+
+
+def environment() -> dict:
+    import numpy as np
+    return {
+        "python": platform.python_version(),
+        "numpy": np.__version__,
+        "platform": platform.platform(),
+        "machine": platform.machine(),
+        "date": datetime.date.today().isoformat()
+    }
+
+
+def compare(results: dict, baseline: dict, threshold: float = 1.3) -> tuple[list[dict], list[str]]:
+    """
+    Compare medians with a baseline.
+
+    Returns:
+        tuple: (one row per benchmark with name, baseline, current, ratio and status, list of regressed names)
+    """
+    rows, regressions = [], []
+    base_results = baseline.get("results", {})
+    for name, result in results.items():
+        base = base_results.get(name)
+        if base is None:
+            rows.append({"name": name, "baseline": None, "current": result["median"], "ratio": None, "status": "new"})
+            continue
+        ratio = result["median"] / base["median"] if base["median"] > 0 else float("inf")
+        status = "slower" if ratio > threshold else ("faster" if ratio < 1 / threshold else "ok")
+        if status == "slower":
+            regressions.append(name)
+        rows.append({"name": name, "baseline": base["median"], "current": result["median"], "ratio": ratio, "status": status})
+    return rows, regressions
+
+
+def _format_time(seconds) -> str:
+    if seconds is None:
+        return "-"
+    for unit, scale in (("s", 1), ("ms", 1e-3), ("us", 1e-6)):
+        if seconds >= scale:
+            return f"{seconds / scale:.3g} {unit}"
+    return f"{seconds / 1e-9:.3g} ns"
+
+
+def main(argv = None) -> int:
+    parser = argparse.ArgumentParser(description = "Benchmark the design pipeline hot paths.")
+    parser.add_argument("-k", dest = "pattern", help = "Only run benchmarks whose name contains this text.")
+    parser.add_argument("--repeat", type = int, default = 7, help = "Timed rounds per benchmark (default: 7).")
+    parser.add_argument("--no-imports", action = "store_true", help = "Skip the import-time benchmarks.")
+    parser.add_argument("--save", help = "Write the results as a baseline JSON file.")
+    parser.add_argument("--compare", help = "Baseline JSON file to compare the results with.")
+    parser.add_argument("--threshold", type = float, default = 1.3, help = "Allowed slowdown factor in compare mode (default: 1.3).")
+    parser.add_argument("--list", action = "store_true", help = "List the benchmark names and exit.")
+    args = parser.parse_args(argv)
+
+    if args.list:
+        for name in list(BENCHMARKS) + [f"import.{m}" for m in IMPORT_BENCHMARKS]:
+            print(name)
+        return 0
+
+    results = run_benchmarks(pattern = args.pattern, repeat = args.repeat, imports = not args.no_imports)
+    report = {"version": BASELINE_VERSION, "environment": environment(), "results": results}
+
+    if args.save:
+        with open(args.save, "w") as f:
+            json.dump(report, f, indent = 2)
+            f.write("\n")
+        print(f"[INFO] Wrote {args.save}", file = sys.stderr)
+
+    if not args.compare:
+        if not args.save:
+            print(json.dumps(report, indent = 2))
+        return 0
+
+    with open(args.compare, "r") as f:
+        baseline = json.load(f)
+    rows, regressions = compare(results, baseline, threshold = args.threshold)
+    print(f"{'benchmark':<42}{'baseline':>12}{'current':>12}{'ratio':>8}  status")
+    for row in rows:
+        ratio = "-" if row["ratio"] is None else f"{row['ratio']:.2f}"
+        print(f"{row['name']:<42}{_format_time(row['baseline']):>12}{_format_time(row['current']):>12}{ratio:>8}  {row['status']}")
+    for name in regressions:
+        print(f"[FAIL] {name} is more than {args.threshold}x slower than the baseline", file = sys.stderr)
+    return 1 if regressions else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
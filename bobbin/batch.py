@@ -0,0 +1,221 @@
+import numpy as np
+from bobbin.option import WireOption
+from bobbin.ector import cal_di_min_list, cal_di_max_list, cal_li_list, cal_sum_upper_bound
+from utils.formulae import convert_area_diameter
+from utils.log import get_logger
+
+logger = get_logger(__name__)
+
+WIRE_BATCH_METHODS = ("ector_continuous", "ector_discrete", "kf")
+
+
+class WireFitTable:
+    """
+    Results of fit_wire_batch, one row per (draft, option) pair. Per-winding columns are (rows, windings) arrays
+    padded with NaN for drafts that have fewer windings than the widest one.
+
+    Attributes:
+        method (str): "ector_continuous", "ector_discrete" or "kf".
+        draft_index (np.ndarray): Index into the drafts passed to fit_wire_batch.
+        option_index (np.ndarray): Index into the options passed to fit_wire_batch.
+        windings (np.ndarray): Number of windings of each row's draft.
+        feasible (np.ndarray): True where a wire set was found (doc: status "optimal", or the kf window check passes).
+        di (np.ndarray): Wire diameters [m]. (doc: Di)
+        li (np.ndarray): Layers per winding. (doc: li) NaN for the kf method.
+        j_cal (np.ndarray): Current density of the chosen wires [A/m²].
+        fill_rate (np.ndarray): Width fill rate per winding. NaN for the kf method.
+        wire_area (np.ndarray): Wire area per winding [m²]. Only set for the kf method.
+        height_required (np.ndarray): Bobbin height used [m]. (doc: hr) NaN for the kf method.
+        required_window_area (np.ndarray): Copper window area needed [m²]. Only set for the kf method.
+    """
+    def __init__(self, method: str, draft_index: np.ndarray, option_index: np.ndarray, windings: np.ndarray, width: int):
+        rows = len(draft_index)
+        self.method = method
+        self.draft_index = draft_index
+        self.option_index = option_index
+        self.windings = windings
+        self.feasible = np.zeros(rows, dtype = bool)
+        self.di = np.full((rows, width), np.nan)
+        self.li = np.full((rows, width), np.nan)
+        self.j_cal = np.full((rows, width), np.nan)
+        self.fill_rate = np.full((rows, width), np.nan)
+        self.wire_area = np.full((rows, width), np.nan)
+        self.height_required = np.full(rows, np.nan)
+        self.required_window_area = np.full(rows, np.nan)
+
+    def __len__(self):
+        return len(self.draft_index)
+
+    def row(self, i: int) -> dict:
+        """
+        Row i in the result dict format of fit_wire_ector / fit_wire_kf, e.g. for TransformerDraft.apply_wire.
+        The arrays are copies, so the row stays valid once the table is modified or released.
+        """
+        n = int(self.windings[i])
+        feasible = bool(self.feasible[i])
+        if self.method == "kf":
+            return {
+                "status": feasible,
+                "di_list": self.di[i, :n].copy() if feasible else None,
+                "j_cal_list": self.j_cal[i, :n].copy() if feasible else None,
+                "required_window_area": self.required_window_area[i] if feasible else None,
+                "wa_list": list(self.wire_area[i, :n]) if feasible else None,
+                "method": "kf"
+            }
+        return {
+            "status": "optimal" if feasible else "infeasible",
+            "di_list": self.di[i, :n].copy() if feasible else None,
+            "li_list": self.li[i, :n].copy(),
+            "j_cal_list": self.j_cal[i, :n].copy() if feasible else None,
+            "fill_rate_list": self.fill_rate[i, :n].copy() if feasible else None,
+            "height_required": self.height_required[i] if feasible else None,
+            "method": self.method
+        }
+
+    def __str__(self):
+        return f"WireFitTable ({self.method}): {int(self.feasible.sum())} of {len(self)} pairs feasible"
+
+
+def _draft_arrays(draft):
+    # TransformerDraft keeps its windings in a WindingTable; a TurnsSolution computes them on demand.
+    windings = getattr(draft, "windings", None)
+    if windings is not None:
+        return np.asarray(windings.turns, dtype = float), np.asarray(windings.i_rms, dtype = float), draft.core
+    turns, _, irms = draft.winding_values()
+    return np.asarray(turns, dtype = float), np.asarray(irms, dtype = float), draft.core
+
+
+def _pad(values, width: int, fill: float = np.nan) -> np.ndarray:
+    row = np.full(width, fill)
+    values = np.asarray(values[:width], dtype = float)
+    row[:len(values)] = values
+    return row
+
+
+def compile_wire_batch(drafts: list, options: list[WireOption]) -> dict:
+    """
+    Batched counterpart of compile_opt_prob for every (draft, option) pair, draft-major.
+    Per-winding entries are (pairs, windings) arrays, per-pair scalars are (pairs,) arrays.
+    """
+    draft_arrays = [_draft_arrays(draft) for draft in drafts]
+    width = max((len(ni) for ni, _, _ in draft_arrays), default = 0)
+    nd, no = len(drafts), len(options)
+
+    ni = np.array([_pad(a[0], width) for a in draft_arrays]).reshape(nd, width)
+    irms = np.array([_pad(a[1], width) for a in draft_arrays]).reshape(nd, width)
+    core_values = np.array([[a[2].winding_width, a[2].winding_height, a[2].window_area] for a in draft_arrays], dtype = float).reshape(nd, 3)
+    windings = np.array([len(a[0]) for a in draft_arrays], dtype = int)
+
+    def option_rows(attr):
+        return np.array([_pad(getattr(o, attr), width) if getattr(o, attr) is not None else np.full(width, np.nan) for o in options]).reshape(no, width)
+
+    def option_scalar(attr):
+        return np.array([np.nan if getattr(o, attr) is None else getattr(o, attr) for o in options], dtype = float)
+
+    def per_pair(draft_values, option_values):
+        # (nd, ...) x (no, ...) -> (nd * no, ...)
+        if draft_values is not None:
+            return np.repeat(draft_values, no, axis = 0)
+        return np.tile(option_values, (nd,) + (1,) * (option_values.ndim - 1))
+
+    valid = np.arange(width)[None, :] < windings[:, None]
+    return {
+        "draft_index": np.repeat(np.arange(nd), no),
+        "option_index": np.tile(np.arange(no), nd),
+        "windings": per_pair(windings, None),
+        "valid": per_pair(valid, None),
+        "ni_list": per_pair(ni, None),
+        "irms_list": per_pair(irms, None),
+        "ji_list": per_pair(None, option_rows("ji_list")),
+        "pi_list": per_pair(None, option_rows("pi_list")),
+        "spi_list": per_pair(None, option_rows("spi_list")),
+        "insulator_thickness": per_pair(None, option_scalar("insulator_thickness")),
+        "kwb": per_pair(None, option_scalar("kwb")),
+        "khb": per_pair(None, option_scalar("khb")),
+        "ht": per_pair(None, option_scalar("ht")),
+        "lt": per_pair(None, option_scalar("lt")),
+        "kf": per_pair(None, option_scalar("kf")),
+        "wb": per_pair(core_values[:, 0], None),
+        "hb": per_pair(core_values[:, 1], None),
+        "window_area": per_pair(core_values[:, 2], None)
+    }
+
+
+def fit_wire_batch(drafts: list, options: list[WireOption], method: str = "ector_continuous", catalog = None) -> WireFitTable:
+    """
+    Fit wires for every (draft, option) pair in one vectorized pass.
+    Gives the same wires as calling fit_wire_ector (default solvers) or fit_wire_kf on each pair.
+
+    Parameters:
+        drafts (list[TransformerDraft | TurnsSolution]): Drafts to fit. Turns solutions are used without expanding them.
+        options (list[WireOption]): Wire option presets, each applied to every draft.
+        method (str): "ector_continuous", "ector_discrete" or "kf".
+        catalog (array-like, optional): Wire diameters [m] for "ector_discrete". Required for that method.
+
+    Returns:
+        WireFitTable: Row i holds the pair (drafts[table.draft_index[i]], options[table.option_index[i]]).
+    """
+    if method not in WIRE_BATCH_METHODS:
+        raise ValueError(f"Unknown wire fit method '{method}'. Use one of {list(WIRE_BATCH_METHODS)}.")
+    if method == "ector_discrete" and catalog is None:
+        raise ValueError("The discrete ector method needs a wire diameter catalog.")
+
+    c = compile_wire_batch(drafts, options)
+    table = WireFitTable(method, c["draft_index"], c["option_index"], c["windings"], c["valid"].shape[1])
+    if len(table) == 0:
+        return table
+    valid = c["valid"]
+    ni, irms, ji, pi, spi = c["ni_list"], c["irms_list"], c["ji_list"], c["pi_list"], c["spi_list"]
+
+    with np.errstate(divide = "ignore", invalid = "ignore"):
+        if method == "kf":
+            wire_area = np.where(valid, irms / ji, np.nan)
+            required = np.nansum(wire_area * ni, axis = 1) / c["kf"]
+            table.feasible = required <= c["window_area"]
+            ok = table.feasible[:, None] & valid
+            table.wire_area = np.where(ok, wire_area, np.nan)
+            table.di = np.where(ok, convert_area_diameter(area = wire_area), np.nan)
+            table.j_cal = np.where(ok, ji, np.nan)
+            table.required_window_area = np.where(table.feasible, required, np.nan)
+            logger.debug("%s", table)
+            return table
+
+        if np.isnan(c["lt"]).any():
+            raise ValueError("Every wire option needs lt for the ector methods.")
+        t = c["insulator_thickness"][:, None]
+        di_min = cal_di_min_list(irms_list = irms, ji_list = ji, spi_list = spi, pi_list = pi)
+        li = cal_li_list(ni_list = ni, spi_list = spi, di_min_list = di_min, insulator_thickness = t, wb = c["wb"][:, None], kwb = c["kwb"][:, None])
+        di_max = cal_di_max_list(wb = c["wb"][:, None], kwb = c["kwb"][:, None], spi_list = spi, ni_list = ni, li_list = li, insulator_thickness = t)
+        sum_upper_bound = cal_sum_upper_bound(hb = c["hb"], khb = c["khb"], ht = c["ht"], lt = c["lt"])
+        # Padded windings take no height and never make a pair infeasible.
+        weights = np.where(valid, li * pi, 0.0)
+        lo = np.where(valid, di_min, 0.0)
+        hi = np.where(valid, di_max, np.inf)
+
+        if method == "ector_continuous":
+            # Same closed form as solve_diameter_lp, row-wise.
+            height_used = np.sum((lo + t) * weights, axis = 1)
+            feasible = np.all(lo <= hi, axis = 1) & (height_used <= sum_upper_bound)
+            di = lo.copy()
+            di[:, 0] = np.minimum(hi[:, 0], lo[:, 0] + (sum_upper_bound - height_used) / weights[:, 0])
+        else:
+            # Same enumeration as solve_diameter_discrete, row-wise.
+            catalog = np.sort(np.asarray(catalog, dtype = float))
+            allowed = (catalog >= lo[:, :, None]) & (catalog <= hi[:, :, None])
+            allowed |= ~valid[:, :, None]
+            feasible = allowed.any(axis = 2).all(axis = 1)
+            di = np.where(valid, catalog[allowed.argmax(axis = 2)], 0.0)
+            height_others = np.sum((di[:, 1:] + t) * weights[:, 1:], axis = 1)
+            fits = allowed[:, 0, :] & ((catalog[None, :] + t) * weights[:, :1] + height_others[:, None] <= sum_upper_bound[:, None])
+            feasible &= fits.any(axis = 1)
+            di[:, 0] = catalog[len(catalog) - 1 - fits[:, ::-1].argmax(axis = 1)]
+
+        ok = feasible[:, None] & valid
+        table.feasible = feasible
+        table.li = np.where(valid, li, np.nan)
+        table.di = np.where(ok, di, np.nan)
+        table.fill_rate = np.where(ok, (t + di) * (ni / li) * spi / c["wb"][:, None], np.nan)
+        table.j_cal = np.where(ok, 4 * irms / (pi * spi * np.pi * di ** 2), np.nan)
+        table.height_required = np.where(feasible, np.sum(np.where(valid, (di + t) * li * pi, 0.0), axis = 1) + c["ht"] * c["lt"], np.nan)
+    logger.debug("%s", table)
+    return table
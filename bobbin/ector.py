@@ -1,23 +1,28 @@
 import numpy as np
-import cvxpy as cp
+from utils.lazy import lazy_import
 from transformer.tfdraft import TransformerDraft
 from bobbin.option import WireOption
+from utils.profiling import solver_timed
+from utils.log import get_logger
 
-def compile_opt_prob(draft: TransformerDraft, option: WireOption):
+logger = get_logger(__name__)
+cp = lazy_import("cvxpy", needed_for = "the cvxpy ector solvers")
+
+# Solvers for the continuous ector fit
+ECTOR_SOLVER_CLOSED_FORM = "closed_form"
+ECTOR_SOLVER_CVXPY = "cvxpy"
+# Solvers for the discrete ector fit (ECTOR_SOLVER_CVXPY needs a MIP-capable backend)
+ECTOR_SOLVER_ENUMERATION = "enumeration"
 
-    channel_number = len(draft.winding_list)
-    irms_list = np.zeros(channel_number)
-    ji_list = np.zeros(channel_number)
-    pi_list = np.zeros(channel_number)
-    spi_list = np.zeros(channel_number)
-    ni_list = np.zeros(channel_number)
+def compile_opt_prob(draft: TransformerDraft, option: WireOption):
 
-    for i, winding in enumerate(draft.winding_list):
-        irms_list[i] = winding.i_rms
-        ni_list[i] = winding.turns
-        ji_list[i] = option.ji_list[i]
-        pi_list[i] = option.pi_list[i]
-        spi_list[i] = option.spi_list[i]
+    # The winding table is already column-wise, so the current and turns columns are used as they are.
+    channel_number = len(draft.windings)
+    irms_list = draft.windings.i_rms
+    ni_list = draft.windings.turns
+    ji_list = np.asarray(option.ji_list[:channel_number], dtype = float)
+    pi_list = np.asarray(option.pi_list[:channel_number], dtype = float)
+    spi_list = np.asarray(option.spi_list[:channel_number], dtype = float)
 
     compiled = {
         'irms_list': irms_list,
@@ -33,10 +38,58 @@ def compile_opt_prob(draft: TransformerDraft, option: WireOption):
         'wb': draft.core.winding_width,
         'hb': draft.core.winding_height
     }
-    # print(compiled)
+    logger.debug("Compiled wire problem: %s", compiled)
     return compiled
 
-def optimize_diameter(compiled):
+@solver_timed
+def solve_diameter_lp(di_min_list, di_max_list, weights, insulator_thickness, sum_upper_bound):
+    """
+    Exact solution of the continuous ector LP:
+        maximize di[0]  s.t.  di_min <= di <= di_max,  (di + t) @ weights <= sum_upper_bound
+    with weights = li * pi >= 0. Raising any other di only consumes height, so the other windings sit at their
+    lower bound and di[0] takes whatever height is left, clipped to its upper bound.
+
+    Returns:
+        tuple[str, np.ndarray]: cvxpy-style status ("optimal" or "infeasible") and di_list (None if infeasible).
+    """
+    di_min_list = np.asarray(di_min_list, dtype = float)
+    di_max_list = np.asarray(di_max_list, dtype = float)
+    weights = np.asarray(weights, dtype = float)
+    # Written so that missing (NaN) dimensions make the problem infeasible instead of passing the checks.
+    if not np.all(di_min_list <= di_max_list):
+        return "infeasible", None
+    height_used = (di_min_list + insulator_thickness) @ weights
+    if not height_used <= sum_upper_bound:
+        return "infeasible", None
+    di_list = di_min_list.copy()
+    if weights[0] > 0:
+        di_list[0] = min(di_max_list[0], di_min_list[0] + (sum_upper_bound - height_used) / weights[0])
+    else:
+        di_list[0] = di_max_list[0]
+    return "optimal", di_list
+
+@solver_timed
+def _solve_diameter_lp_cvxpy(di_min_list, di_max_list, weights, insulator_thickness, sum_upper_bound):
+    di_list = cp.Variable(len(di_min_list))
+    objective = cp.Maximize(di_list[0])
+    
+    constraints = [di_list >= di_min_list,
+                  di_list <= di_max_list,
+                  (di_list + insulator_thickness) @ weights <= sum_upper_bound]
+    
+    problem = cp.Problem(objective, constraints)
+    problem.solve()
+    return problem.status, di_list.value
+
+def optimize_diameter(compiled, solver: str = ECTOR_SOLVER_CLOSED_FORM, cross_check: bool = False):
+    """
+    Continuous ector fit: the largest primary diameter that fits the bobbin height.
+
+    Parameters:
+        compiled (dict): Output of compile_opt_prob.
+        solver (str): "closed_form" (solve_diameter_lp) or "cvxpy".
+        cross_check (bool): Also solve with the other solver and log a warning if the primary diameters disagree.
+    """
     # print(compiled)
 
     irms_list = compiled['irms_list']
@@ -57,15 +110,22 @@ def optimize_diameter(compiled):
     di_max_list = cal_di_max_list(wb = wb, kwb = kwb, spi_list = spi_list, ni_list = ni_list, li_list = li_list, insulator_thickness = insulator_thickness)
     sum_upper_bound = cal_sum_upper_bound(hb = hb, khb = khb, ht = ht, lt = lt)
 
-    di_list = cp.Variable(len(irms_list))
-    objective = cp.Maximize(di_list[0])
-    
-    constraints = [di_list >= di_min_list,
-                  di_list <= di_max_list,
-                  (di_list + insulator_thickness) @ (li_list * pi_list) <= sum_upper_bound]
-    
-    problem = cp.Problem(objective, constraints)
-    problem.solve()
+    solvers = {
+        ECTOR_SOLVER_CLOSED_FORM: solve_diameter_lp,
+        ECTOR_SOLVER_CVXPY: _solve_diameter_lp_cvxpy
+    }
+    if solver not in solvers:
+        raise ValueError(f"Unknown ector solver '{solver}'. Use one of {list(solvers)}.")
+    lp_args = (di_min_list, di_max_list, li_list * pi_list, insulator_thickness, sum_upper_bound)
+    status, di_values = solvers[solver](*lp_args)
+    logger.debug("Continuous ector fit (%s) finished with status %s, di_list %s", solver, status, di_values)
+
+    if cross_check:
+        other = ECTOR_SOLVER_CVXPY if solver == ECTOR_SOLVER_CLOSED_FORM else ECTOR_SOLVER_CLOSED_FORM
+        other_status, other_values = solvers[other](*lp_args)
+        same_status = (status == "optimal") == (other_status == "optimal")
+        if not same_status or (status == "optimal" and not np.isclose(di_values[0], other_values[0], rtol = 1e-6, atol = 1e-9)):
+            logger.warning("Ector solvers disagree: %s gives %s %s, %s gives %s %s", solver, status, di_values, other, other_status, other_values)
 
     # Output
     # print("Optimal value:", problem.value)
@@ -75,7 +135,7 @@ def optimize_diameter(compiled):
     # print("The required height is:", hr)
 
     result = {
-        "status": problem.status,
+        "status": status,
         "di_list": None,
         "li_list": li_list,
         "j_cal_list": None,
@@ -84,14 +144,14 @@ def optimize_diameter(compiled):
         "method": "ector_continuous"
     }
 
-    if problem.status == "optimal":
+    if status == "optimal":
 
-        fill_rate = (insulator_thickness + di_list.value) * (ni_list / li_list) * spi_list / wb
-        j_cal = 4 * irms_list / (pi_list * spi_list * np.pi * (di_list.value ** 2))
-        hr = np.sum((di_list.value + insulator_thickness) * li_list * pi_list) + ht * lt
+        fill_rate = (insulator_thickness + di_values) * (ni_list / li_list) * spi_list / wb
+        j_cal = 4 * irms_list / (pi_list * spi_list * np.pi * (di_values ** 2))
+        hr = np.sum((di_values + insulator_thickness) * li_list * pi_list) + ht * lt
 
         result.update({
-            "di_list": di_list.value,
+            "di_list": di_values,
             "fill_rate_list": fill_rate,
             "j_cal_list": j_cal,
             "height_required": hr
@@ -99,24 +159,91 @@ def optimize_diameter(compiled):
 
     return result
 
-def fit_wire_ector(draft: TransformerDraft, option: WireOption, discrete: bool = False, catalog = None):
+def fit_wire_ector(draft: TransformerDraft, option: WireOption, discrete: bool = False, catalog = None, solver: str = None):
+    # solver None picks the default of each method (closed form / enumeration)
     compiled = compile_opt_prob(draft = draft, option = option)
     result = None
     if discrete:
-        result = optimize_diameter_discrete(compiled = compiled, catalog = catalog)
+        result = optimize_diameter_discrete(compiled = compiled, catalog = catalog, solver = solver or ECTOR_SOLVER_ENUMERATION)
     else:
-        result = optimize_diameter(compiled = compiled)
+        result = optimize_diameter(compiled = compiled, solver = solver or ECTOR_SOLVER_CLOSED_FORM)
     # result = optimize_diameter(compiled = compiled)
     # result = optimize_diameter_discrete(compiled = compiled, catalog = None)
     return result
     
-def optimize_diameter_discrete(compiled, catalog=None):
+@solver_timed
+def solve_diameter_discrete(catalog, di_min_list, di_max_list, weights, insulator_thickness, sum_upper_bound):
+    """
+    Exact solution of the discrete ector problem:
+        maximize di[0]  s.t.  di[i] in catalog,  di_min <= di <= di_max,  (di + t) @ weights <= sum_upper_bound
+    Only di[0] is in the objective and weights = li * pi >= 0, so every other winding takes its smallest allowed
+    catalog diameter, and di[0] is the largest allowed catalog diameter that fits the remaining height.
+
+    Returns:
+        tuple[str, np.ndarray]: cvxpy-style status ("optimal" or "infeasible") and di_list (None if infeasible).
+    """
+    catalog = np.sort(np.asarray(catalog, dtype = float))
+    di_min_list = np.asarray(di_min_list, dtype = float)
+    di_max_list = np.asarray(di_max_list, dtype = float)
+    weights = np.asarray(weights, dtype = float)
+
+    # allowed[i, j]: winding i may use catalog[j]
+    allowed = (catalog[None, :] >= di_min_list[:, None]) & (catalog[None, :] <= di_max_list[:, None])
+    if not allowed.any(axis = 1).all():
+        return "infeasible", None
+    di_list = catalog[allowed.argmax(axis = 1)]
+    height_others = (di_list[1:] + insulator_thickness) @ weights[1:]
+    fits = allowed[0] & ((catalog + insulator_thickness) * weights[0] + height_others <= sum_upper_bound)
+    if not fits.any():
+        return "infeasible", None
+    di_list[0] = catalog[np.flatnonzero(fits)[-1]]
+    return "optimal", di_list
+
+@solver_timed
+def _solve_diameter_discrete_cvxpy(catalog, di_min_list, di_max_list, weights, insulator_thickness, sum_upper_bound):
+    # Discrete variable approach: choose from catalog
+    k = len(di_min_list)
+    m = len(catalog)
+
+    # Binary matrix: x[i][j] = 1 if winding i uses diameter catalog[j]
+    x = cp.Variable((k, m), boolean=True)
+
+    # Objective: maximize diameter for primary winding (i = 0)
+    objective = cp.Maximize(catalog @ x[0])
+
+    # Each winding chooses exactly one diameter
+    constraints = [cp.sum(x[i]) == 1 for i in range(k)]
+
+    # Compute effective di values (vector of shape (k,))
+    di_list_expr = cp.sum(cp.multiply(x, catalog), axis=1)
+
+    # Width usage constraint (total winding height)
+    height_expr = cp.sum(cp.multiply((di_list_expr + insulator_thickness), weights))
+    constraints.append(height_expr <= sum_upper_bound)
+
+    # Optional: diameter bounds (enforced by catalog choice anyway)
+    constraints.append(di_list_expr >= di_min_list)
+    constraints.append(di_list_expr <= di_max_list)
+
+    problem = cp.Problem(objective, constraints)
+    problem.solve()
+    return problem.status, di_list_expr.value
+
+def optimize_diameter_discrete(compiled, catalog=None, solver: str = ECTOR_SOLVER_ENUMERATION):
+    """
+    Discrete ector fit: the largest primary catalog diameter that fits the bobbin height.
+
+    Parameters:
+        compiled (dict): Output of compile_opt_prob.
+        catalog (array-like, optional): Available wire diameters [m]. A default range is used if None.
+        solver (str): "enumeration" (solve_diameter_discrete, no MIP backend needed) or "cvxpy" (boolean MIP).
+    """
 
     if catalog is None:
         omit_values = [0.26e-3, 0.29e-3, 0.31e-3, 0.33e-3, 0.34e-3, 0.36e-3] # diameters that are not used
         full_range = np.arange(0.1e-3, 0.37e-3, 0.01e-3)
         catalog = full_range[~np.isin(full_range, omit_values)]
-        print("[WARNING] No wire diameter catalog passed in discrete method. Using default setting...")
+        logger.warning("No wire diameter catalog passed in discrete method. Using default setting...")
 
     irms_list = compiled['irms_list']
     ji_list = compiled['ji_list']
@@ -134,39 +261,20 @@ def optimize_diameter_discrete(compiled, catalog=None):
     di_min_list = cal_di_min_list(irms_list, ji_list, spi_list, pi_list)
     li_list = cal_li_list(ni_list, spi_list, di_min_list, insulator_thickness, wb, kwb)
 
-    # sum_upper_bound = cal_sum_upper_bound(hb, khb, ht, lt)
-    height_bound = hb * khb
-
-    # Discrete variable approach: choose from catalog
-    k = len(irms_list)
-    m = len(catalog)
-
-    # Binary matrix: x[i][j] = 1 if winding i uses diameter catalog[j]
-    x = cp.Variable((k, m), boolean=True)
-
-    # Objective: maximize diameter for primary winding (i = 0)
-    objective = cp.Maximize(catalog @ x[0])
-
-    # Each winding chooses exactly one diameter
-    constraints = [cp.sum(x[i]) == 1 for i in range(k)]
-
-    # Compute effective di values (vector of shape (k,))
-    di_list_expr = cp.sum(cp.multiply(x, catalog), axis=1)
-
-    # Width usage constraint (total winding height)
-    height_expr = cp.sum(cp.multiply((di_list_expr + insulator_thickness), (li_list * pi_list))) + ht * lt
-    constraints.append(height_expr <= height_bound)
-
-    # Optional: diameter bounds (enforced by catalog choice anyway)
     di_max_list = cal_di_max_list(wb, kwb, spi_list, ni_list, li_list, insulator_thickness)
-    constraints.append(di_list_expr >= di_min_list)
-    constraints.append(di_list_expr <= di_max_list)
+    sum_upper_bound = cal_sum_upper_bound(hb, khb, ht, lt)
 
-    problem = cp.Problem(objective, constraints)
-    problem.solve()
+    solvers = {
+        ECTOR_SOLVER_ENUMERATION: solve_diameter_discrete,
+        ECTOR_SOLVER_CVXPY: _solve_diameter_discrete_cvxpy
+    }
+    if solver not in solvers:
+        raise ValueError(f"Unknown discrete ector solver '{solver}'. Use one of {list(solvers)}.")
+    status, di_values = solvers[solver](np.asarray(catalog, dtype = float), di_min_list, di_max_list, li_list * pi_list, insulator_thickness, sum_upper_bound)
+    logger.debug("Discrete ector fit (%s) finished with status %s, di_list %s", solver, status, di_values)
 
     result = {
-        "status": problem.status,
+        "status": status,
         "di_list": None,
         "li_list": li_list,
         "j_cal_list": None,
@@ -175,8 +283,7 @@ def optimize_diameter_discrete(compiled, catalog=None):
         "method": "ector_discrete"
     }
 
-    if problem.status == "optimal":
-        di_values = di_list_expr.value
+    if status == "optimal":
         fill_rate = (insulator_thickness + di_values) * (ni_list / li_list) * spi_list / wb
         j_cal = 4 * irms_list / (pi_list * spi_list * np.pi * di_values ** 2)
         hr = np.sum((di_values + insulator_thickness) * li_list * pi_list) + ht * lt
@@ -1,13 +1,12 @@
+import numpy as np
 from transformer.tfdraft import TransformerDraft
 from bobbin.option import WireOption
 from utils.formulae import calculate_wire_area, convert_area_diameter
 
 def fit_wire_kf(draft: TransformerDraft, option: WireOption):
-    window_area_required = 0
-    for i in range(len(draft.winding_list)):
-        draft.winding_list[i].wire_area = calculate_wire_area(irms = draft.winding_list[i].i_rms, j = option.ji_list[i])
-        window_area_required += draft.winding_list[i].wire_area * draft.winding_list[i].turns
-    window_area_required = window_area_required / option.kf
+    windings = draft.windings
+    windings.wire_area[:] = calculate_wire_area(irms = windings.i_rms, j = np.asarray(option.ji_list[:len(windings)], dtype = float))
+    window_area_required = np.sum(windings.wire_area * windings.turns) / option.kf
     
     result = {
         "status": (window_area_required <= draft.core.window_area),
@@ -18,9 +17,7 @@ def fit_wire_kf(draft: TransformerDraft, option: WireOption):
         "method": "kf"
     }
     if (window_area_required <= draft.core.window_area):
-        wa_list = []
-        for i in range(len(draft.winding_list)):
-            wa_list.append(draft.winding_list[i].wire_area)
+        wa_list = list(windings.wire_area)
         di_list = convert_area_diameter(area = wa_list)
         j_cal_list = option.ji_list
         result.update({
@@ -1,3 +1,16 @@
+import numpy as np
+
+# Basic config of the wire tab (WireDesignFrame.get_basic_config), used unless the advanced config is requested.
+BASIC_WIRE_CONFIG = {
+    "khb": 0.8,
+    "kwb": 0.9,
+    "insulator_thickness": 3e-5,
+    "ht": 5e-5,
+    "kf": -1,
+    "Aw": -1,
+    "method": "ector_discrete"
+}
+
 class WireOption:
     def __init__(self,
                  ji_list: list[float] = None, 
@@ -19,4 +32,10 @@ class WireOption:
         self.ht = ht
         self.lt = lt
         self.kf = kf
-        
\ No newline at end of file
+
+def default_wire_catalog() -> np.ndarray:
+    # Wire diameters [m] offered for the discrete ector method: 0.10 to 0.37 mm in 0.01 mm steps, minus sizes that are not used.
+    omit_values = [0.26e-3, 0.29e-3, 0.31e-3, 0.33e-3, 0.34e-3, 0.36e-3] # diameters that are not used
+    full_range = np.arange(0.1e-3, 0.38e-3, 0.01e-3)
+    mask = ~np.any(np.isclose(full_range[:, None], omit_values, rtol=0, atol=1e-10), axis=1)
+    return full_range[mask]
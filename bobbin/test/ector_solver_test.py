@@ -0,0 +1,111 @@
+"""
+Cross-check of the ector wire solvers against the cvxpy formulations they replaced.
+
+For the example workspace wire problem and variants of it (tighter and looser bobbin height, higher currents, lower
+current density), the closed-form LP, the discrete enumeration and the batched fit must give the same status and
+primary diameter as the cvxpy LP / boolean MIP. Needs cvxpy with a MIP-capable solver (e.g. HiGHS).
+
+Run from the repository root:
+    python bobbin/test/ector_solver_test.py
+"""
+import os
+import sys
+import numpy as np
+import yaml
+
+REPO_ROOT = os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+if REPO_ROOT not in sys.path:
+    sys.path.insert(0, REPO_ROOT)
+
+from transformer.core import Core
+from transformer.winding import Winding
+from transformer.tfdraft import TransformerDraft
+from bobbin.option import WireOption, default_wire_catalog, BASIC_WIRE_CONFIG
+from bobbin.ector import compile_opt_prob, optimize_diameter, optimize_diameter_discrete, ECTOR_SOLVER_CLOSED_FORM, ECTOR_SOLVER_CVXPY, ECTOR_SOLVER_ENUMERATION
+from bobbin.batch import fit_wire_batch
+
+EXAMPLE_WORKSPACE = os.path.join(REPO_ROOT, "example", "pmp22345", "pmp22345.yaml")
+# Variants of the example problem: (label, bobbin height factor, current factor, current density factor)
+VARIANTS = [
+    ("example", 1.0, 1.0, 1.0),
+    ("tall bobbin", 2.0, 1.0, 1.0),
+    ("short bobbin", 0.6, 1.0, 1.0),
+    ("too short bobbin", 0.2, 1.0, 1.0),
+    ("high current", 1.0, 1.5, 1.0),
+    ("low current density", 1.0, 1.0, 0.5),
+    ("thin wires", 1.0, 0.3, 1.5)
+]
+# The cvxpy solvers stop at their own tolerance
+RTOL = 1e-5
+
+
+def build_problem(wire_spec: dict, window_area: float, kh: float, ki: float, kj: float):
+    draft = TransformerDraft(
+        winding_list = [Winding(turns = n, i_rms = i * ki) for n, i in zip(wire_spec["ni_list"], wire_spec["irms_list"])],
+        core = Core(window_area = window_area, winding_width = wire_spec["wb"], winding_height = wire_spec["hb"] * kh)
+    )
+    option = WireOption(
+        ji_list = [j * kj for j in wire_spec["ji_list"]],
+        pi_list = wire_spec["pi_list"],
+        spi_list = wire_spec["spi_list"],
+        lt = wire_spec["lt"],
+        insulator_thickness = BASIC_WIRE_CONFIG["insulator_thickness"],
+        kwb = BASIC_WIRE_CONFIG["kwb"],
+        khb = BASIC_WIRE_CONFIG["khb"],
+        ht = BASIC_WIRE_CONFIG["ht"]
+    )
+    return draft, option
+
+
+def same_fit(label: str, a: dict, b: dict) -> bool:
+    a_ok, b_ok = a["status"] == "optimal", b["status"] == "optimal"
+    if a_ok != b_ok or (a_ok and not np.isclose(a["di_list"][0], b["di_list"][0], rtol = RTOL, atol = 0)):
+        print(f"[FAIL] {label}: {a['status']} {a['di_list']} vs cvxpy {b['status']} {b['di_list']}")
+        return False
+    return True
+
+
+def main() -> int:
+    with open(EXAMPLE_WORKSPACE, "r") as f:
+        data = yaml.safe_load(f)
+    wire_spec = data["wire"]["wire_spec"]
+    window_area = data["transformer"]["core"]["core"]["window_area"]
+    catalog = default_wire_catalog()
+
+    checks, failures, feasible = 0, 0, 0
+    problems = [build_problem(wire_spec, window_area, *variant[1:]) for variant in VARIANTS]
+    batch = {
+        "ector_continuous": fit_wire_batch([d for d, _ in problems], [o for _, o in problems], method = "ector_continuous"),
+        "ector_discrete": fit_wire_batch([d for d, _ in problems], [o for _, o in problems], method = "ector_discrete", catalog = catalog)
+    }
+    for k, (variant, (draft, option)) in enumerate(zip(VARIANTS, problems)):
+        label = variant[0]
+        compiled = compile_opt_prob(draft, option)
+        continuous = optimize_diameter(compiled, solver = ECTOR_SOLVER_CLOSED_FORM)
+        continuous_cvxpy = optimize_diameter(compiled, solver = ECTOR_SOLVER_CVXPY)
+        discrete = optimize_diameter_discrete(compiled, catalog = catalog, solver = ECTOR_SOLVER_ENUMERATION)
+        discrete_cvxpy = optimize_diameter_discrete(compiled, catalog = catalog, solver = ECTOR_SOLVER_CVXPY)
+        feasible += continuous_cvxpy["status"] == "optimal"
+
+        # Row k of each batch table is the pair (problems[k] draft, problems[k] option)
+        row = int(np.flatnonzero((batch["ector_continuous"].draft_index == k) & (batch["ector_continuous"].option_index == k))[0])
+        results = [
+            (f"{label} / closed form", continuous, continuous_cvxpy),
+            (f"{label} / enumeration", discrete, discrete_cvxpy)
+        ]
+        for method, reference in (("ector_continuous", continuous_cvxpy), ("ector_discrete", discrete_cvxpy)):
+            table = batch[method]
+            results.append((f"{label} / batch {method}", {
+                "status": "optimal" if table.feasible[row] else "infeasible",
+                "di_list": table.di[row] if table.feasible[row] else None
+            }, reference))
+        for name, result, reference in results:
+            checks += 1
+            failures += not same_fit(name, result, reference)
+
+    print(f"{checks - failures}/{checks} ector fits match cvxpy ({feasible}/{len(VARIANTS)} variants feasible)")
+    return 1 if failures else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,261 @@
+import numpy as np
+from utils.formulae import calculate_iedc, calculate_deltai, calculate_ippk, calculate_irms, calculate_minimum_turns, calculate_gap, d_n_vro, irms_with_ref_formula, calculate_irms_dcm_secondary
+from utils.log import get_logger
+
+logger = get_logger(__name__)
+
+# Default axes of sweep_design_space
+DESIGN_SPACE_D_RANGE = (0.2, 0.7)       # duty ratios at the minimum input voltage
+DESIGN_SPACE_LM_SPAN = (0.25, 4.0)      # Lm grid relative to the compiled converter's Lm, log spaced
+DESIGN_SPACE_POINTS = 64                # points per axis
+
+# Per-point columns of DesignSpace, in the order of DesignSpace.to_dict
+DESIGN_SPACE_COLUMNS = ("d_max", "duty", "vro", "turns_ratio", "lm", "iedc", "delta_i", "ip_pk", "ccm", "n0_min", "np_min", "lg")
+
+
+class DesignSpace:
+    """
+    Operating parameters of a compiled converter over a (duty, Lm) grid, evaluated at its minimum input voltage and
+    full load, as compile_params would derive them for each (d_max, Lm) pair. Every array has one entry per grid point
+    (point = i * len(lm axis) + j for duty i and Lm j); irms has one column per winding, winding 0 the primary.
+    The n0_min columns are filled when a core (and material) is given, see sweep_design_space.
+
+    Attributes:
+        topology (str): "flyback" or "forward".
+        d_axis (np.ndarray): Duty ratios of the grid. (doc: D)
+        lm_axis (np.ndarray): Magnetizing inductances of the grid [H], None for a BCM flyback, whose Lm is the
+            critical inductance of each duty.
+        vp (float): Input voltage the points are evaluated at [V].
+        d_max, vro, turns_ratio, lm (np.ndarray): Duty, reflected voltage [V], main turns ratio (Ns / Np) and Lm [H].
+        duty (np.ndarray): Operating duty: d_max in CCM, the DCM duty sqrt(2 * Lm * fs * Pin) / Vin where a flyback's
+            Lm is too small to stay in CCM at d_max.
+        turns_ratio_list (np.ndarray): Turns ratio of every output, (points, outputs).
+        iedc, delta_i, ip_pk (np.ndarray): Equivalent DC current, ripple and peak current of the primary [A], at duty.
+        irms (np.ndarray): RMS current per winding [A], (points, windings), at duty.
+        ccm (np.ndarray): True where the magnetizing current does not reach zero at d_max.
+        n0_min (np.ndarray): Minimum primary turns on the given core, as update_draft_n0_min. NaN without a core.
+        np_min (np.ndarray): First primary turns the turns search tries, ceil(n0_min).
+        lg (np.ndarray): Air gap for Lm at np_min [m]. (doc: lg)
+    """
+    def __init__(self, converter, d_axis: np.ndarray, lm_axis: np.ndarray = None):
+        self.converter = converter
+        self.topology = converter.__class__.__name__.lower()
+        self.d_axis = d_axis
+        self.lm_axis = lm_axis
+        self.vp = converter.vp
+        self.d_max = None
+        self.duty = None
+        self.vro = None
+        self.turns_ratio = None
+        self.turns_ratio_list = None
+        self.lm = None
+        self.iedc = None
+        self.delta_i = None
+        self.ip_pk = None
+        self.irms = None
+        self.ccm = None
+        self.n0_min = None
+        self.np_min = None
+        self.lg = None
+
+    def __len__(self):
+        return len(self.d_max)
+
+    @property
+    def shape(self) -> tuple:
+        return (len(self.d_axis), 1 if self.lm_axis is None else len(self.lm_axis))
+
+    def grid(self, key: str) -> np.ndarray:
+        # A per-point column as a (duty, Lm) array, e.g. for a contour plot of n0_min.
+        return getattr(self, key).reshape(self.shape + getattr(self, key).shape[1:])
+
+    def best(self, key: str, mask: np.ndarray = None, largest: bool = False) -> int:
+        """
+        Index of the point with the smallest (or largest) value of a column among the points in mask, e.g.
+        space.best("ip_pk", mask = space.ccm & (space.np_min <= 20)). NaN values are never picked.
+        """
+        values = np.asarray(getattr(self, key), dtype = float)
+        values = np.where(np.ones(len(self), dtype = bool) if mask is None else mask, values, np.nan)
+        if np.isnan(values).all():
+            raise ValueError(f"No design point with a valid {key} matches the selection.")
+        return int(np.nanargmax(values) if largest else np.nanargmin(values))
+
+    def point(self, index: int) -> dict:
+        record = {key: getattr(self, key)[index].item() for key in DESIGN_SPACE_COLUMNS}
+        record["turns_ratio_list"] = self.turns_ratio_list[index].tolist()
+        record["irms_list"] = self.irms[index].tolist()
+        return record
+
+    def spec_kwargs(self, index: int) -> dict:
+        """
+        TransformerSpec entries of one point, as spec_from_circuit builds them from a compiled circuit.
+        """
+        converter = self.converter
+        return {
+            "lm": float(self.lm[index]),
+            "turns_ratio_list": [1.0] + self.turns_ratio_list[index].tolist(),
+            "kl_list": [1.0] + [float(k) for k in converter.kl_list],
+            "ip_pk": float(self.ip_pk[index]),
+            "vp": float(self.vp),
+            "fs": float(converter.fs),
+            "d_max": float(self.d_max[index]),
+            "topology": self.topology,
+            "vsec_main": float(converter.vo_list[0] + converter.vf_list[0]),
+            "pin": float(converter.pin),
+            "delta_i": float(self.delta_i[index])
+        }
+
+    def design_turns(self, index: int, core, material, options = None):
+        """
+        Run the full turns search for one point, e.g. space.design_turns(space.best("np_min"), core, material).
+
+        Returns:
+            CoreSweepResult
+        """
+        from transformer.tfspec import TransformerSpec
+        from transformer.sweep import design_core
+        return design_core(TransformerSpec(**self.spec_kwargs(index)), material, core, options)
+
+    def to_dict(self) -> dict:
+        # Column-wise, e.g. pd.DataFrame(space.to_dict()) for a table of every point.
+        columns = {key: getattr(self, key) for key in DESIGN_SPACE_COLUMNS}
+        for i in range(self.irms.shape[1]):
+            columns[f"irms_{i}"] = self.irms[:, i]
+        return columns
+
+    def __str__(self):
+        lm = "critical Lm (BCM)" if self.lm_axis is None else f"{len(self.lm_axis)} Lm value(s) {self.lm_axis[0]:.4g}-{self.lm_axis[-1]:.4g} H"
+        return f"Design space ({self.topology}) at Vin = {self.vp:g} V: {len(self.d_axis)} duty value(s) {self.d_axis[0]:.4g}-{self.d_axis[-1]:.4g} x {lm}, {len(self)} point(s)"
+
+
+def sweep_design_space(
+        converter,
+        d_max = None,
+        vro = None,
+        lm = None,
+        points: int = DESIGN_SPACE_POINTS,
+        core = None,
+        material = None,
+        options = None
+) -> DesignSpace:
+    """
+    Evaluate the compile_params equations of a compiled Flyback or Forward over a grid of duty ratios and
+    magnetizing inductances in one vectorized pass. At a fixed input voltage d_max, vro and the turns ratio are one
+    degree of freedom (d_n_vro), so the duty axis is given either as d_max or as vro values.
+    With a core, each point also gets the minimum primary turns of update_draft_n0_min (the largest of the Bsat,
+    ΔB and volt-second bounds that the material defines), the first primary turns of the turns search and the gap.
+
+    Parameters:
+        converter (Flyback | Forward): Converter after compile_params; its vp, pin, output voltages, fs, mode and kl_list are used.
+        d_max (array-like, optional): Duty ratios. Defaults to points values over DESIGN_SPACE_D_RANGE.
+        vro (array-like, optional): Reflected voltages [V], instead of d_max.
+        lm (array-like, optional): Magnetizing inductances [H]. Defaults to points log-spaced values over
+            DESIGN_SPACE_LM_SPAN times the converter's Lm. Ignored for a BCM flyback.
+        points (int): Points per defaulted axis.
+        core (Core, optional): Core for n0_min, np_min and lg.
+        material (Material, optional): Core material for n0_min. Required with a core.
+        options (TransformerOption, optional): Turns search options; turn_use_tolerance widens the Bsat bound as in the search.
+
+    Returns:
+        DesignSpace
+    """
+    if converter.pin is None or converter.vp is None:
+        raise ValueError("Compile the circuit before sweeping its design space.")
+    if d_max is not None and vro is not None:
+        raise ValueError("Give the duty axis as d_max or as vro, not both: at a fixed input voltage they determine each other.")
+    topology = converter.__class__.__name__.lower()
+    vp = float(converter.vp)
+    vs = np.asarray(converter.vo_list, dtype = float) + np.asarray(converter.vf_list, dtype = float)
+
+    # Duty axis, resolved with the same relations as compile_params
+    if vro is not None:
+        d_axis, _, _ = d_n_vro(topology = topology, vs = vs[0], vp = vp, vro = np.atleast_1d(np.asarray(vro, dtype = float)))
+    elif d_max is not None:
+        d_axis = np.atleast_1d(np.asarray(d_max, dtype = float))
+    else:
+        d_axis = np.linspace(*DESIGN_SPACE_D_RANGE, points)
+    if not np.all((d_axis > 0) & (d_axis < 1)):
+        raise ValueError("Every duty ratio of the design space must be between 0 and 1.")
+
+    bcm = topology == "flyback" and converter.mode == "BCM"
+    if bcm:
+        lm_axis = None
+    elif lm is not None:
+        lm_axis = np.atleast_1d(np.asarray(lm, dtype = float))
+    elif converter.lm:
+        lm_axis = converter.lm * np.geomspace(*DESIGN_SPACE_LM_SPAN, points)
+    else:
+        raise ValueError("Give an Lm grid: the converter has no Lm to span.")
+    space = DesignSpace(converter, d_axis, lm_axis)
+
+    # Flatten the (duty, Lm) grid into points
+    n_lm = 1 if lm_axis is None else len(lm_axis)
+    d = np.repeat(d_axis, n_lm)
+    _, n, vro_values = d_n_vro(topology = topology, vs = vs[0], vp = vp, d = d)
+    if topology == "flyback":
+        turns_ratio_list = vs[None, :] / vro_values[:, None]
+    else:
+        turns_ratio_list = vs[None, :] / (vp * d[:, None])
+    if bcm:
+        lm_values = vp * d ** 2 / (2 * (converter.pin / vp) * converter.fs)
+    else:
+        lm_values = np.tile(lm_axis, len(d_axis))
+
+    iedc = calculate_iedc(pin = converter.pin, vin = vp, d = d)
+    delta_i = calculate_deltai(vin = vp, d = d, lm = lm_values, fs = converter.fs)
+    ccm = delta_i / 2 <= iedc * (1 + 1e-9)    # BCM points sit on the boundary up to rounding
+    duty = d
+    if topology == "flyback" and not ccm.all():
+        # A flyback whose Lm is below the critical inductance at d_max runs in DCM; the CCM peak and RMS formulae
+        # would understate its currents, so those points are evaluated at the DCM duty, as in sweep_operating_points.
+        duty = np.where(ccm, d, np.sqrt(2 * lm_values * converter.fs * converter.pin) / vp)
+        iedc = np.where(ccm, iedc, calculate_iedc(pin = converter.pin, vin = vp, d = duty))
+        delta_i = np.where(ccm, delta_i, calculate_deltai(vin = vp, d = duty, lm = lm_values, fs = converter.fs))
+    irms_0 = calculate_irms(iedc = iedc, deltai = delta_i, d = duty)
+    kl = np.asarray(converter.kl_list, dtype = float)
+    irms = np.empty((len(d), len(vs) + 1))
+    irms[:, 0] = irms_0
+    irms[:, 1:] = irms_with_ref_formula(topology)(irms_0 = irms_0[:, None], kl = kl, turns_ratio = turns_ratio_list, d_max = duty[:, None])
+    if topology == "flyback" and not ccm.all():
+        dcm_irms = calculate_irms_dcm_secondary(
+            ipk = delta_i[:, None], kl = kl, turns_ratio = turns_ratio_list,
+            lm = lm_values[:, None], fs = converter.fs, vsec = vs[0], main_turns_ratio = turns_ratio_list[:, :1]
+        )
+        irms[:, 1:] = np.where(ccm[:, None], irms[:, 1:], dcm_irms)
+
+    space.d_max = d
+    space.duty = duty
+    space.vro = np.asarray(vro_values, dtype = float)
+    space.turns_ratio = turns_ratio_list[:, 0]
+    space.turns_ratio_list = turns_ratio_list
+    space.lm = lm_values
+    space.iedc = iedc
+    space.delta_i = delta_i
+    space.ip_pk = calculate_ippk(iedc = iedc, deltai = delta_i)
+    space.irms = irms
+    space.ccm = ccm
+    space.n0_min, space.np_min, space.lg = _turns_bounds(space, converter.fs, core, material, options)
+    logger.debug("%s", space)
+    return space
+
+
+def _turns_bounds(space: DesignSpace, fs: float, core, material, options):
+    # update_draft_n0_min over every point: the largest bound among the Bsat, ΔI/ΔB and volt-second paths.
+    nan = np.full(len(space.d_max), np.nan)
+    if core is None:
+        return nan, nan, nan
+    if material is None:
+        raise ValueError("A core material is needed for the minimum turns.")
+    bounds = []
+    if material.b_sat is not None:
+        use_tolerance = options is not None and options.turn_use_tolerance
+        b_limit = material.b_sat * ((1 + options.turn_check_tolerance_b) if use_tolerance else 1.0)
+        bounds.append(calculate_minimum_turns(core_area = core.core_area, lm = space.lm, ipk = space.ip_pk, b_sat = b_limit))
+    if material.delta_b is not None:
+        bounds.append(calculate_minimum_turns(core_area = core.core_area, lm = space.lm, delta_i = space.delta_i, delta_b = material.delta_b))
+        bounds.append(calculate_minimum_turns(core_area = core.core_area, voltage = space.vp, f_sw = fs, duty = space.d_max, delta_b = material.delta_b))
+    if not bounds:
+        raise ValueError("Unable to calculate n0_min: the material defines neither Bsat nor delta B.")
+    n0_min = np.maximum.reduce(bounds)
+    np_min = np.ceil(n0_min)
+    return n0_min, np_min, calculate_gap(turns = np_min, core_area = core.core_area, lm = space.lm)
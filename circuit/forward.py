@@ -1,5 +1,10 @@
 import numpy as np
 from utils.formulae import calculate_iedc, calculate_deltai, calculate_ippk, d_n_vro, voltage_compiler
+from circuit.operating_point import sweep_operating_points
+from circuit.design_space import sweep_design_space
+from utils.log import get_logger
+
+logger = get_logger(__name__)
 
 class Forward:
     def __init__(self,
@@ -70,7 +75,7 @@ class Forward:
         iedc = calculate_iedc(pin = self.pin, vin = self.vp, d = self.d_max)
         self.delta_i = calculate_deltai(vin = self.vp, d = self.d_max, lm = self.lm, fs = self.fs)
         self.ip_pk = calculate_ippk(iedc = iedc, deltai = self.delta_i)
-        print(f"iedc = {iedc}, deltai = {self.delta_i}, ip_pk = {self.ip_pk}")
+        logger.debug("iedc = %s, deltai = %s, ip_pk = %s", iedc, self.delta_i, self.ip_pk)
 
 
 
@@ -82,6 +87,14 @@ class Forward:
     #         yaml.dump(self.to_dict(), f, default_flow_style=False)
     #         print(f"[INFO] Exported to {filepath}")
 
+    def operating_envelope(self, vin = None, load = None, **kwargs):
+        # ip_pk, delta_i, duty and Irms over the input voltage range and load points, see sweep_operating_points.
+        return sweep_operating_points(self, vin = vin, load = load, **kwargs)
+
+    def design_space(self, d_max = None, vro = None, lm = None, **kwargs):
+        # ip_pk, delta_i, Irms and n0_min over a (duty or vro, Lm) grid, see sweep_design_space.
+        return sweep_design_space(self, d_max = d_max, vro = vro, lm = lm, **kwargs)
+
     def __str__(self):
         return (
             "========= Forward Converter =========\n"
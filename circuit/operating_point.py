@@ -0,0 +1,180 @@
+import numpy as np
+from utils.formulae import calculate_iedc, calculate_deltai, calculate_ippk, calculate_irms, d_formula, irms_with_ref_formula, calculate_irms_dcm_secondary, voltage_compiler
+from utils.log import get_logger
+
+logger = get_logger(__name__)
+
+# Default grid of sweep_operating_points
+ENVELOPE_VIN_POINTS = 64
+ENVELOPE_LOAD_FRACTIONS = (0.1, 0.25, 0.5, 0.75, 1.0)
+
+
+class OperatingEnvelope:
+    """
+    Operating points of a compiled converter over an (input voltage, load) grid.
+    Grid quantities are (vin, load) arrays, per-winding quantities are (vin, load, windings) arrays,
+    with winding 0 the primary and winding i the output i - 1 (the order of the transformer spec).
+
+    Attributes:
+        topology (str): "flyback" or "forward".
+        vin (np.ndarray): Input voltages [V], ascending.
+        load (np.ndarray): Load fractions of the rated output currents.
+        pin (np.ndarray): Input power [W].
+        duty (np.ndarray): Duty ratio. (doc: D)
+        iedc (np.ndarray): Equivalent DC current of the primary [A].
+        delta_i (np.ndarray): Primary current ripple [A]. (doc: ΔI)
+        ip_pk (np.ndarray): Primary peak current [A]. (doc: Ippk)
+        irms (np.ndarray): RMS current per winding [A].
+        volt_second (np.ndarray): Primary volt-seconds per cycle, Vin * D / fs [V·s].
+        ccm (np.ndarray): True where the magnetizing current does not reach zero.
+    """
+    def __init__(self, topology: str, vin: np.ndarray, load: np.ndarray):
+        self.topology = topology
+        self.vin = vin
+        self.load = load
+        self.pin = None
+        self.duty = None
+        self.iedc = None
+        self.delta_i = None
+        self.ip_pk = None
+        self.irms = None
+        self.volt_second = None
+        self.ccm = None
+
+    @property
+    def shape(self) -> tuple:
+        return (len(self.vin), len(self.load))
+
+    def worst(self, key: str) -> dict:
+        """
+        Largest value of a grid quantity (or of a winding's irms, e.g. key = "irms" gives one entry per winding)
+        and the operating point where it occurs.
+        """
+        values = getattr(self, key)
+        if values.ndim == 3:
+            return [self._worst(values[:, :, i]) for i in range(values.shape[2])]
+        return self._worst(values)
+
+    def _worst(self, values: np.ndarray) -> dict:
+        i, j = np.unravel_index(np.nanargmax(values), values.shape)
+        return {"value": float(values[i, j]), "vin": float(self.vin[i]), "load": float(self.load[j])}
+
+    def limits(self) -> dict:
+        """
+        Worst-case stresses over the whole envelope.
+
+        Returns:
+            dict: d_max, ip_pk, delta_i, volt_second and the per-winding irms_list.
+        """
+        return {
+            "d_max": float(np.nanmax(self.duty)),
+            "ip_pk": float(np.nanmax(self.ip_pk)),
+            "delta_i": float(np.nanmax(self.delta_i)),
+            "volt_second": float(np.nanmax(self.volt_second)),
+            "irms_list": [float(v) for v in np.nanmax(self.irms, axis = (0, 1))]
+        }
+
+    def spec_limits(self) -> dict:
+        """
+        TransformerSpec entries to replace with their envelope maximum so the minimum turns bound covers every
+        operating point (both n0_min paths scale with Lm * Ippk and Lm * ΔI). vp and d_max are kept at the design
+        corner, because the turns search evaluates the duty at vp.
+        """
+        return {"ip_pk": float(np.nanmax(self.ip_pk)), "delta_i": float(np.nanmax(self.delta_i))}
+
+    def to_dict(self) -> dict:
+        return {
+            "topology": self.topology,
+            "vin": self.vin.tolist(),
+            "load": self.load.tolist(),
+            "limits": self.limits(),
+            "worst": {key: self.worst(key) for key in ("duty", "ip_pk", "delta_i", "volt_second", "irms")}
+        }
+
+    def __str__(self):
+        limits = self.limits()
+        return (
+            f"Operating envelope ({self.topology}): Vin {self.vin[0]:g}-{self.vin[-1]:g} V x {len(self.load)} load point(s), "
+            f"D max = {limits['d_max']:.4g}, Ippk max = {limits['ip_pk']:.4g} A, ΔI max = {limits['delta_i']:.4g} A"
+        )
+
+
+def input_voltage_range(converter) -> tuple[float, float]:
+    """
+    (vmin, vmax) of a converter from its DC/AC input entries, as compile_params takes vp.
+    vmax falls back to vmin when no maximum input is given.
+    """
+    vmin, vmax = voltage_compiler(vdc_min = converter.vin_dc_min, vdc_max = converter.vin_dc_max, vac_min = converter.vin_ac_min, vac_max = converter.vin_ac_max)
+    if vmin is None:
+        raise ValueError("The converter has no minimum input voltage.")
+    return vmin, (vmin if vmax is None else max(vmax, vmin))
+
+
+def sweep_operating_points(converter, vin = None, load = None, vin_points: int = ENVELOPE_VIN_POINTS) -> OperatingEnvelope:
+    """
+    Evaluate a compiled Flyback or Forward over input voltage and load in one vectorized pass.
+    The turns ratios, Lm, fs and efficiency from compile_params are fixed, and the duty follows from the volt-second
+    balance at each input voltage. A flyback that enters DCM (ΔI / 2 > Iedc) is solved with the DCM duty,
+    D = sqrt(2 * Lm * fs * Pin) / Vin. The secondary RMS currents use calculate_irms_with_ref at each CCM point and
+    calculate_irms_dcm_secondary at each DCM point.
+
+    Parameters:
+        converter (Flyback | Forward): Converter after compile_params.
+        vin (array-like, optional): Input voltages [V]. Defaults to vin_points values over input_voltage_range.
+        load (array-like, optional): Load fractions of the rated output currents. Defaults to ENVELOPE_LOAD_FRACTIONS.
+        vin_points (int): Number of input voltages when vin is not given.
+
+    Returns:
+        OperatingEnvelope
+    """
+    topology = converter.__class__.__name__.lower()
+    duty_of = d_formula(topology)
+    irms_with_ref = irms_with_ref_formula(topology)
+    if converter.pin is None or converter.lm is None or converter.turns_ratio_list is None:
+        raise ValueError("Compile the circuit before sweeping its operating points.")
+
+    if vin is None:
+        vmin, vmax = input_voltage_range(converter)
+        vin = np.linspace(vmin, vmax, vin_points if vmax > vmin else 1)
+    vin = np.sort(np.atleast_1d(np.asarray(vin, dtype = float)))
+    load = np.atleast_1d(np.asarray(ENVELOPE_LOAD_FRACTIONS if load is None else load, dtype = float))
+    envelope = OperatingEnvelope(topology, vin, load)
+
+    turns_ratio = np.asarray(converter.turns_ratio_list, dtype = float)
+    kl = np.asarray(converter.kl_list, dtype = float)
+    vs = converter.vo_list[0] + converter.vf_list[0]
+    v = vin[:, None]
+    pin = converter.pin * load[None, :] * np.ones_like(v)
+
+    # Volt-second balance with primary turns 1 and main secondary turns n
+    duty = duty_of(vpri = v, vsec = vs, primary_turns = 1.0, secondary_turns = turns_ratio[0]) * np.ones_like(pin)
+    iedc = calculate_iedc(pin = pin, vin = v, d = duty)
+    delta_i = calculate_deltai(vin = v, d = duty, lm = converter.lm, fs = converter.fs)
+    ccm = delta_i / 2 <= iedc
+    if topology == "flyback" and not ccm.all():
+        dcm_duty = np.sqrt(2 * converter.lm * converter.fs * pin) / v
+        duty = np.where(ccm, duty, dcm_duty)
+        iedc = np.where(ccm, iedc, calculate_iedc(pin = pin, vin = v, d = duty))
+        delta_i = np.where(ccm, delta_i, calculate_deltai(vin = v, d = duty, lm = converter.lm, fs = converter.fs))
+
+    irms_0 = calculate_irms(iedc = iedc, deltai = delta_i, d = duty)
+    irms = np.empty(duty.shape + (len(turns_ratio) + 1,))
+    irms[:, :, 0] = irms_0
+    irms[:, :, 1:] = irms_with_ref(irms_0 = irms_0[:, :, None], kl = kl, turns_ratio = turns_ratio, d_max = duty[:, :, None])
+    if topology == "flyback" and not ccm.all():
+        dcm_irms = calculate_irms_dcm_secondary(
+            ipk = delta_i[:, :, None], kl = kl, turns_ratio = turns_ratio,
+            lm = converter.lm, fs = converter.fs, vsec = vs, main_turns_ratio = turns_ratio[0]
+        )
+        irms[:, :, 1:] = np.where(ccm[:, :, None], irms[:, :, 1:], dcm_irms)
+
+    envelope.pin = pin
+    envelope.duty = duty
+    envelope.iedc = iedc
+    envelope.delta_i = delta_i
+    envelope.ip_pk = calculate_ippk(iedc = iedc, deltai = delta_i)
+    envelope.irms = irms
+    envelope.volt_second = v * duty / converter.fs
+    envelope.ccm = ccm
+    logger.debug("%s", envelope)
+    return envelope
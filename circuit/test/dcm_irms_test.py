@@ -0,0 +1,66 @@
+"""
+Check of the flyback secondary RMS currents in DCM, in sweep_operating_points and sweep_design_space.
+
+- A BCM flyback runs in DCM above its minimum input voltage, where Ipk and the secondary conduction time D2 no
+  longer depend on Vin, so every secondary RMS current must be the same at every Vin of the envelope.
+- For 100-400 V, 12.5 V / 3 A + 5.4 V / 1 A (0.5 V diodes, 85 % efficiency, D = 0.45) the main secondary
+  carries 5.50 A, not the 6.98 A the CCM formula gives at 400 V.
+- A DCM point of the design space must match the envelope of the same converter at the same Lm and Vin.
+
+Run from the repository root:
+    python circuit/test/dcm_irms_test.py
+"""
+import os
+import sys
+import copy
+import numpy as np
+
+REPO_ROOT = os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+if REPO_ROOT not in sys.path:
+    sys.path.insert(0, REPO_ROOT)
+
+from circuit.flyback import Flyback
+
+EXPECTED_BCM_IRMS_MAIN = 5.50
+
+
+def flyback(mode: str, lm: float = None) -> Flyback:
+    converter = Flyback(
+        vin_dc_min = 100, vin_dc_max = 400, vo_list = [12.5, 5.4], vf_list = [0.5, 0.5], io_list = [3, 1],
+        efficiency = 0.85, fs = 100e3, d_max = 0.45, mode = mode, lm = lm
+    )
+    converter.compile_params()
+    return converter
+
+
+def main() -> int:
+    failures = []
+
+    bcm = flyback("BCM")
+    envelope = bcm.operating_envelope(load = [1.0])
+    secondary = envelope.irms[:, 0, 1:]
+    if not np.allclose(secondary, secondary[0], rtol = 1e-9, atol = 0):
+        failures.append(f"BCM secondary RMS varies with Vin: {secondary.min(axis = 0)} to {secondary.max(axis = 0)} A")
+    irms_main = envelope.limits()["irms_list"][1]
+    if round(irms_main, 2) != EXPECTED_BCM_IRMS_MAIN:
+        failures.append(f"BCM main secondary RMS {irms_main:.4f} A, expected {EXPECTED_BCM_IRMS_MAIN} A")
+
+    ccm = flyback("CCM", lm = 600e-6)
+    lm_dcm = 0.2 * ccm.lm
+    space = ccm.design_space(d_max = [ccm.d_max], lm = [lm_dcm])
+    dcm = copy.copy(ccm)
+    dcm.lm = lm_dcm
+    point = dcm.operating_envelope(vin = [ccm.vp], load = [1.0])
+    if space.ccm[0] or point.ccm[0, 0]:
+        failures.append(f"Lm = {lm_dcm:g} H should run in DCM at {ccm.vp:g} V")
+    if not np.allclose(space.irms[0], point.irms[0, 0], rtol = 1e-9, atol = 0):
+        failures.append(f"DCM design space RMS {space.irms[0]} A differs from the envelope {point.irms[0, 0]} A")
+
+    for failure in failures:
+        print(f"[FAIL] {failure}")
+    print(f"BCM main secondary RMS = {irms_main:.4f} A; {3 - len(failures)}/3 checks pass")
+    return 1 if failures else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,125 @@
+"""
+Headless batch runner for the circuit -> turns -> wire pipeline. Does not import tkinter.
+
+Usage:
+    python cli.py example/pmp22345/pmp22345.yaml
+    python cli.py workspaces/*.yaml --out-dir results --format json --jobs 4
+"""
+import argparse
+import json
+import logging
+import os
+import sys
+from concurrent.futures import ProcessPoolExecutor
+import yaml
+from pipeline.workspace import PipelineSettings, run_workspace_file
+from pipeline.result_cache import RESULT_CACHE_DIR
+from utils.log import configure_logging
+
+
+def build_parser() -> argparse.ArgumentParser:
+    parser = argparse.ArgumentParser(description = "Run transformer design workspaces without the GUI.")
+    parser.add_argument("workspaces", nargs = "+", help = "Workspace YAML files exported by the app.")
+    parser.add_argument("-o", "--output", help = "Write all results to this file instead of stdout.")
+    parser.add_argument("--out-dir", help = "Write one <workspace>.result.<format> file per workspace into this directory.")
+    parser.add_argument("--format", choices = ["yaml", "json"], default = "yaml", help = "Output format (default: yaml).")
+    parser.add_argument("-j", "--jobs", type = int, default = 1, help = "Number of workspaces processed in parallel (default: 1).")
+    parser.add_argument("--from-circuit", action = "store_true", help = "Derive the transformer spec from the compiled circuit section.")
+    parser.add_argument("--envelope", action = "store_true", help = "Sweep the circuit over its input voltage range and load, and design for the worst case.")
+    parser.add_argument("--use-tolerance", action = "store_true", help = "Accept tolerant turns solutions.")
+    parser.add_argument("--solution", type = int, default = 0, help = "Index of the turns solution used for the wire design (default: 0).")
+    parser.add_argument("--advanced", action = "store_true", help = "Use the workspace's advanced wire config instead of the basic one.")
+    parser.add_argument("--method", choices = ["ector_continuous", "ector_discrete", "kf"], help = "Override the wire design method.")
+    parser.add_argument("--profile", action = "store_true", help = "Add per-stage timings to each result.")
+    parser.add_argument("--profile-capture", choices = ["cprofile", "pyinstrument"], help = "Also profile each run and print the report to stderr.")
+    parser.add_argument("--cache", action = "store_true", help = "Reuse turns and wire results from the persistent result cache.")
+    parser.add_argument("--cache-dir", default = RESULT_CACHE_DIR, help = f"Directory of the result cache (default: {RESULT_CACHE_DIR}).")
+    parser.add_argument("--log-level", default = "WARNING", help = "Logging level (default: WARNING).")
+    return parser
+
+
+def dump(data, fmt: str) -> str:
+    if fmt == "json":
+        return json.dumps(data, indent = 2)
+    return yaml.dump(data, sort_keys = False)
+
+
+def result_names(workspaces: list[str]) -> list[str]:
+    """
+    File stem of each workspace's result in --out-dir. Workspaces with the same file name are told apart by
+    their path below the directory they share, e.g. a/ws.yaml and b/ws.yaml give a_ws and b_ws.
+    """
+    stems = [os.path.splitext(os.path.basename(path))[0] for path in workspaces]
+    if len(set(stems)) == len(stems):
+        return stems
+    paths = [os.path.splitext(os.path.abspath(path))[0] for path in workspaces]
+    names = []
+    for stem, path in zip(stems, paths):
+        if stems.count(stem) == 1:
+            names.append(stem)
+            continue
+        root = os.path.commonpath([os.path.dirname(other) for other_stem, other in zip(stems, paths) if other_stem == stem])
+        names.append(os.path.relpath(path, root).replace(os.sep, "_"))
+    duplicates = sorted({name for name in names if names.count(name) > 1})
+    if duplicates:
+        raise ValueError(f"Workspaces would write to the same result file: {', '.join(duplicates)}")
+    return names
+
+
+def run(workspaces: list[str], settings: PipelineSettings, jobs: int = 1) -> list[dict]:
+    if jobs <= 1 or len(workspaces) == 1:
+        return [run_workspace_file(path, settings) for path in workspaces]
+    with ProcessPoolExecutor(max_workers = jobs) as executor:
+        return list(executor.map(run_workspace_file, workspaces, [settings] * len(workspaces)))
+
+
+def main(argv = None) -> int:
+    parser = build_parser()
+    args = parser.parse_args(argv)
+    configure_logging(getattr(logging, args.log_level.upper(), logging.WARNING))
+    settings = PipelineSettings(
+        from_circuit = args.from_circuit,
+        turn_use_tolerance = args.use_tolerance,
+        solution_index = args.solution,
+        use_advanced = args.advanced,
+        method = args.method,
+        envelope = args.envelope,
+        profile = args.profile,
+        profile_capture = args.profile_capture,
+        result_cache = args.cache,
+        result_cache_dir = args.cache_dir
+    )
+    if args.out_dir:
+        try:
+            names = result_names(args.workspaces)
+        except ValueError as e:
+            parser.error(str(e))
+    results = run(args.workspaces, settings, jobs = args.jobs)
+    for result in results:
+        capture = result.pop("profile_capture", None)
+        if capture:
+            print(f"[PROFILE] {result['workspace']}\n{capture}", file = sys.stderr)
+
+    if args.out_dir:
+        os.makedirs(args.out_dir, exist_ok = True)
+        for name, result in zip(names, results):
+            path = os.path.join(args.out_dir, f"{name}.result.{args.format}")
+            with open(path, "w") as f:
+                f.write(dump(result, args.format))
+            print(f"[INFO] Wrote {path}", file = sys.stderr)
+    else:
+        text = dump(results if len(results) > 1 else results[0], args.format)
+        if args.output:
+            with open(args.output, "w") as f:
+                f.write(text)
+        else:
+            sys.stdout.write(text)
+
+    failed = [r["workspace"] for r in results if r["error"]]
+    for path in failed:
+        print(f"[ERROR] {path}: {next(r['error'] for r in results if r['workspace'] == path)}", file = sys.stderr)
+    return 1 if failed else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
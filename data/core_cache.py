@@ -0,0 +1,55 @@
+import hashlib
+import os
+import numpy as np
+from utils.log import get_logger
+
+logger = get_logger(__name__)
+
+CORE_CACHE_DIR = "./app_cache/core_db"
+CORE_CACHE_VERSION = 4
+# Numeric columns of the cleaned core table, already converted to mks units by Core.unit_conv.
+CORE_NUMERIC_COLUMNS = ("core_area", "al_value", "window_area", "winding_width", "winding_height")
+CORE_TEXT_COLUMNS = ("name", "core_type")
+
+def core_cache_path(filepath: str, sheet_name: str, cache_dir: str = CORE_CACHE_DIR) -> str:
+    # One cache file per (file, sheet); the source mtime and size are stored inside and checked on load.
+    digest = hashlib.sha1(f"{os.path.abspath(filepath)}|{sheet_name}".encode("utf-8")).hexdigest()
+    return os.path.join(cache_dir, f"{digest}.npz")
+
+def _source_stamp(filepath: str) -> np.ndarray:
+    stat = os.stat(filepath)
+    return np.array([CORE_CACHE_VERSION, stat.st_mtime_ns, stat.st_size], dtype = np.int64)
+
+def load_core_cache(filepath: str, sheet_name: str, cache_dir: str = CORE_CACHE_DIR) -> dict[str, np.ndarray] | None:
+    """
+    Returns the cached core table columns for the sheet, or None if there is no cache or the source file changed since it was written.
+    """
+    path = core_cache_path(filepath, sheet_name, cache_dir)
+    if not os.path.exists(path):
+        return None
+    try:
+        with np.load(path, allow_pickle = False) as data:
+            if not np.array_equal(data["stamp"], _source_stamp(filepath)):
+                logger.info("Core cache for %s (%s) is stale and will be rebuilt.", filepath, sheet_name)
+                return None
+            return {key: data[key] for key in CORE_TEXT_COLUMNS + CORE_NUMERIC_COLUMNS}
+    except Exception as e:
+        logger.warning("Ignoring unreadable core cache %s: %s", path, e)
+        return None
+
+def save_core_cache(filepath: str, sheet_name: str, columns: dict[str, np.ndarray], cache_dir: str = CORE_CACHE_DIR):
+    path = core_cache_path(filepath, sheet_name, cache_dir)
+    try:
+        os.makedirs(cache_dir, exist_ok = True)
+        tmp_path = path + ".tmp.npz"
+        np.savez(tmp_path, stamp = _source_stamp(filepath), **columns)
+        os.replace(tmp_path, path)
+        logger.info("Cached core table of %s (%s) into %s.", filepath, sheet_name, path)
+    except Exception as e:
+        logger.warning("Failed to save core cache %s: %s", path, e)
+
+def cores_to_columns(cores) -> dict[str, np.ndarray]:
+    columns = {key: np.array([str(getattr(core, key)) for core in cores], dtype = str) for key in CORE_TEXT_COLUMNS}
+    for key in CORE_NUMERIC_COLUMNS:
+        columns[key] = np.array([getattr(core, key) for core in cores], dtype = float)
+    return columns
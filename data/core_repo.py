@@ -1,18 +1,224 @@
+import os
 from collections import defaultdict
+from concurrent.futures import ProcessPoolExecutor
+import numpy as np
 from transformer.core import Core
-from data.fileloader import load_excel_file
+from data.fileloader import load_excel_file, list_sheet_names
 from data.dataloader import extract_sections
+from data.core_cache import load_core_cache, save_core_cache, cores_to_columns, CORE_NUMERIC_COLUMNS, CORE_TEXT_COLUMNS, CORE_CACHE_DIR
+from utils.log import get_logger
+
+logger = get_logger(__name__)
+
+# sheet_name of a CoreRepository that loads every sheet of the workbook
+ALL_SHEETS = "*"
+# Header of the model name column. A row whose first cell contains it starts a section (see extract_sections).
+CORE_NAME_HEADER = "TYPE"
+
+# Short names accepted by CoreRepository.query/range, mapped to the numeric columns (mks units).
+COLUMN_ALIASES = {
+    "ae": "core_area",
+    "aw": "window_area",
+    "al": "al_value",
+    "width": "winding_width",
+    "height": "winding_height",
+    "ap": "area_product",
+}
+
+def core_type_code(section: str) -> str:
+    """
+    Short type code of a sheet section, e.g. "TYPE  EFD  CORE" -> "EFD". Sections without the TYPE/CORE words are returned stripped.
+    """
+    words = [w for w in str(section).split() if w.upper() not in ("TYPE", "CORE")]
+    return " ".join(words) if words else str(section).strip()
+
+
+def section_label(section, sheet: str, header: str = CORE_NAME_HEADER) -> str:
+    """
+    Core type of a core read from a section of sheet. Sheets with one core type have no section rows, so their cores
+    sit in the section of the bare name header (e.g. "TYPE"); those are labelled with the sheet name instead.
+    """
+    section = str(section)
+    return sheet if section.strip() == header else section
+
+
+def model_key(name) -> str:
+    # Models are the same part when their names match ignoring case and spacing, e.g. "EE 25" and "ee25".
+    return "".join(str(name).split()).upper()
+
+
+def first_seen(names, seen: set) -> np.ndarray:
+    """
+    Mask of the names whose model_key is not in seen yet (only the first of repeated names in names), and add their
+    keys to seen. The de-duplication rule of every merged core table (multi-sheet loads and data.ingest).
+    """
+    keep = np.zeros(len(names), dtype = bool)
+    for i, name in enumerate(names):
+        key = model_key(name)
+        if key not in seen:
+            seen.add(key)
+            keep[i] = True
+    return keep
+
+
+def sheet_label(sheet_name) -> str:
+    # Display name of a CoreRepository.sheet_name: one sheet, a list of sheets or ALL_SHEETS.
+    if sheet_name == ALL_SHEETS:
+        return "all sheets"
+    if isinstance(sheet_name, (list, tuple)):
+        return ", ".join(sheet_name)
+    return str(sheet_name)
+
+
+def load_sheet_columns(filepath: str, sheet_name: str, use_cache: bool = True, cache_dir: str = CORE_CACHE_DIR) -> dict[str, np.ndarray]:
+    """
+    Core table columns (mks units) of one sheet, from the core cache when it is fresh. Runs in the worker processes
+    of a multi-sheet load.
+    """
+    repo = CoreRepository(filepath, sheet_name, use_cache = use_cache, cache_dir = cache_dir)
+    return {key: repo.columns[key] for key in CORE_TEXT_COLUMNS + CORE_NUMERIC_COLUMNS}
 
 
 class CoreRepository:
-    def __init__(self, filepath: str, sheet_name: str):
+    """
+    Core catalog loaded from one sheet of a core data workbook, or merged from several sheets.
+    Besides the Core objects, the numeric data is kept column-wise as NumPy arrays (mks units) so that
+    candidate cores can be selected with one vectorized mask instead of a Python loop over self.all.
+
+    Attributes:
+        all (list[Core]): All cores in sheet order. Row i of every column belongs to all[i].
+        by_type (dict[str, list[Core]]): Cores grouped by sheet section.
+        by_model (dict[str, Core]): Cores by model name.
+        columns (dict[str, np.ndarray]): name, core_type, type_code, core_area, window_area, al_value,
+            winding_width, winding_height and area_product (Ae * Aw) columns.
+        sheet_name (str | list[str]): The sheet, the list of sheets or ALL_SHEETS the repository was loaded from.
+        skipped_sheets (dict[str, str]): Sheets of a multi-sheet load that hold no core table, with the reason.
+    """
+    def __init__(self, filepath: str, sheet_name, use_cache: bool = True, max_workers: int = None, cache_dir: str = CORE_CACHE_DIR):
+        """
+        Parameters:
+            filepath (str): Core data workbook.
+            sheet_name (str | list[str]): One sheet, a list of sheets, or ALL_SHEETS. Several sheets are loaded in
+                parallel worker processes and merged; a model listed on several sheets is kept from the first one.
+            use_cache (bool): Read and write the per-sheet core cache (see data.core_cache).
+            max_workers (int, optional): Worker processes of a multi-sheet load. Use 1 to load in this process.
+            cache_dir (str): Directory of the core cache.
+        """
+        self._init_storage(filepath, sheet_name)
+        if sheet_name == ALL_SHEETS or isinstance(sheet_name, (list, tuple)):
+            columns = self._load_sheets(filepath, sheet_name, use_cache, max_workers, cache_dir)
+            self._load_columns(columns)
+            self._build_columns(columns)
+            return
+
+        columns = load_core_cache(filepath, sheet_name, cache_dir) if use_cache else None
+        if columns is not None:
+            self._load_columns(columns)
+        else:
+            self._load(filepath, sheet_name)
+            columns = cores_to_columns(self.all)
+            if use_cache:
+                save_core_cache(filepath, sheet_name, columns, cache_dir)
+        self._build_columns(columns)
+
+    def _init_storage(self, filepath: str, sheet_name: str):
         self.all: list[Core] = []
         self.by_type: dict[str, list[Core]] = defaultdict(list)
         self.by_model: dict[str, Core] = {}
+        self.columns: dict[str, np.ndarray] = {}
+        self._sorted_index: dict[str, np.ndarray] = {}
         self.sheet_name = sheet_name
         self.filepath = filepath
+        self.skipped_sheets: dict[str, str] = {}
+
+    @classmethod
+    def from_columns(cls, columns: dict[str, np.ndarray], filepath: str = None, sheet_name: str = None) -> "CoreRepository":
+        """
+        Repository over core table columns already in mks units (see data.core_cache), e.g. a merged catalog built by
+        data.ingest. Extra columns such as "vendor" are kept in self.columns.
+        """
+        repo = cls.__new__(cls)
+        repo._init_storage(filepath, sheet_name)
+        repo._load_columns(columns)
+        repo._build_columns(columns)
+        return repo
+
+    def _load_sheets(self, filepath: str, sheet_name, use_cache: bool, max_workers: int, cache_dir: str) -> dict[str, np.ndarray]:
+        sheets = list_sheet_names(filepath) if sheet_name == ALL_SHEETS else list(sheet_name)
+        # Fresh cached sheets are read here; only the sheets that need parsing go to the worker processes.
+        loaded = {sheet: load_core_cache(filepath, sheet, cache_dir) if use_cache else None for sheet in sheets}
+        pending = [sheet for sheet in sheets if loaded[sheet] is None]
+        workers = min(len(pending), max_workers or os.cpu_count() or 1)
+        if workers > 1:
+            with ProcessPoolExecutor(max_workers = workers) as executor:
+                futures = {sheet: executor.submit(load_sheet_columns, filepath, sheet, use_cache, cache_dir) for sheet in pending}
+                for sheet, future in futures.items():
+                    loaded[sheet] = self._sheet_result(sheet, future.result)
+        else:
+            for sheet in pending:
+                loaded[sheet] = self._sheet_result(sheet, lambda: load_sheet_columns(filepath, sheet, use_cache, cache_dir))
+
+        # Merge in sheet order; the first row of each model is kept, as in data.ingest.merge_catalogs.
+        seen, parts = set(), {key: [] for key in CORE_TEXT_COLUMNS + CORE_NUMERIC_COLUMNS}
+        for sheet in sheets:
+            columns = loaded[sheet]
+            if columns is None:
+                continue
+            keep = first_seen(columns["name"], seen)
+            for key in parts:
+                parts[key].append(np.asarray(columns[key])[keep])
+        logger.info("Loaded %d sheet(s) of %s, skipped %d", len(sheets) - len(self.skipped_sheets), filepath, len(self.skipped_sheets))
+        return {key: np.concatenate(value) if value else np.array([], dtype = float if key in CORE_NUMERIC_COLUMNS else str) for key, value in parts.items()}
+
+    def _sheet_result(self, sheet: str, load):
+        # A sheet that is not a core table (no TYPE header, e.g. a notes sheet) is skipped instead of failing the load.
+        try:
+            return load()
+        except Exception as e:
+            self.skipped_sheets[sheet] = f"{type(e).__name__}: {e}"
+            logger.info("Skipping sheet '%s': %s", sheet, self.skipped_sheets[sheet])
+            return None
+
+    def _add_core(self, core: Core):
+        self.all.append(core)
+        self.by_type[core.core_type].append(core)
+        self.by_model[core.name] = core
+
+    def _load_columns(self, columns: dict):
+        # Cached columns are already in mks units, so unit_conv is not applied again.
+        for i in range(len(columns["name"])):
+            self._add_core(Core(
+                name = str(columns["name"][i]),
+                core_type = str(columns["core_type"][i]),
+                core_area = float(columns["core_area"][i]),
+                window_area = float(columns["window_area"][i]),
+                al_value = float(columns["al_value"][i]),
+                winding_width = float(columns["winding_width"][i]),
+                winding_height = float(columns["winding_height"][i])
+            ))
+
+    def _build_columns(self, columns: dict):
+        self.columns = {key: np.asarray(value) for key, value in columns.items()}
+        self.columns["type_code"] = np.array([core_type_code(t) for t in self.columns["core_type"]], dtype = str)
+        self.columns["area_product"] = self.columns["core_area"] * self.columns["window_area"]
+        self._sorted_index = {}
 
-        self._load(filepath, sheet_name)
+    def _column(self, key: str) -> np.ndarray:
+        key = COLUMN_ALIASES.get(key, key)
+        if key not in CORE_NUMERIC_COLUMNS and key != "area_product":
+            raise ValueError(f"Unknown core column '{key}'.")
+        return self.columns[key]
+
+    def sorted_index(self, key: str) -> np.ndarray:
+        """
+        Row indices ordering the column ascending, NaN rows excluded. Built on first use.
+        """
+        key = COLUMN_ALIASES.get(key, key)
+        if key not in self._sorted_index:
+            column = self._column(key)
+            order = np.argsort(column, kind = "stable")
+            self._sorted_index[key] = order[~np.isnan(column[order])]
+        return self._sorted_index[key]
 
     def _load(self, filepath: str, sheet_name: str):
         df_raw = load_excel_file(filepath, sheet_name)
@@ -20,8 +226,12 @@ class CoreRepository:
         # print(df_clean)
 
         for _, row in df_clean.iterrows():
-            section = str(row.get("Section", "")).strip()
-            name = str(row.get("TYPE", "")).strip()
+            section = section_label(str(row.get("Section", "")).strip(), sheet_name)
+            name = row.get("TYPE")
+            # Rows without a model name (e.g. a stray value below a table) are not cores.
+            if name is None or (isinstance(name, float) and np.isnan(name)) or not str(name).strip():
+                continue
+            name = str(name).strip()
 
             try:
                 core = Core(
@@ -37,17 +247,16 @@ class CoreRepository:
                     # wt=row.get('Wt'),
                     # pcl=row.get('PCL 100kHz 200mT'),
                     # pt=row.get('Pt  (100kHz)'),
-                    winding_width = row.get('width'),
-                    winding_height = row.get('height'),
+                    # Sheets without bobbin dimensions (e.g. the per-type sheets) still give cores for the turns design.
+                    winding_width = row.get('width', np.nan),
+                    winding_height = row.get('height', np.nan),
                     # pin=row.get('PIN'),
                     # shape=row.get('形狀'),
                     core_type = section
                 )
                 core.unit_conv() # convert unit to mks
 
-                self.all.append(core)
-                self.by_type[section].append(core)
-                self.by_model[name] = core
+                self._add_core(core)
 
             except Exception as e:
                 print(f"Skipping core '{name}' due to error: {e}")
@@ -61,6 +270,49 @@ class CoreRepository:
     def filter(self, predicate) -> list[Core]:
         return [core for core in self.all if predicate(core)]
 
+    def mask(self, types = None, **bounds) -> np.ndarray:
+        """
+        Boolean row mask over self.all.
+
+        Parameters:
+            types (Iterable[str], optional): Sections or short type codes to keep, e.g. {"EE", "PQ"}.
+            **bounds: <column>_min / <column>_max limits (inclusive, mks units). Columns are the numeric column names
+                or their aliases ae, aw, al, width, height, ap. Rows with a missing (NaN) bounded value never match.
+
+        Returns:
+            np.ndarray: One bool per core.
+        """
+        mask = np.ones(len(self.all), dtype = bool)
+        if types is not None:
+            types = list(types)
+            mask &= np.isin(self.columns["core_type"], types) | np.isin(self.columns["type_code"], types)
+        for key, value in bounds.items():
+            if value is None:
+                continue
+            if key.endswith("_min"):
+                mask &= self._column(key[:-4]) >= value
+            elif key.endswith("_max"):
+                mask &= self._column(key[:-4]) <= value
+            else:
+                raise ValueError(f"Bound '{key}' must end with _min or _max.")
+        return mask
+
+    def query(self, types = None, **bounds) -> list[Core]:
+        """
+        Cores matching mask(types, **bounds), in sheet order. e.g. repo.query(ae_min = 50e-6, aw_min = 80e-6, types = {"EE", "PQ"})
+        """
+        return [self.all[i] for i in np.flatnonzero(self.mask(types, **bounds))]
+
+    def range(self, key: str, low: float = None, high: float = None) -> list[Core]:
+        """
+        Cores with low <= column <= high, ordered by that column, using the sorted index (binary search).
+        """
+        order = self.sorted_index(key)
+        values = self._column(key)[order]
+        start = 0 if low is None else np.searchsorted(values, low, side = "left")
+        stop = len(order) if high is None else np.searchsorted(values, high, side = "right")
+        return [self.all[i] for i in order[start:stop]]
+
 '''
 Example Usage:
 
@@ -84,4 +336,10 @@ if core:
 # Filter: all cores with Ap > 5
 filtered = repo.filter(lambda c: c.ap and c.ap > 5)
 
+# Vectorized query: EE or PQ cores with Ae >= 50 mm² and Aw >= 80 mm²
+candidates = repo.query(ae_min = 50e-6, aw_min = 80e-6, types = {"EE", "PQ"})
+
+# Range lookup on a sorted column: cores with AL between 2 and 4 uH, ascending
+by_al = repo.range("al", 2e-6, 4e-6)
+
 '''
\ No newline at end of file
@@ -1,6 +1,8 @@
-import pandas as pd
+from utils.lazy import lazy_import
 
-def extract_sections(df_raw: pd.DataFrame):
+pd = lazy_import("pandas", needed_for = "reading core data workbooks")
+
+def extract_sections(df_raw: "pd.DataFrame"):
 
     section_indices = df_raw[df_raw[0].astype(str).str.contains("TYPE")].index.tolist() # find the indices where cells contain "TYPE"
     # Extract the columns. The last three columns contain info only at the next row.
@@ -1,5 +1,10 @@
 # fileloader.py
-import pandas as pd
+from utils.lazy import lazy_import
 
-def load_excel_file(filepath: str, sheetname: str) -> pd.DataFrame:
+pd = lazy_import("pandas", needed_for = "reading core data workbooks")
+
+def load_excel_file(filepath: str, sheetname: str) -> "pd.DataFrame":
     return pd.read_excel(filepath, sheet_name=sheetname, header=None, engine='xlrd')
+
+def list_sheet_names(filepath: str) -> list[str]:
+    return pd.ExcelFile(filepath).sheet_names
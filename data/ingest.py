@@ -0,0 +1,274 @@
+"""
+Streaming ingestion of vendor core catalogs into one merged core repository.
+
+Usage:
+    python -m data.ingest data/core_data.xls vendor_b.xlsx vendor_c.csv -o app_cache/core_db/merged.npz
+"""
+import argparse
+import csv
+import os
+import numpy as np
+from transformer.core import CORE_UNIT_FACTORS
+from data.core_cache import CORE_NUMERIC_COLUMNS, CORE_TEXT_COLUMNS
+from data.core_repo import CoreRepository, section_label, first_seen, CORE_NAME_HEADER
+from utils.lazy import lazy_import
+from utils.log import get_logger
+
+logger = get_logger(__name__)
+xlrd = lazy_import("xlrd", needed_for = "reading .xls core catalogs")
+openpyxl = lazy_import("openpyxl", needed_for = "reading .xlsx core catalogs")
+
+MERGED_REPO_PATH = "./app_cache/core_db/merged.npz"
+MERGED_REPO_VERSION = 1
+# Rows parsed into one block of columns before it is de-duplicated and appended to the merged table
+INGEST_CHUNK_ROWS = 4096
+# Header of each core field in a catalog, as read by CoreRepository._load. A row whose first cell contains the
+# name header starts a section (see extract_sections); the first such row also holds the column headers.
+CATALOG_COLUMNS = {
+    "name": CORE_NAME_HEADER,
+    "core_area": "Ae",
+    "al_value": "AL",
+    "window_area": "Aw",
+    "winding_width": "width",
+    "winding_height": "height"
+}
+# Optional per-row section column, for flat tables (e.g. csv exports) without section rows
+SECTION_COLUMN = "Section"
+CATALOG_EXTENSIONS = (".xls", ".xlsx", ".csv")
+
+
+class CatalogSource:
+    """
+    One vendor catalog to ingest.
+
+    Attributes:
+        path (str): .xls, .xlsx or .csv file.
+        sheets (list[str]): Sheets to read from a workbook, None for every sheet. Ignored for csv.
+        vendor (str): Label stored with each core in the "vendor" column. Defaults to the file name.
+        columns (dict[str, str]): Header per core field for this vendor, overriding CATALOG_COLUMNS.
+        units (dict[str, float]): Factor to mks units per numeric field, overriding CORE_UNIT_FACTORS,
+            e.g. {"core_area": 1e-4} for a catalog that lists Ae in cm².
+    """
+    def __init__(self, path: str, sheets: list[str] = None, vendor: str = None, columns: dict = None, units: dict = None):
+        self.path = path
+        self.sheets = sheets
+        self.vendor = vendor or os.path.splitext(os.path.basename(path))[0]
+        self.columns = {**CATALOG_COLUMNS, **(columns or {})}
+        self.units = {**CORE_UNIT_FACTORS, **(units or {})}
+        self._validate()
+
+    def _validate(self):
+        if os.path.splitext(self.path)[1].lower() not in CATALOG_EXTENSIONS:
+            raise ValueError(f"Unsupported catalog '{self.path}'. Use one of {list(CATALOG_EXTENSIONS)}.")
+        for key in self.units:
+            if key not in CORE_NUMERIC_COLUMNS:
+                raise ValueError(f"Unknown core field '{key}' in the unit factors.")
+
+
+class IngestReport:
+    """
+    Row counts of an ingestion, per source and sheet.
+
+    Attributes:
+        sources (dict[str, dict[str, int]]): "rows" (core rows read), "kept", "duplicates" (models already merged from
+            an earlier row or source) and "skipped" (rows with a non-numeric value) per "<vendor>:<sheet>".
+        output (str): Path of the merged repository, None if it was not written.
+    """
+    def __init__(self):
+        self.sources = {}
+        self.output = None
+
+    def count(self, label: str, key: str, n: int = 1):
+        counts = self.sources.setdefault(label, {"rows": 0, "kept": 0, "duplicates": 0, "skipped": 0})
+        counts[key] += n
+
+    @property
+    def kept(self) -> int:
+        return sum(counts["kept"] for counts in self.sources.values())
+
+    def to_dict(self) -> dict:
+        return {"output": self.output, "kept": self.kept, "sources": self.sources}
+
+    def __str__(self):
+        lines = [f"Merged {self.kept} core(s) from {len(self.sources)} sheet(s)" + (f" into {self.output}" if self.output else "")]
+        for label, counts in self.sources.items():
+            lines.append(f"  {label}: {counts['rows']} row(s), {counts['kept']} kept, {counts['duplicates']} duplicate(s), {counts['skipped']} skipped")
+        return "\n".join(lines)
+
+
+def _cell(value):
+    # Empty cells are None; xlrd returns "" and csv returns "" for them.
+    if isinstance(value, str):
+        value = value.strip()
+        return value or None
+    return value
+
+
+def _iter_sheets(source: CatalogSource):
+    """
+    Yields (sheet name, row iterator) per sheet; a csv file is one sheet named after the file. Workbook sheets are loaded one at a time and each row iterator
+    must be consumed before the next sheet is requested.
+    """
+    ext = os.path.splitext(source.path)[1].lower()
+    if ext == ".csv":
+        with open(source.path, "r", newline = "", encoding = "utf-8-sig") as f:
+            yield os.path.splitext(os.path.basename(source.path))[0], csv.reader(f)
+    elif ext == ".xls":
+        book = xlrd.open_workbook(source.path, on_demand = True)
+        try:
+            for name in source.sheets or book.sheet_names():
+                sheet = book.sheet_by_name(name)
+                yield name, (sheet.row_values(r) for r in range(sheet.nrows))
+                book.unload_sheet(name)
+        finally:
+            book.release_resources()
+    else:
+        book = openpyxl.load_workbook(source.path, read_only = True, data_only = True)
+        try:
+            for name in source.sheets or book.sheetnames:
+                yield name, book[name].iter_rows(values_only = True)
+        finally:
+            book.close()
+
+
+def iter_core_records(rows, source: CatalogSource, label: str):
+    """
+    Core rows of one sheet as (name, section, [numeric values in CORE_NUMERIC_COLUMNS order, catalog units]).
+    Follows extract_sections: rows before the first name header are ignored, each row whose first cell contains the
+    name header starts a section, and rows without a model name (e.g. the unit row) are not cores. A field whose
+    column the sheet does not have is NaN; a row with a non-numeric value is skipped, as in CoreRepository._load.
+    """
+    marker = source.columns["name"]
+    index, section = None, None
+    for row in rows:
+        cells = [_cell(value) for value in row]
+        first = cells[0] if cells else None
+        if isinstance(first, str) and marker in first:
+            if index is None:
+                headers = {}
+                for i, cell in enumerate(cells):
+                    if isinstance(cell, str):
+                        headers.setdefault(cell, i)
+                index = {key: headers.get(header) for key, header in source.columns.items()}
+                index["section"] = headers.get(SECTION_COLUMN)
+            section = first
+            continue
+        if index is None:
+            continue
+        name = cells[index["name"]] if index["name"] is not None and index["name"] < len(cells) else None
+        if name is None:
+            continue
+        values = []
+        try:
+            for key in CORE_NUMERIC_COLUMNS:
+                i = index[key]
+                value = cells[i] if i is not None and i < len(cells) else None
+                values.append(np.nan if value is None else float(value))
+        except (TypeError, ValueError) as e:
+            logger.warning("Skipping core '%s' of %s due to error: %s", name, label, e)
+            yield None
+            continue
+        row_section = cells[index["section"]] if index["section"] is not None and index["section"] < len(cells) else None
+        yield str(name).strip(), str(row_section or section), values
+
+
+def iter_core_chunks(source: CatalogSource, chunk_rows: int = INGEST_CHUNK_ROWS, report: IngestReport = None):
+    """
+    Stream a catalog as blocks of at most chunk_rows cores. Each block is a dict of name, core_type and vendor
+    (str arrays) and the CORE_NUMERIC_COLUMNS (float arrays, mks units), plus the "<vendor>:<sheet>" label.
+    """
+    report = report or IngestReport()
+    factors = np.array([source.units[key] for key in CORE_NUMERIC_COLUMNS])
+    for sheet, rows in _iter_sheets(source):
+        label = f"{source.vendor}:{sheet}"
+        names, sections, values = [], [], []
+        for record in iter_core_records(rows, source, label):
+            report.count(label, "rows")
+            if record is None:
+                report.count(label, "skipped")
+                continue
+            names.append(record[0])
+            sections.append(section_label(record[1], sheet, source.columns["name"]))
+            values.append(record[2])
+            if len(names) >= chunk_rows:
+                yield label, _chunk_columns(names, sections, values, factors, source.vendor)
+                names, sections, values = [], [], []
+        if names:
+            yield label, _chunk_columns(names, sections, values, factors, source.vendor)
+
+
+def _chunk_columns(names, sections, values, factors, vendor) -> dict[str, np.ndarray]:
+    numeric = np.array(values, dtype = float).reshape(len(names), len(factors)) * factors
+    columns = {"name": np.array(names, dtype = str), "core_type": np.array(sections, dtype = str), "vendor": np.full(len(names), vendor)}
+    for j, key in enumerate(CORE_NUMERIC_COLUMNS):
+        columns[key] = numeric[:, j]
+    return columns
+
+
+def merge_catalogs(sources: list[CatalogSource], chunk_rows: int = INGEST_CHUNK_ROWS, report: IngestReport = None) -> dict[str, np.ndarray]:
+    """
+    Stream every source and merge the cores into one column table, de-duplicated by model. Sources are in priority
+    order: the first row of a model is kept and later ones are counted as duplicates. Only the merged columns and the
+    set of model keys are held in memory, never a whole sheet.
+
+    Returns:
+        dict[str, np.ndarray]: CORE_TEXT_COLUMNS, CORE_NUMERIC_COLUMNS and "vendor", as used by CoreRepository.from_columns.
+    """
+    report = report or IngestReport()
+    seen = set()
+    blocks = {key: [] for key in CORE_TEXT_COLUMNS + CORE_NUMERIC_COLUMNS + ("vendor",)}
+    for source in sources:
+        for label, chunk in iter_core_chunks(source, chunk_rows, report):
+            keep = first_seen(chunk["name"], seen)
+            report.count(label, "kept", int(np.count_nonzero(keep)))
+            report.count(label, "duplicates", int(len(keep) - np.count_nonzero(keep)))
+            for key in blocks:
+                blocks[key].append(chunk[key][keep])
+    columns = {}
+    for key, parts in blocks.items():
+        dtype = float if key in CORE_NUMERIC_COLUMNS else str
+        columns[key] = np.concatenate(parts) if parts else np.array([], dtype = dtype)
+    return columns
+
+
+def save_merged_repository(path: str, columns: dict[str, np.ndarray]):
+    os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok = True)
+    tmp_path = path + ".tmp.npz"
+    np.savez(tmp_path, version = np.array([MERGED_REPO_VERSION]), **columns)
+    os.replace(tmp_path, path)
+
+
+def load_merged_repository(path: str = MERGED_REPO_PATH) -> CoreRepository:
+    with np.load(path, allow_pickle = False) as data:
+        if int(data["version"][0]) != MERGED_REPO_VERSION:
+            raise ValueError(f"Merged repository {path} was written by another version. Ingest the catalogs again.")
+        columns = {key: data[key] for key in data.files if key != "version"}
+    return CoreRepository.from_columns(columns, filepath = path)
+
+
+def ingest_catalogs(sources: list[CatalogSource], output: str = MERGED_REPO_PATH, chunk_rows: int = INGEST_CHUNK_ROWS) -> IngestReport:
+    """
+    merge_catalogs + save_merged_repository. Open the result with load_merged_repository(output).
+    """
+    report = IngestReport()
+    columns = merge_catalogs(sources, chunk_rows, report)
+    save_merged_repository(output, columns)
+    report.output = output
+    logger.info("%s", report)
+    return report
+
+
+def main(argv = None) -> int:
+    parser = argparse.ArgumentParser(description = "Merge vendor core catalogs (xls, xlsx, csv) into one core repository.")
+    parser.add_argument("catalogs", nargs = "+", help = "Catalog files, highest priority first.")
+    parser.add_argument("-o", "--output", default = MERGED_REPO_PATH, help = f"Merged repository file (default: {MERGED_REPO_PATH}).")
+    parser.add_argument("--sheet", action = "append", help = "Only read this workbook sheet (repeatable). Default: every sheet.")
+    parser.add_argument("--chunk-rows", type = int, default = INGEST_CHUNK_ROWS, help = f"Rows parsed per block (default: {INGEST_CHUNK_ROWS}).")
+    args = parser.parse_args(argv)
+    report = ingest_catalogs([CatalogSource(path, sheets = args.sheet) for path in args.catalogs], output = args.output, chunk_rows = args.chunk_rows)
+    print(report)
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
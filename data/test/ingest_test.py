@@ -0,0 +1,94 @@
+"""
+Check of the streaming catalog ingestion (data.ingest) against CoreRepository.
+
+- data/core_data.xls merged over every sheet gives the same cores, in the same order, with the same types and
+  values as CoreRepository(path, ALL_SHEETS): 147 cores.
+- A flat csv with a Section column is read with one core type per row, converted to mks units; a row with a
+  non-numeric value is counted as skipped and a repeated model as a duplicate.
+
+Run from the repository root:
+    python data/test/ingest_test.py
+"""
+import os
+import sys
+import shutil
+import tempfile
+import numpy as np
+
+REPO_ROOT = os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+if REPO_ROOT not in sys.path:
+    sys.path.insert(0, REPO_ROOT)
+
+from transformer.core import CORE_UNIT_FACTORS
+from data.core_cache import CORE_NUMERIC_COLUMNS
+from data.core_repo import CoreRepository, ALL_SHEETS
+from data.ingest import CatalogSource, IngestReport, merge_catalogs
+
+CORE_DATA = os.path.join(REPO_ROOT, "data", "core_data.xls")
+EXPECTED_CORES = 147
+# name, section, Ae [mm²], AL [nH], Aw [mm²], width [mm], height [mm]
+CSV_ROWS = [
+    ("TYPE", "Section", "Ae", "AL", "Aw", "width", "height"),
+    ("EE16", "EE", "19.2", "1100", "27.5", "9.5", "3.6"),
+    ("PQ2016", "PQ", "62", "3000", "26.3", "", ""),
+    ("BAD1", "EE", "n/a", "900", "20", "8", "3"),
+    ("", "EE", "1", "1", "1", "1", "1"),
+    ("ee 16", "EE", "20", "1200", "28", "9.6", "3.7")
+]
+
+
+def check_workbook(failures: list):
+    columns = merge_catalogs([CatalogSource(CORE_DATA)])
+    repo = CoreRepository(CORE_DATA, ALL_SHEETS, use_cache = False)
+    if len(columns["name"]) != EXPECTED_CORES or len(repo.all) != EXPECTED_CORES:
+        failures.append(f"expected {EXPECTED_CORES} cores, ingest gave {len(columns['name'])} and CoreRepository {len(repo.all)}")
+    if list(columns["name"]) != [core.name for core in repo.all]:
+        failures.append("ingest and CoreRepository differ in their core names or order")
+    elif not np.array_equal(columns["core_type"], repo.columns["core_type"]):
+        failures.append("ingest and CoreRepository differ in their core types")
+    else:
+        for key in CORE_NUMERIC_COLUMNS:
+            if not np.allclose(columns[key], repo.columns[key], rtol = 1e-12, atol = 0, equal_nan = True):
+                failures.append(f"ingest and CoreRepository differ in {key}")
+
+
+def check_csv(tmp: str, failures: list):
+    path = os.path.join(tmp, "vendor.csv")
+    with open(path, "w", encoding = "utf-8") as f:
+        f.write("\n".join(",".join(row) for row in CSV_ROWS) + "\n")
+    report = IngestReport()
+    columns = merge_catalogs([CatalogSource(path)], report = report)
+    counts = report.sources.get("vendor:vendor")
+    if counts != {"rows": 4, "kept": 2, "duplicates": 1, "skipped": 1}:
+        failures.append(f"csv counts {counts}, expected 4 rows, 2 kept, 1 duplicate and 1 skipped")
+    if list(columns["name"]) != ["EE16", "PQ2016"] or list(columns["core_type"]) != ["EE", "PQ"]:
+        failures.append(f"csv cores {list(columns['name'])} of types {list(columns['core_type'])}, expected EE16 (EE) and PQ2016 (PQ)")
+        return
+    expected = {key: float(CSV_ROWS[1][j + 2]) * CORE_UNIT_FACTORS[key] for j, key in enumerate(("core_area", "al_value", "window_area", "winding_width", "winding_height"))}
+    for key, value in expected.items():
+        if not np.isclose(columns[key][0], value, rtol = 1e-12, atol = 0):
+            failures.append(f"csv {key} of EE16 is {columns[key][0]}, expected {value}")
+    if not (np.isnan(columns["winding_width"][1]) and np.isnan(columns["winding_height"][1])):
+        failures.append("empty csv cells are not read as missing (NaN)")
+
+
+def main() -> int:
+    failures = []
+    tmp = tempfile.mkdtemp()
+    cwd = os.getcwd()
+    os.chdir(tmp)
+    try:
+        check_workbook(failures)
+        check_csv(tmp, failures)
+    finally:
+        os.chdir(cwd)
+        shutil.rmtree(tmp, ignore_errors = True)
+
+    for failure in failures:
+        print(f"[FAIL] {failure}")
+    print(f"Ingest: {'all checks pass' if not failures else f'{len(failures)} check(s) failed'}")
+    return 1 if failures else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
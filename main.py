@@ -1,9 +1,18 @@
+import logging
+import multiprocessing
 import tkinter as tk
 from app.notebook import TransformerApp
 from app.menu import AppMenu
+from utils.log import configure_logging
 
-root = tk.Tk()
-root.title("Transformer Design App")
-app = TransformerApp(root)
-AppMenu(root, app)
-root.mainloop()
\ No newline at end of file
+if __name__ == "__main__":
+    # Multi-sheet core loads run in worker processes. Under spawn (Windows, pyinstaller builds) every worker imports
+    # this module again, so the window is only built in the main process.
+    multiprocessing.freeze_support()
+    configure_logging(logging.INFO)
+
+    root = tk.Tk()
+    root.title("Transformer Design App")
+    app = TransformerApp(root)
+    AppMenu(root, app)
+    root.mainloop()
@@ -0,0 +1,284 @@
+import copy
+import functools
+import numpy as np
+from transformer.tfspec import TransformerSpec, TransformerOption
+from transformer.core import Core, Material
+from transformer.tfdraft import TransformerDraft
+from pipeline.result_cache import ResultCache, cached_design_turns, cached_fit_wire
+from utils.profiling import StageProfiler
+from utils.log import get_logger
+
+logger = get_logger(__name__)
+
+# Nodes of the design graph, in pipeline order
+NODE_N0_MIN = "n0_min"
+NODE_TURNS = "turns_search"
+NODE_SOLUTIONS = "solutions"
+NODE_DRAFT = "draft"
+NODE_SELECTED = "selected"
+NODE_GAP = "gap"
+NODE_WINDINGS = "windings"
+NODE_WIRE = "wire_fit"
+
+# Raw inputs of the design graph. Spec and material fields are separate inputs, so editing one field only
+# invalidates the nodes that read it.
+SPEC_INPUTS = ("lm", "turns_ratio_list", "kl_list", "ip_pk", "vp", "fs", "d_max", "topology", "vsec_main", "pin", "delta_i")
+MATERIAL_INPUTS = ("b_sat", "delta_b")
+DESIGN_INPUTS = SPEC_INPUTS + MATERIAL_INPUTS + ("core", "options", "solution_index", "wire_option", "method", "catalog")
+
+
+def same_value(a, b) -> bool:
+    """
+    Input equality used to decide whether a node must be recomputed: lists and arrays by value,
+    plain objects (Core, WireOption, TransformerOption, ...) by their attributes.
+    """
+    if a is b:
+        return True
+    if a is None or b is None:
+        return False
+    if isinstance(a, (list, tuple, np.ndarray)) or isinstance(b, (list, tuple, np.ndarray)):
+        try:
+            return np.array_equal(np.asarray(a, dtype = object), np.asarray(b, dtype = object))
+        except ValueError:
+            return False
+    if type(a) is not type(b):
+        return False
+    if hasattr(a, "__dict__") and not isinstance(a, (int, float, str)):
+        keys = vars(a).keys() | vars(b).keys()
+        return all(same_value(getattr(a, key, None), getattr(b, key, None)) for key in keys)
+    try:
+        return bool(a == b) or (isinstance(a, float) and np.isnan(a) and np.isnan(b))
+    except Exception:
+        return False
+
+
+class GraphNode:
+    """
+    One cached computation of a DependencyGraph.
+
+    Attributes:
+        name (str): Node name.
+        fn (callable): fn(graph) -> value. Reads its inputs with graph.input(key) and its dependencies with graph.get(name).
+        inputs (tuple[str]): Raw inputs the node reads.
+        deps (tuple[str]): Nodes the node reads.
+        computed (int): Number of times the node was (re)computed.
+    """
+    __slots__ = ("name", "fn", "inputs", "deps", "computed")
+
+    def __init__(self, name: str, fn, inputs: tuple = (), deps: tuple = ()):
+        self.name = name
+        self.fn = fn
+        self.inputs = tuple(inputs)
+        self.deps = tuple(deps)
+        self.computed = 0
+
+
+class DependencyGraph:
+    """
+    Lazily evaluated, dependency-tracked pipeline. update() stores raw inputs and drops the cached values of the nodes
+    that read a changed input and of everything downstream of them; get() recomputes only what was dropped.
+
+    Attributes:
+        nodes (dict[str, GraphNode]): Nodes by name, in insertion order (dependencies first).
+        profiler (StageProfiler): Each node computation runs as a stage of this profiler.
+    """
+    def __init__(self, profiler: StageProfiler = None):
+        self.nodes = {}
+        self.profiler = profiler or StageProfiler()
+        self._inputs = {}
+        self._cache = {}
+        self._dependents = {}
+        self._readers = {}
+
+    def add_node(self, name: str, fn, inputs: tuple = (), deps: tuple = ()) -> GraphNode:
+        for dep in deps:
+            if dep not in self.nodes:
+                raise ValueError(f"Node '{name}' depends on unknown node '{dep}'. Add dependencies first.")
+        node = self.nodes[name] = GraphNode(name, fn, inputs, deps)
+        for dep in node.deps:
+            self._dependents.setdefault(dep, []).append(name)
+        for key in node.inputs:
+            self._readers.setdefault(key, []).append(name)
+        return node
+
+    def input(self, key: str, default = None):
+        return self._inputs.get(key, default)
+
+    def update(self, **inputs) -> set[str]:
+        """
+        Update raw inputs. Unchanged values (see same_value) invalidate nothing.
+
+        Returns:
+            set[str]: Names of the nodes whose cached value was dropped.
+        """
+        invalidated = set()
+        for key, value in inputs.items():
+            if key in self._inputs and same_value(self._inputs[key], value):
+                continue
+            self._inputs[key] = value
+            for name in self._readers.get(key, ()):
+                invalidated |= self.invalidate(name)
+        if invalidated:
+            logger.debug("Inputs %s invalidated %s", sorted(inputs), sorted(invalidated))
+        return invalidated
+
+    def invalidate(self, name: str) -> set[str]:
+        # Drop a node and everything downstream of it.
+        dropped, stack = set(), [name]
+        while stack:
+            current = stack.pop()
+            if current in dropped:
+                continue
+            dropped.add(current)
+            self._cache.pop(current, None)
+            stack.extend(self._dependents.get(current, ()))
+        return dropped
+
+    def is_cached(self, name: str) -> bool:
+        return name in self._cache
+
+    def get(self, name: str):
+        if name in self._cache:
+            return self._cache[name]
+        node = self.nodes[name]
+        for dep in node.deps:
+            self.get(dep)
+        with self.profiler.stage(name):
+            value = node.fn(self)
+        node.computed += 1
+        self._cache[name] = value
+        return value
+
+    def __str__(self):
+        cached = ", ".join(f"{name}{'' if name in self._cache else ' (stale)'}" for name in self.nodes)
+        return f"DependencyGraph: {cached}"
+
+
+def design_inputs(spec: TransformerSpec = None, material: Material = None, core: Core = None, options: TransformerOption = None) -> dict:
+    """
+    Raw design graph inputs from the objects kept on DesignState. Objects that are None are left out.
+    """
+    inputs = {}
+    if spec is not None:
+        inputs.update({key: getattr(spec, key, None) for key in SPEC_INPUTS})
+    if material is not None:
+        inputs.update({key: getattr(material, key, None) for key in MATERIAL_INPUTS})
+    if core is not None:
+        inputs["core"] = core
+    if options is not None:
+        inputs["options"] = options
+    return inputs
+
+
+def _spec(graph: DependencyGraph) -> TransformerSpec:
+    return TransformerSpec(**{key: graph.input(key) for key in SPEC_INPUTS})
+
+
+def _material(graph: DependencyGraph) -> Material:
+    return Material(**{key: graph.input(key) for key in MATERIAL_INPUTS})
+
+
+def _options(graph: DependencyGraph) -> TransformerOption:
+    return graph.input("options") or TransformerOption(turn_use_tolerance = False)
+
+
+def _new_draft(graph: DependencyGraph) -> TransformerDraft:
+    draft = TransformerDraft()
+    draft.create_draft(spec = _spec(graph), options = _options(graph))
+    draft.get_core(graph.input("core"))
+    draft.get_material(_material(graph))
+    return draft
+
+
+def _compute_n0_min(graph: DependencyGraph):
+    draft = _new_draft(graph)
+    draft.update_draft_n0_min()
+    return draft.n0_min
+
+
+def _compute_turns(graph: DependencyGraph, result_cache: ResultCache = None):
+    # The raw search; its draft and solutions keep the spec they were computed with.
+    # The graph times this node itself, so no profiler is passed down.
+    draft = _new_draft(graph)
+    solutions = cached_design_turns(draft, cache = result_cache, n0_min = graph.get(NODE_N0_MIN))
+    return draft, solutions
+
+
+def _compute_solutions(graph: DependencyGraph):
+    # Rebind the solutions to the current spec, so edits the search does not read (e.g. kl_list) reach the windings.
+    spec, options = _spec(graph), _options(graph)
+    solutions = []
+    for solution in graph.get(NODE_TURNS)[1]:
+        solution = copy.copy(solution)
+        solution.spec = spec
+        solution.options = options
+        solution._winding_values = None
+        solutions.append(solution)
+    return solutions
+
+
+def _compute_draft(graph: DependencyGraph) -> TransformerDraft:
+    # The working draft where the search stopped, with windings for the current spec (TransformerDesignTab.design_turns).
+    search_draft = graph.get(NODE_TURNS)[0]
+    draft = TransformerDraft(
+        core = search_draft.core,
+        material = search_draft.material,
+        n0_min = search_draft.n0_min,
+        lg = search_draft.lg,
+        iedc = search_draft.iedc,
+        delta_i = search_draft.delta_i,
+        dmax_cal = search_draft.dmax_cal
+    )
+    draft.create_draft(spec = _spec(graph), options = _options(graph))
+    draft.winding_list[0].turns = search_draft.winding_list[0].turns
+    draft.winding_list[1].turns = search_draft.winding_list[1].turns
+    draft.update_draft_windings()
+    return draft
+
+
+def _compute_selected(graph: DependencyGraph):
+    solutions = graph.get(NODE_SOLUTIONS)
+    if not solutions:
+        raise ValueError("The turns search found no solution.")
+    index = graph.input("solution_index") or 0
+    return solutions[min(index, len(solutions) - 1)]
+
+
+def _compute_gap(graph: DependencyGraph) -> float:
+    return graph.get(NODE_SELECTED).lg
+
+
+def _compute_windings(graph: DependencyGraph) -> TransformerDraft:
+    draft = graph.get(NODE_SELECTED).to_draft()
+    draft.lg = graph.get(NODE_GAP)
+    return draft
+
+
+def _compute_wire(graph: DependencyGraph, result_cache: ResultCache = None) -> dict:
+    draft = graph.get(NODE_WINDINGS)
+    wire_option = graph.input("wire_option")
+    if wire_option is None:
+        raise ValueError("No wire option set for the wire fit.")
+    method = graph.input("method") or "ector_discrete"
+    return cached_fit_wire(draft, wire_option, method, catalog = graph.input("catalog"), cache = result_cache)
+
+
+def design_graph(profiler: StageProfiler = None, result_cache: ResultCache = None) -> DependencyGraph:
+    """
+    The design pipeline spec -> n0_min -> turns -> gap -> windings -> wire as a DependencyGraph.
+    Set the inputs with graph.update(**design_inputs(...), wire_option = ..., method = ..., catalog = ...) and read any
+    node with graph.get(NODE_...). Each node only lists the inputs it reads, e.g. editing delta_b reruns n0_min and the
+    turns search, editing kl_list only rebuilds the windings, and editing the wire option only reruns the wire fit.
+    With a result_cache, the turns search and the wire fit are also looked up on disk before they run.
+    """
+    flux_inputs = ("lm", "ip_pk", "delta_i", "vp", "fs", "d_max", "b_sat", "delta_b", "core", "options")
+    graph = DependencyGraph(profiler = profiler)
+    graph.add_node(NODE_N0_MIN, _compute_n0_min, inputs = flux_inputs)
+    graph.add_node(NODE_TURNS, functools.partial(_compute_turns, result_cache = result_cache), inputs = flux_inputs + ("turns_ratio_list", "topology", "vsec_main", "pin"), deps = (NODE_N0_MIN,))
+    graph.add_node(NODE_SOLUTIONS, _compute_solutions, inputs = SPEC_INPUTS + ("options",), deps = (NODE_TURNS,))
+    graph.add_node(NODE_DRAFT, _compute_draft, inputs = SPEC_INPUTS + ("options",), deps = (NODE_TURNS,))
+    graph.add_node(NODE_SELECTED, _compute_selected, inputs = ("solution_index",), deps = (NODE_SOLUTIONS,))
+    graph.add_node(NODE_GAP, _compute_gap, deps = (NODE_SELECTED,))
+    graph.add_node(NODE_WINDINGS, _compute_windings, deps = (NODE_SELECTED, NODE_GAP))
+    graph.add_node(NODE_WIRE, functools.partial(_compute_wire, result_cache = result_cache), inputs = ("wire_option", "method", "catalog"), deps = (NODE_WINDINGS,))
+    return graph
@@ -0,0 +1,197 @@
+import numpy as np
+from transformer.core import Material
+from transformer.tfspec import TransformerSpec, TransformerOption
+from transformer.sweep import sweep_cores
+from bobbin.batch import fit_wire_batch
+from bobbin.option import WireOption
+from utils.log import get_logger
+
+logger = get_logger(__name__)
+
+# Objectives of the design explorer, all minimized
+PARETO_OBJECTIVES = ("lg", "height_required", "j_max", "primary_turns")
+
+
+def nondominated_mask(values) -> np.ndarray:
+    """
+    Mask of the rows of values (n, m) that no other row dominates (all objectives minimized).
+    Rows are visited in lexicographic order, where a dominating row always comes first, so each row is only
+    compared with the rows kept so far. Of several identical rows only the first is kept.
+    """
+    values = np.asarray(values, dtype = float)
+    mask = np.zeros(len(values), dtype = bool)
+    if len(values) == 0:
+        return mask
+    kept = np.empty((0, values.shape[1]))
+    for i in np.lexsort(values.T[::-1]):
+        if not np.any(np.all(kept <= values[i], axis = 1)):
+            mask[i] = True
+            kept = np.vstack([kept, values[i]])
+    return mask
+
+
+class ParetoFront:
+    """
+    Incrementally maintained set of non-dominated items, all objectives minimized.
+    Only the current front is kept: an added item is dropped at once if the front dominates it, and the
+    front members it dominates are removed.
+
+    Attributes:
+        objectives (tuple[str]): Objective names, in the column order of values.
+        items (list): Front members, row i of values belongs to items[i].
+        evaluated (int): Number of candidates offered to the front so far.
+    """
+    def __init__(self, objectives: tuple = PARETO_OBJECTIVES):
+        self.objectives = tuple(objectives)
+        self.items = []
+        self.evaluated = 0
+        self._values = np.empty((0, len(self.objectives)))
+
+    def __len__(self):
+        return len(self.items)
+
+    @property
+    def values(self) -> np.ndarray:
+        return self._values
+
+    def is_dominated(self, values) -> bool:
+        # Weak dominance, so a candidate equal to a member is rejected as well.
+        return bool(np.any(np.all(self._values <= np.asarray(values, dtype = float), axis = 1)))
+
+    def add(self, values, item) -> bool:
+        """
+        Offer one candidate. Returns True if it joined the front.
+        """
+        self.evaluated += 1
+        return self._insert(np.asarray(values, dtype = float), item)
+
+    def _insert(self, values: np.ndarray, item) -> bool:
+        if np.any(np.isnan(values)) or self.is_dominated(values):
+            return False
+        keep = ~np.all(values <= self._values, axis = 1)
+        self._values = np.vstack([self._values[keep], values])
+        self.items = [item for item, k in zip(self.items, keep) if k] + [item]
+        return True
+
+    def add_batch(self, values, make_item) -> int:
+        """
+        Offer many candidates at once. The batch is reduced to its own non-dominated rows first, and make_item(i)
+        is only called for rows that can still join the front, so dominated candidates are never built.
+
+        Returns:
+            int: Number of candidates that joined the front.
+        """
+        values = np.asarray(values, dtype = float).reshape(-1, len(self.objectives))
+        self.evaluated += len(values)
+        rows = np.flatnonzero(~np.isnan(values).any(axis = 1))
+        added = 0
+        for i in rows[nondominated_mask(values[rows])]:
+            if not self.is_dominated(values[i]):
+                added += self._insert(values[i], make_item(i))
+        return added
+
+    def sorted(self, objective: str = None) -> list:
+        # Front members ordered by one objective (the first one by default).
+        column = 0 if objective is None else self.objectives.index(objective)
+        return [self.items[i] for i in np.argsort(self._values[:, column], kind = "stable")]
+
+    def __str__(self):
+        return f"ParetoFront over {', '.join(self.objectives)}: {len(self)} design(s) from {self.evaluated} evaluated"
+
+
+class ParetoCandidate:
+    """
+    One design on the front: a turns solution of a core combined with one wire option preset.
+
+    Attributes:
+        solution (TurnsSolution): Turns solution, see TurnsSolution.to_draft.
+        option_index (int): Index of the WireOption preset passed to explore_pareto.
+        wire_result (dict): Wire fit result in the fit_wire_ector format.
+        lg (float): Air gap length [m]. (doc: lg)
+        height_required (float): Bobbin height used by the windings [m]. (doc: hr)
+        j_max (float): Largest current density among the windings [A/m²].
+        primary_turns (float): Primary turns (doc: N0)
+    """
+    def __init__(self, solution = None, option_index: int = None, wire_result: dict = None, objectives = None):
+        self.solution = solution
+        self.option_index = option_index
+        self.wire_result = wire_result
+        self.lg, self.height_required, self.j_max, self.primary_turns = objectives
+
+    @property
+    def core(self):
+        return self.solution.core
+
+    def to_draft(self):
+        # Expand the turns solution and apply the wires, as the GUI does after a wire optimization.
+        draft = self.solution.to_draft()
+        draft.apply_wire(self.wire_result)
+        return draft
+
+    def __str__(self):
+        return (
+            f"{self.core.name}: turns = {self.solution.turns}, option #{self.option_index}, lg = {self.lg}, "
+            f"hr = {self.height_required}, J max = {self.j_max}"
+        )
+
+
+def explore_pareto(
+        spec: TransformerSpec,
+        material: Material,
+        cores,
+        wire_options: list[WireOption],
+        method: str = "ector_continuous",
+        catalog = None,
+        options: TransformerOption = None,
+        max_workers: int = None,
+        front: ParetoFront = None
+) -> ParetoFront:
+    """
+    Search turns solutions x wire option presets over many cores for the Pareto front of
+    (lg, height_required, max j_cal, primary turns).
+    Cores are streamed from sweep_cores and each core's solutions are fitted with fit_wire_batch, so only one core's
+    candidates and the current front are held in memory at any time.
+
+    Parameters:
+        spec (TransformerSpec): Transformer specification.
+        material (Material): Core material.
+        cores (CoreRepository | list[Core]): Cores to explore.
+        wire_options (list[WireOption]): Wire option presets tried on every turns solution.
+        method (str): "ector_continuous" or "ector_discrete".
+        catalog (array-like, optional): Wire diameters [m], required for "ector_discrete".
+        options (TransformerOption, optional): Turns search options.
+        max_workers (int, optional): Worker processes for the turns search, see sweep_cores.
+        front (ParetoFront, optional): Existing front to extend, e.g. across several repositories.
+
+    Returns:
+        ParetoFront: Items are ParetoCandidate.
+    """
+    if method not in ("ector_continuous", "ector_discrete"):
+        raise ValueError("The Pareto explorer needs an ector method, as the kf method gives no bobbin height.")
+    if front is None:
+        front = ParetoFront()
+    for core_result in sweep_cores(spec, material, cores, options = options, max_workers = max_workers):
+        if not core_result.feasible:
+            continue
+        solutions = core_result.solutions
+        table = fit_wire_batch(solutions, wire_options, method = method, catalog = catalog)
+        with np.errstate(invalid = "ignore"):
+            values = np.column_stack([
+                np.array([solutions[i].lg for i in table.draft_index], dtype = float),
+                table.height_required,
+                np.nanmax(np.where(table.feasible[:, None], table.j_cal, -np.inf), axis = 1),
+                np.array([solutions[i].turns[0] for i in table.draft_index], dtype = float)
+            ])
+        values[~table.feasible] = np.nan
+
+        def make_item(i):
+            return ParetoCandidate(
+                solution = solutions[table.draft_index[i]],
+                option_index = int(table.option_index[i]),
+                wire_result = table.row(i),
+                objectives = tuple(float(v) for v in values[i])
+            )
+
+        front.add_batch(values, make_item)
+    logger.info("%s", front)
+    return front
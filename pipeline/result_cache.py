@@ -0,0 +1,295 @@
+import hashlib
+import json
+import os
+import threading
+import numpy as np
+from transformer.core import Core
+from transformer.tfdraft import TransformerDraft, TurnsSolution
+from bobbin.option import WireOption, default_wire_catalog
+from bobbin.ector import fit_wire_ector
+from bobbin.kf_method import fit_wire_kf
+from utils.formulae import calculate_wire_area
+from utils.serialization import make_yaml_serializable
+from utils.profiling import StageProfiler, STAGE_N0_MIN, STAGE_TURNS_SEARCH
+from utils.log import get_logger
+
+logger = get_logger(__name__)
+
+RESULT_CACHE_DIR = "./app_cache/results"
+RESULT_CACHE_VERSION = 1
+RESULT_CACHE_MAX_BYTES = 64 * 1024 * 1024
+# Significant digits kept when floats are normalised for the key, so values that went through a text field still match.
+RESULT_KEY_DIGITS = 12
+# Core fields read by the turns search and by the wire fits. Name and type are left out of the keys, so identical
+# cores from different sheets share entries.
+TURNS_CORE_FIELDS = ("core_area",)
+WIRE_CORE_FIELDS = ("window_area", "winding_width", "winding_height")
+# Wire methods of cached_fit_wire and the entries of their results that are restored as np.ndarray on a hit
+WIRE_ARRAY_KEYS = {
+    "ector_continuous": ("di_list", "li_list", "j_cal_list", "fill_rate_list"),
+    "ector_discrete": ("di_list", "li_list", "j_cal_list", "fill_rate_list"),
+    "kf": ("di_list",)
+}
+WIRE_METHODS = tuple(WIRE_ARRAY_KEYS)
+
+
+def _normalise(value):
+    # Canonical JSON-able form: floats rounded to RESULT_KEY_DIGITS, arrays and tuples as lists, objects as dicts.
+    if value is None or isinstance(value, (bool, np.bool_, str)):
+        return bool(value) if isinstance(value, np.bool_) else value
+    if isinstance(value, (int, np.integer)):
+        return float(value)
+    if isinstance(value, (float, np.floating)):
+        return None if np.isnan(value) else float(f"{float(value):.{RESULT_KEY_DIGITS}g}")
+    if isinstance(value, np.ndarray):
+        return _normalise(value.tolist())
+    if isinstance(value, (list, tuple)):
+        return [_normalise(v) for v in value]
+    if isinstance(value, dict):
+        return {str(k): _normalise(v) for k, v in sorted(value.items())}
+    return _normalise(vars(value))
+
+
+def result_key(kind: str, **parts) -> str:
+    """
+    Content hash of a cache entry: kind plus the normalised inputs, e.g. result_key("turns", spec = spec, core = ...).
+    """
+    payload = json.dumps({"kind": kind, "version": RESULT_CACHE_VERSION, **_normalise(parts)}, sort_keys = True)
+    return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+
+def _core_fields(core: Core, fields: tuple) -> dict:
+    return {key: getattr(core, key, None) for key in fields}
+
+
+class ResultCache:
+    """
+    On-disk, content-addressed cache of solver results with a size-bounded LRU eviction.
+    One JSON file per entry under cache_dir; a hit refreshes the file's mtime, and when the cache grows past max_bytes
+    the least recently used files are removed. Several processes may share a directory: writes are atomic and a
+    file that disappears underneath is a miss.
+
+    Attributes:
+        cache_dir (str): Directory of the entries.
+        max_bytes (int): Size bound of the directory.
+        hits (int): Lookups answered from the cache in this process.
+        misses (int): Lookups that ran the solver in this process.
+    """
+    def __init__(self, cache_dir: str = RESULT_CACHE_DIR, max_bytes: int = RESULT_CACHE_MAX_BYTES):
+        self.cache_dir = cache_dir
+        self.max_bytes = max_bytes
+        self.hits = 0
+        self.misses = 0
+        self._size = None
+        self._lock = threading.Lock()
+
+    def __getstate__(self):
+        # Picklable for sweep worker processes; each process tracks its own size estimate.
+        return {"cache_dir": self.cache_dir, "max_bytes": self.max_bytes}
+
+    def __setstate__(self, state):
+        self.__init__(**state)
+
+    def _path(self, key: str) -> str:
+        return os.path.join(self.cache_dir, key[:2], f"{key}.json")
+
+    def _entries(self):
+        if not os.path.isdir(self.cache_dir):
+            return []
+        entries = []
+        for sub in os.scandir(self.cache_dir):
+            if sub.is_dir():
+                for entry in os.scandir(sub.path):
+                    if entry.name.endswith(".json"):
+                        stat = entry.stat()
+                        entries.append((stat.st_mtime_ns, stat.st_size, entry.path))
+        return entries
+
+    @property
+    def size_bytes(self) -> int:
+        return sum(size for _, size, _ in self._entries())
+
+    def __len__(self):
+        return len(self._entries())
+
+    def get(self, key: str) -> dict | None:
+        path = self._path(key)
+        try:
+            with open(path, "r") as f:
+                value = json.load(f)
+            os.utime(path)
+        except FileNotFoundError:
+            self.misses += 1
+            return None
+        except Exception as e:
+            logger.warning("Ignoring unreadable result cache entry %s: %s", path, e)
+            self.misses += 1
+            return None
+        self.hits += 1
+        return value
+
+    def put(self, key: str, value: dict):
+        path = self._path(key)
+        try:
+            os.makedirs(os.path.dirname(path), exist_ok = True)
+            text = json.dumps(make_yaml_serializable(value))
+            tmp_path = f"{path}.{os.getpid()}.{threading.get_ident()}.tmp"
+            with open(tmp_path, "w") as f:
+                f.write(text)
+            os.replace(tmp_path, path)
+        except Exception as e:
+            logger.warning("Failed to save result cache entry %s: %s", path, e)
+            return
+        with self._lock:
+            if self._size is None:
+                self._size = self.size_bytes
+            else:
+                self._size += len(text)
+            if self._size > self.max_bytes:
+                self._evict()
+
+    def _evict(self):
+        # Remove the least recently used entries until the cache is back under 90 % of max_bytes.
+        entries = sorted(self._entries())
+        size = sum(s for _, s, _ in entries)
+        target = 0.9 * self.max_bytes
+        removed = 0
+        for _, entry_size, path in entries:
+            if size <= target:
+                break
+            try:
+                os.remove(path)
+            except FileNotFoundError:
+                pass
+            size -= entry_size
+            removed += 1
+        self._size = size
+        logger.info("Evicted %d result cache entries from %s", removed, self.cache_dir)
+
+    def clear(self):
+        for _, _, path in self._entries():
+            try:
+                os.remove(path)
+            except FileNotFoundError:
+                pass
+        self._size = 0
+
+    def __str__(self):
+        return f"ResultCache at {self.cache_dir}: {self.hits} hit(s), {self.misses} miss(es)"
+
+
+def turns_key(draft: TransformerDraft) -> str:
+    return result_key("turns", spec = vars(draft.spec), options = vars(draft.options), material = vars(draft.material), core = _core_fields(draft.core, TURNS_CORE_FIELDS))
+
+
+def load_turns(draft: TransformerDraft, cache: ResultCache) -> list[TurnsSolution] | None:
+    """
+    Restore update_draft_n0_min + determine_draft_turns from the cache into a draft made by create_draft, get_core and
+    get_material: the draft is left where the search stopped, as after the solver.
+
+    Returns:
+        list[TurnsSolution]: The solutions, None on a miss (the draft is left untouched).
+    """
+    entry = cache.get(turns_key(draft))
+    if entry is None:
+        return None
+    draft.n0_min = entry["n0_min"]
+    draft.windings.turns[:] = [np.nan if n is None else n for n in entry["turns"]]
+    draft.lg, draft.iedc, draft.delta_i, draft.dmax_cal = entry["lg"], entry["iedc"], entry["delta_i"], entry["dmax_cal"]
+    draft.trace = entry["trace"]
+    return [
+        TurnsSolution(draft = draft, turns = tuple(s["turns"]), lg = s["lg"], dmax_cal = s["dmax_cal"], iedc = s["iedc"], delta_i = s["delta_i"], strict = s["strict"])
+        for s in entry["solutions"]
+    ]
+
+
+def store_turns(draft: TransformerDraft, solutions: list[TurnsSolution], cache: ResultCache):
+    cache.put(turns_key(draft), {
+        "n0_min": draft.n0_min,
+        "turns": [None if np.isnan(n) else n for n in draft.windings.turns],
+        "lg": draft.lg,
+        "iedc": draft.iedc,
+        "delta_i": draft.delta_i,
+        "dmax_cal": draft.dmax_cal,
+        "trace": draft.trace,
+        "solutions": [
+            {"turns": s.turns, "lg": s.lg, "dmax_cal": s.dmax_cal, "iedc": s.iedc, "delta_i": s.delta_i, "strict": s.strict}
+            for s in solutions
+        ]
+    })
+
+
+def cached_design_turns(draft: TransformerDraft, cache: ResultCache = None, profiler: StageProfiler = None, n0_min: float = None) -> list[TurnsSolution]:
+    """
+    update_draft_n0_min + determine_draft_turns on a draft made by create_draft, get_core and get_material, answered
+    from the cache when the same spec, options, material and core were designed before. Failures are not cached.
+    This is the one cache-aware turns design; the sweep, the design graph and the headless pipeline all call it.
+
+    Parameters:
+        draft (TransformerDraft): The draft to design, left where the search stopped.
+        cache (ResultCache, optional): Result cache; None always runs the solver.
+        profiler (StageProfiler, optional): Times the n0_min and turns search stages when the solver runs.
+        n0_min (float, optional): Minimum primary turns computed elsewhere (e.g. the design graph's n0_min node),
+            used instead of update_draft_n0_min.
+    """
+    profiler = profiler or StageProfiler()
+    solutions = load_turns(draft, cache) if cache is not None else None
+    if solutions is None:
+        with profiler.stage(STAGE_N0_MIN):
+            if n0_min is None:
+                draft.update_draft_n0_min()
+            else:
+                draft.n0_min = n0_min
+        with profiler.stage(STAGE_TURNS_SEARCH):
+            solutions = draft.determine_draft_turns()
+        if cache is not None:
+            store_turns(draft, solutions, cache)
+    return solutions
+
+
+def wire_key(draft: TransformerDraft, option: WireOption, method: str, catalog = None) -> str:
+    # A discrete fit without a catalog is keyed by the catalog it is fitted with, so a changed default never hits.
+    if method == "ector_discrete" and catalog is None:
+        catalog = default_wire_catalog()
+    windings = draft.windings
+    return result_key(
+        "wire",
+        turns = windings.turns,
+        i_rms = windings.i_rms,
+        core = _core_fields(draft.core, WIRE_CORE_FIELDS),
+        option = vars(option),
+        method = method,
+        catalog = catalog if method == "ector_discrete" else None
+    )
+
+
+def cached_fit_wire(draft: TransformerDraft, option: WireOption, method: str, catalog = None, cache: ResultCache = None) -> dict:
+    """
+    fit_wire_ector / fit_wire_kf for method "ector_continuous", "ector_discrete" or "kf", answered from the cache when
+    the same windings, bobbin, wire option (and catalog) were fitted before. The discrete method defaults to
+    default_wire_catalog(), the catalog of the wire tab.
+    """
+    if method not in WIRE_METHODS:
+        raise ValueError("Invalid optimization method")
+    if method == "ector_discrete" and catalog is None:
+        catalog = default_wire_catalog()
+    key = wire_key(draft, option, method, catalog) if cache is not None else None
+    result = cache.get(key) if cache is not None else None
+    if result is not None:
+        for name in WIRE_ARRAY_KEYS[method]:
+            if result.get(name) is not None:
+                result[name] = np.asarray(result[name])
+        if method == "kf":
+            # fit_wire_kf also fills in the wire areas of the draft
+            draft.windings.wire_area[:] = calculate_wire_area(irms = draft.windings.i_rms, j = np.asarray(option.ji_list[:len(draft.windings)], dtype = float))
+        return result
+
+    if method == "ector_continuous":
+        result = fit_wire_ector(draft, option, discrete = False)
+    elif method == "ector_discrete":
+        result = fit_wire_ector(draft, option, discrete = True, catalog = catalog)
+    else:
+        result = fit_wire_kf(draft, option)
+    if cache is not None:
+        cache.put(key, result)
+    return result
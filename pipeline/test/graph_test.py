@@ -0,0 +1,86 @@
+"""
+Check of the invalidation rules of the design graph (pipeline.graph.design_graph) on the example workspace.
+
+After each edit the wire fit is read again, and the number of times every node was recomputed (GraphNode.computed)
+must match what the edit invalidates:
+- kl_list is not read by the turns search, so n0_min and turns_search are not rerun;
+- delta_b reruns n0_min and turns_search;
+- the wire option only reruns wire_fit;
+- an update() with unchanged values invalidates nothing and reruns nothing.
+
+Run from the repository root:
+    python pipeline/test/graph_test.py
+"""
+import os
+import sys
+import yaml
+
+REPO_ROOT = os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+if REPO_ROOT not in sys.path:
+    sys.path.insert(0, REPO_ROOT)
+
+from transformer.tfspec import TransformerSpec, TransformerOption
+from transformer.core import Core, Material
+from bobbin.option import WireOption, BASIC_WIRE_CONFIG
+from pipeline.graph import design_graph, design_inputs, NODE_N0_MIN, NODE_TURNS, NODE_SOLUTIONS, NODE_SELECTED, NODE_GAP, NODE_WINDINGS, NODE_WIRE
+
+EXAMPLE_WORKSPACE = os.path.join(REPO_ROOT, "example", "pmp22345", "pmp22345.yaml")
+ALL_NODES = (NODE_N0_MIN, NODE_TURNS, NODE_SOLUTIONS, NODE_SELECTED, NODE_GAP, NODE_WINDINGS, NODE_WIRE)
+
+
+def wire_option(wire_spec: dict, kf: float = 0.3) -> WireOption:
+    return WireOption(
+        ji_list = wire_spec["ji_list"],
+        pi_list = wire_spec["pi_list"],
+        spi_list = wire_spec["spi_list"],
+        lt = wire_spec["lt"],
+        insulator_thickness = BASIC_WIRE_CONFIG["insulator_thickness"],
+        kwb = BASIC_WIRE_CONFIG["kwb"],
+        khb = BASIC_WIRE_CONFIG["khb"],
+        ht = BASIC_WIRE_CONFIG["ht"],
+        kf = kf
+    )
+
+
+def main() -> int:
+    with open(EXAMPLE_WORKSPACE, "r") as f:
+        data = yaml.safe_load(f)
+    spec_kwargs = dict(data["transformer"]["spec"])
+    material = Material(b_sat = spec_kwargs.pop("b_sat", None))
+    spec = TransformerSpec(**spec_kwargs)
+    core = Core.from_dict(data["transformer"]["core"]["core"])
+    wire_spec = data["wire"]["wire_spec"]
+
+    graph = design_graph()
+    initial = dict(
+        design_inputs(spec = spec, material = material, core = core, options = TransformerOption(turn_use_tolerance = False)),
+        wire_option = wire_option(wire_spec),
+        method = BASIC_WIRE_CONFIG["method"]
+    )
+    graph.update(**initial)
+    graph.get(NODE_WIRE)
+
+    kl_list = list(spec.kl_list)
+    kl_list[-1] *= 1.1
+    edits = [
+        ("kl_list", dict(kl_list = kl_list), {NODE_SOLUTIONS, NODE_SELECTED, NODE_GAP, NODE_WINDINGS, NODE_WIRE}),
+        ("delta_b", dict(delta_b = 0.12), set(ALL_NODES)),
+        ("wire_option", dict(wire_option = wire_option(wire_spec, kf = 0.25)), {NODE_WIRE}),
+        ("unchanged", dict(initial, kl_list = kl_list, delta_b = 0.12, wire_option = wire_option(wire_spec, kf = 0.25)), set())
+    ]
+    failures = 0
+    for label, inputs, expected in edits:
+        before = {name: graph.nodes[name].computed for name in ALL_NODES}
+        invalidated = graph.update(**inputs)
+        graph.get(NODE_WIRE)
+        rerun = {name for name in ALL_NODES if graph.nodes[name].computed != before[name]}
+        # An edit may also drop nodes the wire fit does not read (e.g. draft), an unchanged update drops nothing.
+        if rerun != expected or not expected <= invalidated or (not expected and invalidated):
+            failures += 1
+            print(f"[FAIL] {label}: reran {sorted(rerun)}, invalidated {sorted(invalidated)}, expected {sorted(expected)}")
+    print(f"{len(edits) - failures}/{len(edits)} graph edits recompute only the nodes they invalidate")
+    return 1 if failures else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
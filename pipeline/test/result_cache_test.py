@@ -0,0 +1,157 @@
+"""
+Check of the persistent result cache (pipeline.result_cache) on the example workspace, in a temporary directory.
+
+- Round trip: a second turns design and wire fit of the same inputs are hits and return the same solutions and wires.
+- A changed input (Lm, the wire option, the catalog) misses; a discrete fit without a catalog shares the entry of
+  default_wire_catalog().
+- LRU eviction keeps the directory under max_bytes and drops the least recently used entries first.
+
+Run from the repository root:
+    python pipeline/test/result_cache_test.py
+"""
+import os
+import sys
+import copy
+import shutil
+import tempfile
+import numpy as np
+import yaml
+
+REPO_ROOT = os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+if REPO_ROOT not in sys.path:
+    sys.path.insert(0, REPO_ROOT)
+
+from transformer.tfspec import TransformerSpec, TransformerOption
+from transformer.core import Core, Material
+from transformer.tfdraft import TransformerDraft
+from bobbin.option import WireOption, BASIC_WIRE_CONFIG, default_wire_catalog
+from pipeline.result_cache import ResultCache, cached_design_turns, cached_fit_wire, wire_key
+
+EXAMPLE_WORKSPACE = os.path.join(REPO_ROOT, "example", "pmp22345", "pmp22345.yaml")
+EVICTION_MAX_BYTES = 8 * 1024
+EVICTION_ENTRIES = 40
+
+
+def new_draft(spec: TransformerSpec, material: Material, core: Core) -> TransformerDraft:
+    draft = TransformerDraft()
+    draft.create_draft(spec = spec, options = TransformerOption(turn_use_tolerance = True))
+    draft.get_core(core)
+    draft.get_material(material)
+    return draft
+
+
+def same_solutions(a: list, b: list) -> bool:
+    return len(a) == len(b) and all(
+        x.turns == y.turns and x.strict == y.strict and np.allclose([x.lg, x.dmax_cal, x.iedc, x.delta_i], [y.lg, y.dmax_cal, y.iedc, y.delta_i], rtol = 1e-12, atol = 0)
+        for x, y in zip(a, b)
+    )
+
+
+def same_wire(a: dict, b: dict) -> bool:
+    return a["status"] == b["status"] and all(
+        (a[key] is None and b[key] is None) or np.allclose(a[key], b[key], rtol = 1e-12, atol = 0)
+        for key in ("di_list", "li_list", "j_cal_list", "fill_rate_list")
+    )
+
+
+def check_round_trip(cache: ResultCache, example: dict, failures: list):
+    spec, material, core, option = example["spec"], example["material"], example["core"], example["wire_option"]
+    draft = new_draft(spec, material, core)
+    solutions = cached_design_turns(draft, cache = cache)
+    hits = cache.hits
+    cached_draft = new_draft(spec, material, core)
+    cached_solutions = cached_design_turns(cached_draft, cache = cache)
+    if cache.hits != hits + 1 or not same_solutions(solutions, cached_solutions):
+        failures.append("turns round trip did not return the same solutions from the cache")
+    if not np.array_equal(cached_draft.windings.turns, draft.windings.turns, equal_nan = True) or cached_draft.lg != draft.lg:
+        failures.append("turns round trip did not restore the draft where the search stopped")
+
+    windings = solutions[0].to_draft()
+    wire = cached_fit_wire(windings, option, "ector_discrete", cache = cache)
+    hits = cache.hits
+    cached_wire = cached_fit_wire(solutions[0].to_draft(), option, "ector_discrete", cache = cache)
+    if cache.hits != hits + 1 or not same_wire(wire, cached_wire):
+        failures.append("wire round trip did not return the same wires from the cache")
+
+
+def check_misses(cache: ResultCache, example: dict, failures: list):
+    spec, material, core, option = example["spec"], example["material"], example["core"], example["wire_option"]
+    changed_spec = copy.copy(spec)
+    changed_spec.lm = spec.lm * 1.05
+    misses = cache.misses
+    cached_design_turns(new_draft(changed_spec, material, core), cache = cache)
+    if cache.misses != misses + 1:
+        failures.append("a changed Lm was answered from the cache")
+
+    windings = cached_design_turns(new_draft(spec, material, core), cache = cache)[0].to_draft()
+    changed_option = copy.copy(option)
+    changed_option.khb = option.khb * 0.9
+    misses = cache.misses
+    cached_fit_wire(windings, changed_option, "ector_discrete", cache = cache)
+    if cache.misses != misses + 1:
+        failures.append("a changed wire option was answered from the cache")
+
+    catalog = default_wire_catalog()
+    if wire_key(windings, option, "ector_discrete") != wire_key(windings, option, "ector_discrete", catalog):
+        failures.append("a discrete fit without a catalog is not keyed by default_wire_catalog()")
+    if wire_key(windings, option, "ector_discrete", catalog[:-1]) == wire_key(windings, option, "ector_discrete", catalog):
+        failures.append("a changed catalog has the same key")
+
+
+def check_eviction(cache_dir: str, failures: list):
+    payload = {"values": list(np.linspace(0, 1, 32))}
+    keys = [f"{i:064x}" for i in range(EVICTION_ENTRIES)]
+    filler = ResultCache(cache_dir = cache_dir, max_bytes = EVICTION_ENTRIES * EVICTION_MAX_BYTES)
+    for i, key in enumerate(keys[:-1]):
+        filler.put(key, payload)
+        os.utime(filler._path(key), ns = (i * 10 ** 9, i * 10 ** 9))    # one second apart, oldest first
+
+    cache = ResultCache(cache_dir = cache_dir, max_bytes = EVICTION_MAX_BYTES)
+    cache.get(keys[0])    # the oldest entry becomes the most recently used
+    cache.put(keys[-1], payload)
+    if cache.size_bytes > EVICTION_MAX_BYTES:
+        failures.append(f"cache holds {cache.size_bytes} bytes, more than max_bytes = {EVICTION_MAX_BYTES}")
+    present = [os.path.exists(cache._path(key)) for key in keys]
+    if not (present[0] and present[-1]) or present[1]:
+        failures.append(f"eviction did not follow the last use: entries present = {present}")
+
+
+def main() -> int:
+    with open(EXAMPLE_WORKSPACE, "r") as f:
+        data = yaml.safe_load(f)
+    spec_kwargs = dict(data["transformer"]["spec"])
+    wire_spec = data["wire"]["wire_spec"]
+    example = {
+        "material": Material(b_sat = spec_kwargs.pop("b_sat", None)),
+        "spec": TransformerSpec(**spec_kwargs),
+        "core": Core.from_dict(data["transformer"]["core"]["core"]),
+        "wire_option": WireOption(
+            ji_list = wire_spec["ji_list"],
+            pi_list = wire_spec["pi_list"],
+            spi_list = wire_spec["spi_list"],
+            lt = wire_spec["lt"],
+            insulator_thickness = BASIC_WIRE_CONFIG["insulator_thickness"],
+            kwb = BASIC_WIRE_CONFIG["kwb"],
+            khb = BASIC_WIRE_CONFIG["khb"],
+            ht = BASIC_WIRE_CONFIG["ht"]
+        )
+    }
+
+    failures = []
+    tmp = tempfile.mkdtemp()
+    try:
+        cache = ResultCache(cache_dir = os.path.join(tmp, "results"))
+        check_round_trip(cache, example, failures)
+        check_misses(cache, example, failures)
+        check_eviction(os.path.join(tmp, "eviction"), failures)
+    finally:
+        shutil.rmtree(tmp, ignore_errors = True)
+
+    for failure in failures:
+        print(f"[FAIL] {failure}")
+    print(f"Result cache: {'all checks pass' if not failures else f'{len(failures)} check(s) failed'}")
+    return 1 if failures else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
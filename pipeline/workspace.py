@@ -0,0 +1,216 @@
+import yaml
+from transformer.tfspec import TransformerSpec, TransformerOption
+from transformer.core import Core, Material
+from transformer.tfdraft import TransformerDraft
+from transformer.winding import Winding
+from bobbin.option import WireOption, default_wire_catalog, BASIC_WIRE_CONFIG
+from pipeline.result_cache import ResultCache, cached_design_turns, cached_fit_wire, RESULT_CACHE_DIR
+from pipeline.graph import SPEC_INPUTS, MATERIAL_INPUTS
+from utils.serialization import make_yaml_serializable
+from utils.profiling import StageProfiler, STAGE_WORKSPACE, STAGE_CIRCUIT, STAGE_WIRE_FIT
+from utils.log import get_logger
+
+logger = get_logger(__name__)
+
+
+class PipelineSettings:
+    """
+    Settings of a headless workspace run. Defaults follow the GUI defaults.
+
+    Attributes:
+        from_circuit (bool): Build the transformer spec from the compiled circuit even if the workspace has one.
+        turn_use_tolerance (bool): Passed to TransformerOption.
+        solution_index (int): Turns solution handed to the wire design (0 is the strict solution, if any).
+        use_advanced (bool): Use the workspace's wire_advanced config instead of the basic config.
+        method (str): Overrides the wire method of the config ("ector_continuous", "ector_discrete" or "kf").
+        catalog (list[float]): Wire diameters [m] for the discrete method. Defaults to default_wire_catalog().
+        envelope (bool): Sweep the compiled circuit over its input voltage range and load points (see
+            circuit.operating_point) and, when the spec is derived from the circuit, use the worst-case Ippk and ΔI.
+        profile (bool): Record per-stage timings in the "profile" entry of the result.
+        profile_capture (str): "cprofile" or "pyinstrument" to also capture the whole run; the report goes to "profile_capture".
+        result_cache (bool): Look up and store the turns and wire results in the persistent result cache.
+        result_cache_dir (str): Directory of the result cache.
+    """
+    def __init__(
+            self,
+            from_circuit: bool = False,
+            turn_use_tolerance: bool = False,
+            solution_index: int = 0,
+            use_advanced: bool = False,
+            method: str = None,
+            catalog: list[float] = None,
+            envelope: bool = False,
+            profile: bool = False,
+            profile_capture: str = None,
+            result_cache: bool = False,
+            result_cache_dir: str = RESULT_CACHE_DIR
+    ):
+        self.from_circuit = from_circuit
+        self.turn_use_tolerance = turn_use_tolerance
+        self.solution_index = solution_index
+        self.use_advanced = use_advanced
+        self.method = method
+        self.catalog = catalog
+        self.envelope = envelope
+        self.profile = profile
+        self.profile_capture = profile_capture
+        self.result_cache = result_cache
+        self.result_cache_dir = result_cache_dir
+
+
+def compile_circuit(circuit_spec: dict):
+    """
+    Compile the circuit section of a workspace, as CircuitDesignTab.compile_circuit does.
+    """
+    kwargs = dict(circuit_spec)
+    topology = kwargs.pop("topology", None)
+    if topology == "flyback":
+        from circuit.flyback import Flyback
+        compiled = Flyback(**kwargs)
+    elif topology == "forward":
+        from circuit.forward import Forward
+        compiled = Forward(**kwargs)
+    else:
+        raise ValueError(f"Unknown converter type: {topology}")
+    compiled.compile_params()
+    return compiled
+
+
+def spec_from_circuit(compiled) -> dict:
+    # Same mapping as recording the circuit and loading it into the transformer tab.
+    data = compiled.to_dict()
+    data["kl_list"] = [1.0] + list(data["kl_list"])
+    data["turns_ratio_list"] = [1.0] + list(data["turns_ratio_list"])
+    data["topology"] = compiled.__class__.__name__.lower()
+    if data.get("vsec_main") is None:
+        data["vsec_main"] = data["vo_list"][0] + data["vf_list"][0]
+    return {key: data.get(key) for key in SPEC_INPUTS}
+
+
+def design_workspace_turns(spec: TransformerSpec, material: Material, core: Core, options: TransformerOption, profiler: StageProfiler = None, cache: ResultCache = None):
+    # The steps of TransformerDesignTab.design_turns.
+    draft = TransformerDraft()
+    draft.create_draft(spec = spec, options = options)
+    draft.get_core(core)
+    draft.get_material(material)
+    return draft, cached_design_turns(draft, cache = cache, profiler = profiler)
+
+
+def run_workspace(data: dict, settings: PipelineSettings = None) -> dict:
+    """
+    Run circuit -> turns -> wire design for a workspace dict as written by export_workspace_to_yaml.
+    Each stage runs when the workspace has the inputs it needs; the turns stage feeds the wire stage.
+
+    Returns:
+        dict: "circuit", "transformer" and "wire" sections (None for stages that did not run), YAML/JSON serializable.
+        With settings.profile, also "profile" (and "profile_capture"), see utils.profiling.
+    """
+    settings = settings or PipelineSettings()
+    profiler = StageProfiler(enabled = settings.profile or settings.profile_capture is not None)
+    if settings.profile_capture:
+        profiler.capture_next(settings.profile_capture)
+    with profiler.stage(STAGE_WORKSPACE):
+        result = _run_workspace(data, settings, profiler)
+    if profiler.enabled:
+        result["profile"] = profiler.to_dict()
+        if profiler.last_capture:
+            result["profile_capture"] = profiler.last_capture
+    return result
+
+
+def _run_workspace(data: dict, settings: PipelineSettings, profiler: StageProfiler) -> dict:
+    result = {"circuit": None, "transformer": None, "wire": None}
+    cache = ResultCache(settings.result_cache_dir) if settings.result_cache else None
+    transformer_data = (data.get("transformer") or {})
+    wire_data = (data.get("wire") or {})
+    circuit_spec = ((data.get("circuit") or {}).get("spec"))
+
+    # --- circuit ---
+    spec_kwargs = dict(transformer_data.get("spec") or {})
+    if circuit_spec:
+        with profiler.stage(STAGE_CIRCUIT):
+            compiled = compile_circuit(circuit_spec)
+        result["circuit"] = compiled.to_dict()
+        if settings.envelope:
+            envelope = compiled.operating_envelope()
+            result["circuit"]["envelope"] = envelope.to_dict()
+            logger.info("%s", envelope)
+        if settings.from_circuit or not spec_kwargs:
+            material_kwargs = {key: spec_kwargs.get(key) for key in MATERIAL_INPUTS}
+            spec_kwargs = {**spec_from_circuit(compiled), **material_kwargs}
+            if settings.envelope:
+                spec_kwargs.update(envelope.spec_limits())
+
+    # --- turns ---
+    selected = None
+    core_dict = ((transformer_data.get("core") or {}).get("core"))
+    if spec_kwargs and core_dict:
+        material = Material(**{key: spec_kwargs.pop(key, None) for key in MATERIAL_INPUTS})
+        spec = TransformerSpec(**spec_kwargs)
+        core = Core.from_dict(core_dict)
+        options = TransformerOption(turn_use_tolerance = settings.turn_use_tolerance)
+        draft, solutions = design_workspace_turns(spec, material, core, options, profiler = profiler, cache = cache)
+        if solutions:
+            selected = solutions[min(settings.solution_index, len(solutions) - 1)].to_draft()
+        result["transformer"] = {
+            "core": core.name,
+            "n0_min": draft.n0_min,
+            "solutions": [
+                {"turns": solution.winding_values()[0], "lg": solution.lg, "dmax_cal": solution.dmax_cal, "strict": solution.strict}
+                for solution in solutions
+            ],
+            "selected": None if selected is None else {
+                "turns": [winding.turns for winding in selected.winding_list],
+                "i_rms": list(selected.windings.i_rms),
+                "lg": selected.lg
+            }
+        }
+        logger.info("Turns design for %s: %d solution(s)", core.name, len(solutions))
+
+    # --- wire ---
+    wire_spec = wire_data.get("wire_spec")
+    if wire_spec and (selected is not None or result["transformer"] is None):
+        config = dict(wire_data.get("wire_advanced") or BASIC_WIRE_CONFIG) if settings.use_advanced else dict(BASIC_WIRE_CONFIG)
+        method = settings.method or config.get("method", "ector_discrete")
+        if selected is not None:
+            ni_list, irms_list, wire_core = selected.windings.turns, selected.windings.i_rms, selected.core
+        else:
+            ni_list, irms_list, wire_core = wire_spec["ni_list"], wire_spec["irms_list"], None
+        core = Core(
+            window_area = config["Aw"] if config.get("Aw", -1) > 0 else getattr(wire_core, "window_area", None),
+            winding_width = wire_spec.get("wb") or getattr(wire_core, "winding_width", None),
+            winding_height = wire_spec.get("hb") or getattr(wire_core, "winding_height", None)
+        )
+        draft = TransformerDraft(winding_list = [Winding(turns = n, i_rms = i) for n, i in zip(ni_list, irms_list)], core = core)
+        wire_option = WireOption(
+            ji_list = wire_spec["ji_list"],
+            pi_list = wire_spec["pi_list"],
+            spi_list = wire_spec["spi_list"],
+            lt = wire_spec["lt"],
+            insulator_thickness = config["insulator_thickness"],
+            kwb = config["kwb"],
+            khb = config["khb"],
+            ht = config["ht"],
+            kf = config["kf"]
+        )
+        catalog = settings.catalog if settings.catalog is not None else default_wire_catalog()
+        with profiler.stage(STAGE_WIRE_FIT):
+            wire_result = cached_fit_wire(draft, wire_option, method, catalog = catalog, cache = cache)
+        logger.info("Wire design (%s) finished with status: %s", method, wire_result["status"])
+        result["wire"] = wire_result
+
+    return make_yaml_serializable(result)
+
+
+def run_workspace_file(filepath: str, settings: PipelineSettings = None) -> dict:
+    """
+    Load a workspace YAML and run it. Failures are reported in the "error" entry instead of raised,
+    so one bad file does not stop a batch.
+    """
+    try:
+        with open(filepath, "r") as f:
+            data = yaml.safe_load(f)
+        return {"workspace": filepath, "error": None, **run_workspace(data, settings)}
+    except Exception as e:
+        logger.debug("Workspace %s failed", filepath, exc_info = True)
+        return {"workspace": filepath, "error": f"{type(e).__name__}: {e}"}
@@ -1,3 +1,12 @@
+# Core data sheets list Ae and Aw in mm², AL in nH/N² and the bobbin width and height in mm. Factors to mks units.
+CORE_UNIT_FACTORS = {
+    "core_area": 1e-6,
+    "al_value": 1e-9,
+    "window_area": 1e-6,
+    "winding_width": 1e-3,
+    "winding_height": 1e-3
+}
+
 class Core:
     """
     Represents a magnetic core used in transformer design.
@@ -39,11 +48,8 @@ class Core:
         pass
     
     def unit_conv(self):
-        self.al_value = self.al_value * 1e-9
-        self.core_area = self.core_area * 1e-6
-        self.window_area = self.window_area * 1e-6
-        self.winding_height = self.winding_height * 1e-3
-        self.winding_width = self.winding_width * 1e-3
+        for key, factor in CORE_UNIT_FACTORS.items():
+            setattr(self, key, getattr(self, key) * factor)
 
     def __str__(self):
         return (
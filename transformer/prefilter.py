@@ -0,0 +1,150 @@
+import numpy as np
+from transformer.core import Core, Material
+from transformer.tfspec import TransformerSpec, TransformerOption
+from utils.formulae import minimum_turns_product
+from utils.log import get_logger
+
+logger = get_logger(__name__)
+
+# Reasons a core is pruned before the turns search
+PRUNE_MISSING_DATA = "missing_data"            # Ae is missing (or Aw when the window is checked), the design would fail on this core
+PRUNE_AL_TOO_LOW = "al_too_low"                # AL * N0^2 < Lm for every primary turns the search tries, even without a gap
+PRUNE_WINDOW_TOO_SMALL = "window_too_small"    # the copper of the fewest possible turns already exceeds kf * Aw
+PRUNE_REASONS = (PRUNE_MISSING_DATA, PRUNE_AL_TOO_LOW, PRUNE_WINDOW_TOO_SMALL)
+
+# determine_draft_turns tries np = ceil(n0_min) + 0..9
+PREFILTER_PRIMARY_STEPS = 10
+
+
+class PrefilterResult:
+    """
+    Outcome of prefilter_cores. Row i of every array belongs to cores[i].
+
+    Attributes:
+        cores (list[Core]): The cores that were checked.
+        n0_min (np.ndarray): Minimum primary turns of each core, NaN where it cannot be calculated. (doc: N0,min)
+        reasons (np.ndarray): Prune reason of each core, "" for cores that are kept.
+    """
+    def __init__(self, cores: list[Core] = None, n0_min: np.ndarray = None, reasons: np.ndarray = None):
+        self.cores = cores if cores is not None else []
+        self.n0_min = n0_min
+        self.reasons = reasons
+
+    @property
+    def mask(self) -> np.ndarray:
+        return self.reasons == ""
+
+    @property
+    def kept(self) -> list[Core]:
+        return [self.cores[i] for i in np.flatnonzero(self.mask)]
+
+    @property
+    def pruned(self) -> list[tuple[Core, str]]:
+        return [(self.cores[i], str(self.reasons[i])) for i in np.flatnonzero(~self.mask)]
+
+    @property
+    def counts(self) -> dict[str, int]:
+        return {reason: int(np.count_nonzero(self.reasons == reason)) for reason in PRUNE_REASONS}
+
+    def __str__(self):
+        pruned = len(self.cores) - int(np.count_nonzero(self.mask))
+        detail = ", ".join(f"{reason} = {count}" for reason, count in self.counts.items() if count)
+        return f"Prefilter: kept {len(self.cores) - pruned} of {len(self.cores)} cores, pruned {pruned}" + (f" ({detail})" if detail else "")
+
+
+def minimum_turns_bound(spec: TransformerSpec, material: Material, options: TransformerOption, core_area) -> np.ndarray:
+    """
+    n0_min of TransformerDraft.update_draft_n0_min for an array of core areas at once.
+    Every calculation path of calculate_minimum_turns is proportional to 1 / Ae, so the largest N * Ae is picked
+    once and divided by all core areas.
+    """
+    core_area = np.asarray(core_area, dtype = float)
+    b_limit = (material.b_sat * ((1 + options.turn_check_tolerance_b) if options.turn_use_tolerance else 1.0)) if material.b_sat is not None else None
+    candidates = []
+    for kwargs in (
+        dict(lm = spec.lm, ipk = spec.ip_pk, b_sat = b_limit),
+        dict(lm = spec.lm, delta_i = spec.delta_i, delta_b = material.delta_b),
+        dict(voltage = spec.vp, f_sw = spec.fs, duty = spec.d_max, delta_b = material.delta_b)
+    ):
+        try:
+            candidates.append(minimum_turns_product(**kwargs))
+        except ValueError:
+            pass
+    if not candidates:
+        raise ValueError("Unable to calculate n0_min: all calculation methods failed due to missing inputs.")
+    return max(candidates) / core_area
+
+
+def minimum_copper_area(spec: TransformerSpec, options: TransformerOption, primary_turns, ji_list) -> np.ndarray:
+    """
+    Lower bound of sum(Ni * WAi) used by fit_wire_kf, for the given primary turns.
+    For every winding Ni * Irms,i = N0 * KL,i * Irms,0 * (sqrt((1 - D) / D) for flyback), and Irms,0 >= Pin / (Vin * sqrt(D)),
+    so the bound is taken at the largest duty the turns search accepts.
+    """
+    d_limit = spec.d_max * ((1 + options.turn_check_tolerance_d) if options.turn_use_tolerance else 1.0)
+    n = len(spec.turns_ratio_list)
+    kl = np.asarray(spec.kl_list[:n], dtype = float)
+    ji = np.asarray(ji_list[:n], dtype = float)
+    irms_0 = spec.pin / (spec.vp * np.sqrt(d_limit))
+    ampere_turns = kl * irms_0
+    if spec.topology == "flyback":
+        ampere_turns[1:] *= np.sqrt((1 - d_limit) / d_limit)
+    return np.asarray(primary_turns, dtype = float) * np.sum(ampere_turns / ji)
+
+
+def prefilter_cores(
+        spec: TransformerSpec,
+        material: Material,
+        cores,
+        options: TransformerOption = None,
+        wire_option = None,
+        check_al: bool = True
+) -> PrefilterResult:
+    """
+    Reject cores that cannot yield a design, in one vectorized pass and before any turns search or wire fit.
+
+    Parameters:
+        spec (TransformerSpec): Transformer specification.
+        material (Material): Core material.
+        cores (CoreRepository | list[Core]): Cores to check. A repository's NumPy columns are used directly.
+        options (TransformerOption, optional): Turns search options. Defaults to the GUI default.
+        wire_option (WireOption, optional): If given with ji_list and kf, cores whose window cannot hold the minimum copper are pruned.
+        check_al (bool): Prune cores whose ungapped inductance AL * N0^2 stays below Lm.
+
+    Returns:
+        PrefilterResult
+    """
+    if options is None:
+        options = TransformerOption(turn_use_tolerance = False)
+    core_list = list(cores.all) if hasattr(cores, "all") else list(cores)
+    columns = getattr(cores, "columns", None)
+    if columns:
+        core_area, window_area, al_value = columns["core_area"], columns["window_area"], columns["al_value"]
+    else:
+        def column(key):
+            return np.array([np.nan if getattr(core, key) is None else getattr(core, key) for core in core_list], dtype = float)
+        core_area, window_area, al_value = column("core_area"), column("window_area"), column("al_value")
+
+    reasons = np.full(len(core_list), "", dtype = object)
+    missing = ~(core_area > 0)
+    reasons[missing] = PRUNE_MISSING_DATA
+
+    with np.errstate(divide = "ignore", invalid = "ignore"):
+        n0_min = minimum_turns_bound(spec, material, options, np.where(missing, np.nan, core_area))
+    np_first = np.ceil(n0_min)
+
+    if check_al:
+        np_last = np_first + PREFILTER_PRIMARY_STEPS - 1
+        # A gap only lowers the inductance, so AL * N^2 is the most a core can reach. Cores without AL data are kept.
+        al_low = (al_value * np_last ** 2 < spec.lm) & (reasons == "")
+        reasons[al_low] = PRUNE_AL_TOO_LOW
+
+    if wire_option is not None and wire_option.ji_list is not None and wire_option.kf:
+        reasons[~(window_area > 0) & (reasons == "")] = PRUNE_MISSING_DATA
+        required = minimum_copper_area(spec, options, np_first, wire_option.ji_list) / wire_option.kf
+        window_small = (required > window_area) & (reasons == "")
+        reasons[window_small] = PRUNE_WINDOW_TOO_SMALL
+
+    result = PrefilterResult(cores = core_list, n0_min = n0_min, reasons = reasons)
+    logger.info("%s", result)
+    return result
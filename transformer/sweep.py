@@ -0,0 +1,143 @@
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from transformer.core import Core, Material
+from transformer.tfspec import TransformerSpec, TransformerOption
+from transformer.tfdraft import TransformerDraft
+from transformer.prefilter import prefilter_cores
+from pipeline.result_cache import ResultCache, cached_design_turns
+
+class CoreSweepResult:
+    """
+    Outcome of the turns design for a single core in a sweep.
+
+    Attributes:
+        core (Core): The core the design was run against.
+        n0_min (float): Minimum primary turns for this core. None if it could not be calculated.
+        solutions (list[TurnsSolution]): Turns solutions found, strict solution first.
+        error (str): Reason the design failed for this core. None on success.
+        prune_reason (str): Prefilter reason if the core was rejected before the turns search, see transformer.prefilter.
+    """
+    def __init__(
+            self,
+            core: Core = None,
+            n0_min: float = None,
+            solutions: list = None,
+            error: str = None,
+            prune_reason: str = None
+    ):
+        self.core = core
+        self.n0_min = n0_min
+        self.solutions = solutions if solutions is not None else []
+        self.error = error
+        self.prune_reason = prune_reason
+
+    @property
+    def feasible(self) -> bool:
+        return self.error is None and len(self.solutions) > 0
+
+    @property
+    def best_solution(self):
+        return self.solutions[0] if self.solutions else None
+
+    def rank_key(self):
+        # Feasible cores first, then the smallest area product (Ae * Aw), then the fewest primary turns.
+        if not self.feasible:
+            return (1, float("inf"), float("inf"))
+        area_product = (self.core.core_area or 0) * (self.core.window_area or 0)
+        return (0, area_product, self.best_solution.turns[0])
+
+    def __str__(self):
+        if not self.feasible:
+            return f"{self.core.name}: no solution ({self.error or 'turns search exhausted'})"
+        turns, _, _ = self.best_solution.winding_values()
+        return f"{self.core.name}: {len(self.solutions)} solution(s), best turns = {turns}, lg = {self.best_solution.lg}"
+
+
+def design_core(spec: TransformerSpec, material: Material, core: Core, options: TransformerOption = None, cache: ResultCache = None) -> CoreSweepResult:
+    """
+    Run the turns design of TransformerDesignTab.design_turns for one core without any GUI.
+    With a cache, cores already designed for this spec are answered without the turns search.
+    """
+    if options is None:
+        options = TransformerOption(turn_use_tolerance = False)
+    result = CoreSweepResult(core = core)
+    draft = TransformerDraft()
+    try:
+        draft.create_draft(spec = spec, options = options)
+        draft.get_core(core)
+        draft.get_material(material)
+        result.solutions = cached_design_turns(draft, cache = cache)
+    except Exception as e:
+        result.error = str(e)
+    result.n0_min = draft.n0_min
+    return result
+
+
+def sweep_cores(
+        spec: TransformerSpec,
+        material: Material,
+        cores,
+        options: TransformerOption = None,
+        max_workers: int = None,
+        prefilter: bool = True,
+        wire_option = None,
+        cache: ResultCache = None
+):
+    """
+    Run the turns design for every core and yield a CoreSweepResult as soon as each core finishes.
+    Cores rejected by prefilter_cores are yielded first, with prune_reason set, and never reach the turns search.
+
+    Parameters:
+        spec (TransformerSpec): Transformer specification shared by all cores.
+        material (Material): Core material shared by all cores.
+        cores (CoreRepository | list[Core]): A repository, or a subset such as repo.get_by_type(section).
+        options (TransformerOption, optional): Turns search options. Defaults to the GUI default.
+        max_workers (int, optional): Number of worker processes. Use 1 to run in the calling process.
+        prefilter (bool): Run prefilter_cores before the turns search.
+        wire_option (WireOption, optional): Passed to prefilter_cores to also prune cores whose window is too small.
+        cache (ResultCache, optional): Persistent result cache shared by the workers, see pipeline.result_cache.
+
+    Yields:
+        CoreSweepResult: One per core, in order of completion.
+    """
+    core_list = list(cores.all) if hasattr(cores, "all") else list(cores)
+    if prefilter:
+        checked = prefilter_cores(spec, material, cores, options = options, wire_option = wire_option)
+        for i in range(len(core_list)):
+            if checked.reasons[i]:
+                n0_min = float(checked.n0_min[i])
+                yield CoreSweepResult(
+                    core = core_list[i],
+                    n0_min = None if n0_min != n0_min else n0_min,
+                    error = f"pruned by prefilter ({checked.reasons[i]})",
+                    prune_reason = checked.reasons[i]
+                )
+        core_list = checked.kept
+    if max_workers == 1:
+        for core in core_list:
+            yield design_core(spec, material, core, options, cache)
+        return
+
+    with ProcessPoolExecutor(max_workers = max_workers) as executor:
+        futures = [executor.submit(design_core, spec, material, core, options, cache) for core in core_list]
+        for future in as_completed(futures):
+            yield future.result()
+
+
+def rank_sweep_results(results) -> list[CoreSweepResult]:
+    return sorted(results, key = lambda r: r.rank_key())
+
+
+def run_core_sweep(
+        spec: TransformerSpec,
+        material: Material,
+        cores,
+        options: TransformerOption = None,
+        max_workers: int = None,
+        prefilter: bool = True,
+        wire_option = None,
+        cache: ResultCache = None
+) -> list[CoreSweepResult]:
+    """
+    Convenience wrapper: run the whole sweep and return the results ranked best first.
+    """
+    return rank_sweep_results(sweep_cores(spec, material, cores, options = options, max_workers = max_workers, prefilter = prefilter, wire_option = wire_option, cache = cache))
@@ -0,0 +1,75 @@
+"""
+Check that prefilter_cores only rejects cores that cannot yield a design.
+
+The example workspace spec is run over the whole core repository with the kf wire check (kf = 0.2, J = 4 A/mm^2).
+Every pruned core is then designed with design_core, and none of its turns solutions may both reach Lm with the
+core's AL (AL * Np^2 >= Lm) and fit the window with fit_wire_kf.
+
+Run from the repository root:
+    python transformer/test/prefilter_test.py
+"""
+import os
+import sys
+import shutil
+import tempfile
+import yaml
+
+REPO_ROOT = os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+if REPO_ROOT not in sys.path:
+    sys.path.insert(0, REPO_ROOT)
+
+from transformer.tfspec import TransformerSpec, TransformerOption
+from transformer.core import Material
+from transformer.prefilter import prefilter_cores
+from transformer.sweep import design_core
+from bobbin.option import WireOption
+from bobbin.kf_method import fit_wire_kf
+from data.core_repo import CoreRepository
+
+EXAMPLE_WORKSPACE = os.path.join(REPO_ROOT, "example", "pmp22345", "pmp22345.yaml")
+CORE_DATA = os.path.join(REPO_ROOT, "data", "core_data.xls")
+CORE_SHEET = "Sheet1"
+
+
+def realizable(solution, spec: TransformerSpec, wire_option: WireOption) -> bool:
+    core = solution.core
+    if core.al_value is not None and core.al_value * solution.turns[0] ** 2 < spec.lm:
+        return False
+    if not core.window_area or core.window_area <= 0:
+        return False
+    return bool(fit_wire_kf(solution.to_draft(), wire_option)["status"])
+
+
+def main() -> int:
+    with open(EXAMPLE_WORKSPACE, "r") as f:
+        spec_kwargs = dict(yaml.safe_load(f)["transformer"]["spec"])
+    material = Material(b_sat = spec_kwargs.pop("b_sat", None))
+    spec = TransformerSpec(**spec_kwargs)
+    options = TransformerOption(turn_use_tolerance = False)
+    wire_option = WireOption(ji_list = [4e6] * len(spec.kl_list), kf = 0.2)
+
+    # CoreRepository writes its parsed-sheet cache under the working directory
+    cwd = os.getcwd()
+    tmp = tempfile.mkdtemp()
+    os.chdir(tmp)
+    try:
+        repo = CoreRepository(CORE_DATA, CORE_SHEET)
+        result = prefilter_cores(spec, material, repo, options = options, wire_option = wire_option)
+        failures = 0
+        for core, reason in result.pruned:
+            designed = design_core(spec, material, core, options)
+            feasible = [s for s in designed.solutions if realizable(s, spec, wire_option)]
+            if feasible:
+                failures += 1
+                print(f"[FAIL] {core.name} pruned as {reason} but has {len(feasible)} feasible solution(s), first turns = {feasible[0].turns}")
+    finally:
+        os.chdir(cwd)
+        shutil.rmtree(tmp, ignore_errors = True)
+
+    print(result)
+    print(f"{len(result.pruned) - failures}/{len(result.pruned)} pruned cores have no feasible design")
+    return 1 if failures else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,77 @@
+"""
+Regression check of the vectorized turns search against the original loop of determine_draft_turns.
+
+BASELINE_SOLUTIONS was recorded with the nested np/ns loop (before the search was vectorized) on the example
+workspace spec, for several core areas, with and without turn_use_tolerance, and with Bsat only, Bsat and delta B,
+and delta B only. The vectorized search must return the same solutions in the same order.
+
+Run from the repository root:
+    python transformer/test/turns_search_test.py
+"""
+import os
+import sys
+import numpy as np
+import yaml
+
+REPO_ROOT = os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+if REPO_ROOT not in sys.path:
+    sys.path.insert(0, REPO_ROOT)
+
+from transformer.tfspec import TransformerSpec, TransformerOption
+from transformer.core import Core, Material
+from transformer.tfdraft import TransformerDraft
+
+EXAMPLE_WORKSPACE = os.path.join(REPO_ROOT, "example", "pmp22345", "pmp22345.yaml")
+
+# (core_area, turn_use_tolerance, b_sat, delta_b): [(np, ns, lg, dmax_cal), ...] from the original loop
+BASELINE_SOLUTIONS = {
+    (3.1e-05, True, 0.25, None): [(24.0, 21.0, 0.0007479503789666579, 0.48301329394387), (22.0, 19.0, 0.0006284860823261502, 0.48627822090036504), (23.0, 20.0, 0.0006869197056829203, 0.48456929321564335), (23.0, 21.0, 0.0006869197056829203, 0.47239495006595067), (23.0, 22.0, 0.0006869197056829203, 0.4608173518779487), (23.0, 23.0, 0.0006869197056829203, 0.44979367262723524)],
+    (3.1e-05, True, 0.25, 0.12): [(24.0, 21.0, 0.0007479503789666579, 0.48301329394387), (22.0, 19.0, 0.0006284860823261502, 0.48627822090036504), (23.0, 20.0, 0.0006869197056829203, 0.48456929321564335), (23.0, 21.0, 0.0006869197056829203, 0.47239495006595067), (23.0, 22.0, 0.0006869197056829203, 0.4608173518779487), (23.0, 23.0, 0.0006869197056829203, 0.44979367262723524)],
+    (3.1e-05, True, None, 0.12): [(22.0, 19.0, 0.0006284860823261502, 0.48627822090036504)],
+    (3.1e-05, False, 0.25, None): [(24.0, 21.0, 0.0007479503789666579, 0.48301329394387)],
+    (3.1e-05, False, 0.25, 0.12): [(24.0, 21.0, 0.0007479503789666579, 0.48301329394387)],
+    (3.1e-05, False, None, 0.12): [(22.0, 19.0, 0.0006284860823261502, 0.48627822090036504)],
+    (5.8e-05, True, 0.25, None): [(13.0, 12.0, 0.00041058521587316205, 0.4696718594630428), (12.0, 11.0, 0.00034984775790375936, 0.47140797693416625)],
+    (5.8e-05, True, 0.25, 0.12): [(13.0, 12.0, 0.00041058521587316205, 0.4696718594630428), (12.0, 11.0, 0.00034984775790375936, 0.47140797693416625)],
+    (5.8e-05, True, None, 0.12): [(12.0, 11.0, 0.00034984775790375936, 0.47140797693416625)],
+    (5.8e-05, False, 0.25, None): [(13.0, 12.0, 0.00041058521587316205, 0.4696718594630428)],
+    (5.8e-05, False, 0.25, 0.12): [(13.0, 12.0, 0.00041058521587316205, 0.4696718594630428)],
+    (5.8e-05, False, None, 0.12): [(12.0, 11.0, 0.00034984775790375936, 0.47140797693416625)],
+    (1.25e-04, True, 0.25, None): [(6.0, 6.0, 0.00018849555921538757, 0.4497936726272352)],
+    (1.25e-04, True, 0.25, 0.12): [(6.0, 6.0, 0.00018849555921538757, 0.4497936726272352)],
+    (1.25e-04, True, None, 0.12): [(6.0, 6.0, 0.00018849555921538757, 0.4497936726272352)],
+    (1.25e-04, False, 0.25, None): [(6.0, 6.0, 0.00018849555921538757, 0.4497936726272352)],
+    (1.25e-04, False, 0.25, 0.12): [(6.0, 6.0, 0.00018849555921538757, 0.4497936726272352)],
+    (1.25e-04, False, None, 0.12): [(6.0, 6.0, 0.00018849555921538757, 0.4497936726272352)]
+}
+
+
+def search(spec_kwargs: dict, core_area: float, use_tolerance: bool, b_sat: float, delta_b: float) -> list[tuple]:
+    draft = TransformerDraft()
+    draft.create_draft(spec = TransformerSpec(**spec_kwargs), options = TransformerOption(turn_use_tolerance = use_tolerance))
+    draft.get_core(Core(core_area = core_area, window_area = 6.789e-05))
+    draft.get_material(Material(b_sat = b_sat, delta_b = delta_b))
+    draft.update_draft_n0_min()
+    return [(s.turns[0], s.turns[1], s.lg, s.dmax_cal) for s in draft.determine_draft_turns()]
+
+
+def main() -> int:
+    with open(EXAMPLE_WORKSPACE, "r") as f:
+        spec_kwargs = dict(yaml.safe_load(f)["transformer"]["spec"])
+    spec_kwargs.pop("b_sat", None)
+
+    failures = 0
+    for case, expected in BASELINE_SOLUTIONS.items():
+        got = search(spec_kwargs, *case)
+        same = len(got) == len(expected) and all(
+            g[:2] == e[:2] and np.allclose(g[2:], e[2:], rtol = 1e-12, atol = 0) for g, e in zip(got, expected)
+        )
+        if not same:
+            failures += 1
+            print(f"[FAIL] {case}: expected {expected}, got {got}")
+    print(f"{len(BASELINE_SOLUTIONS) - failures}/{len(BASELINE_SOLUTIONS)} turns search cases match the original loop")
+    return 1 if failures else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -1,11 +1,30 @@
 import numpy as np
 from transformer.core import Core, Material
 from transformer.tfspec import TransformerSpec, TransformerOption
-from transformer.winding import Winding
-from utils.formulae import calculate_gap, calculate_minimum_turns, calculate_irms_with_ref, calculate_turns_with_ratio, calculate_b, calculate_d, calculate_deltai, calculate_iedc, calculate_ippk, calculate_irms
-import copy
+from transformer.winding import Winding, WindingTable, whole_turns
+from utils.formulae import calculate_gap, calculate_minimum_turns, irms_with_ref_formula, calculate_turns_with_ratio, calculate_b, calculate_d, d_formula, calculate_deltai, calculate_iedc, calculate_ippk, calculate_irms
+from utils.log import get_logger
+
+logger = get_logger(__name__)
+
+# Classification of a (np, ns) pair in the turns search
+TURNS_DUTY_VIOLATION = 0    # duty exceeds the limit, the search tries ns + 1
+TURNS_TOLERANT = 1          # within tolerance only, recorded and the search tries ns + 1
+TURNS_STRICT = 2            # strict solution, the search stops
+TURNS_FLUX_VIOLATION = 3    # flux check fails, the search moves on to np + 1
+TURNS_STALLED = 4           # passes the tolerant limits but not the strict ones while tolerance is disabled
+TURNS_MAX_SECONDARY_STEPS = 1 << 16
+TURNS_STATE_NAMES = {
+    TURNS_DUTY_VIOLATION: "duty_violation",
+    TURNS_TOLERANT: "tolerant",
+    TURNS_STRICT: "strict",
+    TURNS_FLUX_VIOLATION: "flux_violation",
+    TURNS_STALLED: "stalled"
+}
 
 class TransformerDraft:
+    __slots__ = ("spec", "core", "material", "windings", "n0_min", "lg", "options", "hr", "iedc", "delta_i", "dmax_cal", "trace")
+
     def __init__(
             self,
             spec: TransformerSpec = None,
@@ -18,7 +37,8 @@ class TransformerDraft:
             hr: float = None,        
             iedc: float = None,
             delta_i: float = None,
-            dmax_cal: float = None
+            dmax_cal: float = None,
+            trace: list[dict] = None
     ):
         self.spec = spec
         self.core = core
@@ -31,33 +51,55 @@ class TransformerDraft:
         self.iedc = iedc
         self.delta_i = delta_i
         self.dmax_cal = dmax_cal
+        self.trace = trace
 
         self._init_validate()
 
     def _init_validate(self):
         pass
 
+    @property
+    def winding_list(self) -> tuple[Winding, ...]:
+        # Read-only tuple of views over self.windings, created on access. Use add_winding to add a winding.
+        return self.windings.views() if self.windings is not None else None
+
+    @winding_list.setter
+    def winding_list(self, winding_list: list[Winding]):
+        if winding_list is None:
+            self.windings = None
+            return
+        self.windings = WindingTable.from_windings(winding_list)
+        # Rebind the given windings so they keep reflecting this draft's values.
+        for i, winding in enumerate(winding_list):
+            winding._table = self.windings
+            winding._index = i
+
+    def add_winding(self, winding: Winding) -> Winding:
+        """
+        Append winding to the draft. The winding is rebound to the draft's table, so it keeps reflecting this
+        draft's values, and is returned.
+        """
+        if self.windings is None:
+            self.windings = WindingTable()
+        winding._index = self.windings.append(winding)
+        winding._table = self.windings
+        return winding
+
     def get_material(self, material: Material):
-        # self.material.get_material(how_to_choose)
-        self.material = copy.deepcopy(material) # test
-        # self.material = Material(delta_b = 0.25)
-        pass
+        # The material is treated as immutable and shared with the turns solutions, so it is not copied.
+        self.material = material
 
     def get_core(self, core: Core):
-        # self.core.get_core(how_to_choose)
-        # self.core = Core(core_area = 58e-6,
-        #                  window_area = 68e-6)   # test
-        self.core = copy.deepcopy(core)
-        pass
+        # The core is treated as immutable and shared with the turns solutions, so it is not copied.
+        self.core = core
 
     def create_draft(self, spec: TransformerSpec, options: TransformerOption):
         # Create draft based on spec. Initialize spec and options, create empty windings and fill role, kl. Initialize the primary turn's rms current.
         self.spec = spec
         self.options = options
-        self.winding_list = []
-        for i in range(len(self.spec.turns_ratio_list)):
-            new_winding = Winding(role = "secondary", load_occupying_factor = spec.kl_list[i])
-            self.winding_list.append(new_winding)
+        self.windings = WindingTable(len(self.spec.turns_ratio_list))
+        self.windings.role[:] = ["secondary"] * len(self.windings)
+        self.windings.load_occupying_factor[:] = self.spec.kl_list[:len(self.windings)]
         # self.winding_list[0].i_rms = self.spec.ip_rms
         self.winding_list[0].role = "primary"
 
@@ -70,32 +112,29 @@ class TransformerDraft:
         try:
             n = calculate_minimum_turns(lm = self.spec.lm, ipk = self.spec.ip_pk, b_sat = b_limit, core_area = self.core.core_area)
             n0_min_cand.append(n)
-            print("Calculated by peak current and bsat: n0_min = ", n)
+            logger.debug("Calculated by peak current and bsat: n0_min = %s", n)
         except ValueError:
-            print("Cannot calculate n0_min by peak current and bsat. Are lm, ipk, bsat specified?")
-            pass
+            logger.debug("Cannot calculate n0_min by peak current and bsat. Are lm, ipk, bsat specified?")
 
         # method 2: delta b bound (core loss)
         try:
             n = calculate_minimum_turns(lm = self.spec.lm, delta_i = self.spec.delta_i, delta_b = self.material.delta_b, core_area = self.core.core_area)
             n0_min_cand.append(n)
-            print("Calculated by deltai and deltab: n0_min = ", n)
+            logger.debug("Calculated by deltai and deltab: n0_min = %s", n)
         except ValueError:
-            print("Cannot calculate n0_min by delta_i and delta_b. Are lm, delta_i, delta_b specified?")
-            pass
+            logger.debug("Cannot calculate n0_min by delta_i and delta_b. Are lm, delta_i, delta_b specified?")
 
         # method 3: voltage second (similar to delta b bound)
         try:
             n = calculate_minimum_turns(voltage = self.spec.vp, f_sw = self.spec.fs, duty = self.spec.d_max, delta_b = self.material.delta_b, core_area = self.core.core_area)
             n0_min_cand.append(n)
-            print("Calculated by volt-second: n0_min = ", n)
+            logger.debug("Calculated by volt-second: n0_min = %s", n)
         except ValueError:
-            print("Cannot calculate n0_min by volt-second. Is delta_b specified?")
-            pass
+            logger.debug("Cannot calculate n0_min by volt-second. Is delta_b specified?")
         
         if n0_min_cand:
             self.n0_min = max(n0_min_cand)
-            print("n0_min is calculated as ", self.n0_min)
+            logger.debug("n0_min is calculated as %s", self.n0_min)
         else:
             raise ValueError("Unable to calculate n0_min: all calculation methods failed due to missing inputs.")
         # self.n0_min = calculate_minimum_turns(lm = self.spec.lm,
@@ -104,84 +143,138 @@ class TransformerDraft:
         #                                      b_sat = b_limit,
         #                                      core_area = self.core.core_area)
         
-    def determine_draft_turns(self) -> list["TransformerDraft"]:
-        # TODO: choose the number of turns of each winding and update turns ratio in winding objects
-        tolerant_solutions = []
-        strict_solution = None
-        print("\n======== Start finding turns solution ========\n")
-        self.winding_list[0].turns = np.ceil(self.n0_min)
-        print(f"Starting with: np = {self.winding_list[0].turns}")
-        for i in range(10): # prevent infinite loop
-            print(f"\n--- Iteration {i}: Trying np = {self.winding_list[0].turns} ---")
-            self.winding_list[1].turns = round(self.winding_list[0].turns * self.spec.turns_ratio_list[1])
-            self.update_draft_gap()
-            self.dmax_cal = -1
-            while True:
-                print(f"Trying ns = {self.winding_list[1].turns}")
-                self.dmax_cal = calculate_d(vpri = self.spec.vp, primary_turns = self.winding_list[0].turns, vsec = self.spec.vsec_main, secondary_turns = self.winding_list[1].turns, topology = self.spec.topology)
-                # print(f"Calculated dmax_cal = {self.dmax_cal}")
-                d_limit = self.spec.d_max * ((1 + self.options.turn_check_tolerance_d) if self.options.turn_use_tolerance else 1.0)
-                # d_limit = self.spec.d_max # changed here
-                if self.dmax_cal > d_limit:
-                    print(f"Violation: Calculated dmax = {self.dmax_cal} > required dmax = {d_limit}. Increase ns by 1.\n")
-                    self.winding_list[1].turns += 1
-                    continue
-                print(f"Calculated dmax = {self.dmax_cal} < required dmax = {d_limit}. Proceed to check bmax.")
-                self.iedc = calculate_iedc(pin = self.spec.pin, vin = self.spec.vp, d = self.dmax_cal)
-                ippk_cal = None
-                bmax_cal = None
-                if self.spec.lm is not None:
-                    self.delta_i = calculate_deltai(vin = self.spec.vp, d = self.dmax_cal, lm = self.spec.lm, fs = self.spec.fs)
-                    ippk_cal = calculate_ippk(iedc = self.iedc, deltai = self.delta_i)
-                    bmax_cal = calculate_b(inductance = self.spec.lm, current = ippk_cal, core_area = self.core.core_area, turns = self.winding_list[0].turns)
-                delta_b_cal = calculate_b(voltage = self.spec.vp, duty = self.dmax_cal, freq = self.spec.fs, core_area = self.core.core_area, turns = self.winding_list[0].turns) # for deltab check
-                print(f"calculated iedc = {self.iedc}, delta_i = {self.delta_i}, ippk = {ippk_cal}")
-                b_limit = (self.material.b_sat * ((1 + self.options.turn_check_tolerance_b) if self.options.turn_use_tolerance else 1.0)) if self.material.b_sat is not None else None
-                print(f"b_max_limit = {b_limit}, bmax_cal = {bmax_cal}; delta_b_max = {self.material.delta_b}, delta_b_cal = {delta_b_cal}")
-                bsat_ok = (bmax_cal <= b_limit) if self.material.b_sat is not None else None
-                # print(f"The result of bsat check is: {bsat_ok}")
-                deltab_ok = (delta_b_cal <= self.material.delta_b) if self.material.delta_b is not None else None
-                # print(f"The result of delta_b check is: {deltab_ok}")
-                if all(x is None for x in [bsat_ok, deltab_ok]):
-                    raise ValueError("Neither Bsat nor delta B is defined — cannot validate flux swing.")
-                elif not any(x == False for x in [bsat_ok, deltab_ok]):
-                # if bmax_cal <= b_limit:
-                    print(f"Calculated bmax = {bmax_cal} < required bmax = {b_limit}.") if b_limit is not None else print("Did not set an upper bound for bsat. (material.bsat == None)")
-                    print(f"Calculated delta_b = {delta_b_cal} < required deltab = {self.material.delta_b}.") if self.material.delta_b is not None else print("Did not set an upper bound for delta_b. (material.delta_b == None)")
-                    is_strict = ((self.dmax_cal <= self.spec.d_max) and (self.material.b_sat is None or bmax_cal < self.material.b_sat))
-                    print(f"[DEBUG] self.damx_cal = {self.dmax_cal}, self.spec.d_max = {self.spec.d_max}; bmax_cal = {bmax_cal}, self.material.b_sat = {self.material.b_sat}")
-                    print(f"[DEBUG] is_strict = {is_strict}")
-                    if is_strict:
-                        print(f"Calculated bmax_cal = {bmax_cal} < strict bsat = {self.material.b_sat}.") if b_limit is not None else print("Did not set an upper bound for bsat. (material.bsat == None)")
-                        print(f"Calculated delta_b = {delta_b_cal} < required deltab = {self.material.delta_b}.") if self.material.delta_b is not None else print("Did not set an upper bound for delta_b. (material.delta_b == None)")
-                        print(f"Strict solution found: np = {self.winding_list[0].turns}, ns = {self.winding_list[1].turns}.")
-                        strict_solution = copy.deepcopy(self)
-                        break
-                    elif self.options.turn_use_tolerance:
-                        print(f"Tolerant solution recorded: np = {self.winding_list[0].turns}, ns = {self.winding_list[1].turns}. Warning: bsat slightly exceeds bsat of the material but within a ratio of {self.options.turn_check_tolerance_b}.\n")
-                        tolerant_solutions.append(copy.deepcopy(self))
-                        self.winding_list[1].turns += 1
-                        continue
-                else:
-                    print(f"Violation: Calculated bmax_cal = {bmax_cal} > required bmax = {b_limit}.") if b_limit is not None else print("Did not set an upper bound for bsat. (material.bsat == None)")
-                    print(f"Violation: Calculated delta_b_cal = {delta_b_cal} > required delta_b_max = {self.material.delta_b}.") if self.material.delta_b is not None else print("Did not set an upper bound for delta_b. (material.delta_b == None)")
-                    print("Increase np by 1.")
+    def determine_draft_turns(self) -> list["TurnsSolution"]:
+        # Evaluate duty, Bmax and delta B over a (np, ns) grid in one pass and pick the solutions with masks.
+        # np starts at ceil(n0_min) and is tried for at most 10 values; for each np, ns starts at round(np * n1)
+        # and walks upwards until a strict solution is found or the flux check fails.
+        if self.material.b_sat is None and self.material.delta_b is None:
+            raise ValueError("Neither Bsat nor delta B is defined — cannot validate flux swing.")
+        np_values = np.ceil(self.n0_min) + np.arange(10)
+        ns_start = np.round(np_values * self.spec.turns_ratio_list[1])
+        logger.debug("Start finding turns solution with np = %s", np_values[0])
+
+        width = 64
+        while True:
+            ns_grid = ns_start[:, None] + np.arange(width)[None, :]
+            grid = self._evaluate_turns_grid(np_values[:, None], ns_grid)
+            terminal = (grid["state"] == TURNS_STRICT) | (grid["state"] == TURNS_FLUX_VIOLATION) | (grid["state"] == TURNS_STALLED)
+            resolved = terminal.any(axis = 1)
+            stop_col = np.where(resolved, terminal.argmax(axis = 1), width)
+            rows_needed = len(np_values)
+            for row in range(len(np_values)):
+                if not resolved[row] or grid["state"][row, stop_col[row]] == TURNS_STRICT:
+                    rows_needed = row + 1
                     break
-            if strict_solution:
+            if resolved[:rows_needed].all():
                 break
+            if width >= TURNS_MAX_SECONDARY_STEPS:
+                raise ValueError(f"Turns search did not terminate within {TURNS_MAX_SECONDARY_STEPS} secondary turns.")
+            width *= 4
+
+        strict_solution = None
+        tolerant_solutions = []
+        for row in range(rows_needed):
+            col = stop_col[row]
+            for tol_col in np.flatnonzero(grid["state"][row, :col] == TURNS_TOLERANT):
+                solution = self._make_turns_solution(grid, np_values, ns_grid, row, tol_col)
+                logger.debug("Tolerant solution recorded: np = %s, ns = %s", *solution.turns)
+                tolerant_solutions.append(solution)
+            if grid["state"][row, col] == TURNS_STRICT:
+                strict_solution = self._make_turns_solution(grid, np_values, ns_grid, row, col)
+                logger.debug("Strict solution found: np = %s, ns = %s", *strict_solution.turns)
+
+        # Leave the working draft where the search stopped.
+        self._apply_turns_grid_point(grid, np_values, ns_grid, rows_needed - 1, stop_col[rows_needed - 1])
+        if strict_solution is None:
             self.winding_list[0].turns += 1
+
         all_solutions = []
         if strict_solution:
             all_solutions.append(strict_solution)
         all_solutions.extend(tolerant_solutions)
-        print("\n======== End of finding turns solution ========\n")
+        logger.debug("End of finding turns solution: %d solution(s)", len(all_solutions))
+        if self.options.record_trace:
+            self.trace = self._build_turns_trace(grid, np_values, ns_grid, stop_col[:rows_needed])
         return all_solutions
 
+    def _evaluate_turns_grid(self, np_grid, ns_grid):
+        # Classify every (np, ns) pair the way the step-by-step search would.
+        use_tolerance = self.options.turn_use_tolerance
+        d_limit = self.spec.d_max * ((1 + self.options.turn_check_tolerance_d) if use_tolerance else 1.0)
+        b_limit = (self.material.b_sat * ((1 + self.options.turn_check_tolerance_b) if use_tolerance else 1.0)) if self.material.b_sat is not None else None
+
+        dmax_cal = d_formula(self.spec.topology)(vpri = self.spec.vp, vsec = self.spec.vsec_main, primary_turns = np_grid, secondary_turns = ns_grid)
+        iedc = calculate_iedc(pin = self.spec.pin, vin = self.spec.vp, d = dmax_cal)
+        delta_i = calculate_deltai(vin = self.spec.vp, d = dmax_cal, lm = self.spec.lm, fs = self.spec.fs)
+        ippk_cal = calculate_ippk(iedc = iedc, deltai = delta_i)
+        bmax_cal = calculate_b(inductance = self.spec.lm, current = ippk_cal, core_area = self.core.core_area, turns = np_grid)
+        delta_b_cal = calculate_b(voltage = self.spec.vp, duty = dmax_cal, freq = self.spec.fs, core_area = self.core.core_area, turns = np_grid)
+
+        flux_ok = np.ones(dmax_cal.shape, dtype = bool)
+        if b_limit is not None:
+            flux_ok &= (bmax_cal <= b_limit)
+        if self.material.delta_b is not None:
+            flux_ok &= (delta_b_cal <= self.material.delta_b)
+        is_strict = (dmax_cal <= self.spec.d_max)
+        if self.material.b_sat is not None:
+            is_strict &= (bmax_cal < self.material.b_sat)
+
+        state = np.full(dmax_cal.shape, TURNS_DUTY_VIOLATION)
+        duty_ok = ~(dmax_cal > d_limit)
+        state[duty_ok & ~flux_ok] = TURNS_FLUX_VIOLATION
+        state[duty_ok & flux_ok & is_strict] = TURNS_STRICT
+        state[duty_ok & flux_ok & ~is_strict] = TURNS_TOLERANT if use_tolerance else TURNS_STALLED
+
+        return {
+            "state": state,
+            "dmax_cal": dmax_cal,
+            "iedc": iedc,
+            "delta_i": delta_i,
+            "bmax_cal": bmax_cal,
+            "delta_b_cal": delta_b_cal
+        }
+
+    def _build_turns_trace(self, grid, np_values, ns_grid, stop_cols) -> list[dict]:
+        # One record per (np, ns) pair visited by the search, in search order.
+        trace = []
+        for row, stop_col in enumerate(stop_cols):
+            for col in range(stop_col + 1):
+                trace.append({
+                    "np": float(np_values[row]),
+                    "ns": int(ns_grid[row, col]),
+                    "dmax_cal": float(grid["dmax_cal"][row, col]),
+                    "iedc": float(grid["iedc"][row, col]),
+                    "delta_i": float(grid["delta_i"][row, col]),
+                    "bmax_cal": float(grid["bmax_cal"][row, col]),
+                    "delta_b_cal": float(grid["delta_b_cal"][row, col]),
+                    "result": TURNS_STATE_NAMES[int(grid["state"][row, col])]
+                })
+        return trace
+
+    def _make_turns_solution(self, grid, np_values, ns_grid, row, col) -> "TurnsSolution":
+        return TurnsSolution(
+            draft = self,
+            turns = (np_values[row], int(ns_grid[row, col])),
+            lg = calculate_gap(turns = np_values[row], core_area = self.core.core_area, lm = self.spec.lm),
+            dmax_cal = grid["dmax_cal"][row, col],
+            iedc = grid["iedc"][row, col],
+            delta_i = grid["delta_i"][row, col],
+            strict = (grid["state"][row, col] == TURNS_STRICT)
+        )
+
+    def _apply_turns_grid_point(self, grid, np_values, ns_grid, row, col):
+        self.winding_list[0].turns = np_values[row]
+        self.winding_list[1].turns = int(ns_grid[row, col])
+        self.update_draft_gap()
+        self.dmax_cal = grid["dmax_cal"][row, col]
+        self.iedc = grid["iedc"][row, col]
+        self.delta_i = grid["delta_i"][row, col]
+
     def update_draft_gap(self):    
         self.lg = calculate_gap(turns = self.winding_list[0].turns,
                                 core_area = self.core.core_area,
                                 lm = self.spec.lm)
-        print(f"The air gap in current configuration is: {self.lg}\n")
+        logger.debug("The air gap in current configuration is: %s", self.lg)
         
     # def determine_primary_turns(self):
     #     self.winding_list[0].turns = np.ceil(self.n0_min)
@@ -189,24 +282,22 @@ class TransformerDraft:
 
     def update_draft_windings(self):
         # calculate irms, turns (except for pri and sec main)
-        for i in range(len(self.winding_list)):
-            if i == 0:
-                self.winding_list[0].i_rms = calculate_irms(iedc = self.iedc, deltai = self.delta_i, d = self.dmax_cal)
-            elif i == 1:    # main output
-                self.winding_list[1].turns_ratio = self.winding_list[1].turns / self.winding_list[0].turns
-                self.winding_list[1].i_rms = calculate_irms_with_ref(irms_0 = self.winding_list[0].i_rms, kl = self.spec.kl_list[1], turns_ratio = self.winding_list[1].turns_ratio, d_max = self.dmax_cal, topology = self.spec.topology)
-            elif i > 1: # other outputs
-                self.winding_list[i].turns = np.round(calculate_turns_with_ratio(turns_ratio = self.spec.turns_ratio_list[i],
-                                                                                ref_turns = self.winding_list[0].turns)
-                )
-                self.winding_list[i].turns_ratio = self.winding_list[i].turns / self.winding_list[0].turns
-                self.winding_list[i].i_rms = calculate_irms_with_ref(irms_0 = self.winding_list[0].i_rms,
-                                                                     kl = self.winding_list[i].load_occupying_factor,
-                                                                     turns_ratio = self.winding_list[i].turns_ratio,
-                                                                     d_max = self.dmax_cal,
-                                                                     topology = self.spec.topology)
+        turns_list, turns_ratio_list, irms_list = calculate_winding_values(
+            spec = self.spec,
+            kl_list = [winding.load_occupying_factor for winding in self.winding_list],
+            primary_turns = self.winding_list[0].turns,
+            secondary_turns = self.winding_list[1].turns,
+            iedc = self.iedc,
+            delta_i = self.delta_i,
+            dmax_cal = self.dmax_cal
+        )
+        for i, winding in enumerate(self.winding_list):
+            if i > 1:
+                winding.turns = turns_list[i]
+            if i > 0:
+                winding.turns_ratio = turns_ratio_list[i]
+            winding.i_rms = irms_list[i]
             # self.winding_list[i].wire_area = calculate_wire_area(irms = self.winding_list[i].i_rms, j = self.options.ji_list[i])
-        pass
 
     def check_draft_bmax(self):
         bmax_cal = calculate_b(inductance = self.spec.lm,
@@ -219,19 +310,19 @@ class TransformerDraft:
         dmax_cal = calculate_d(vpri = self.spec.vp,
                                vsec = self.spec.vsec_main,
                                primary_turns = self.winding_list[0].turns,
-                               secondary_turns = self.winding_list[1].turns)
+                               secondary_turns = self.winding_list[1].turns,
+                               topology = self.spec.topology)
         return (dmax_cal < self.spec.d_max)
 
     def apply_wire(self, result):
-        for i, winding in enumerate(self.winding_list):
-            if "di_list" in result and result["di_list"] is not None:
-                winding.wire_diameter = result["di_list"][i]
-            if "li_list" in result and result["li_list"] is not None:
-                winding.layers = result["li_list"][i]
-            # if "j_cal_list" in result and result["j_cal_list"] is not None:
-            #     winding.current_density = result["j_cal_list"][i]
-            if "wa_list" in result and result["wa_list"] is not None:
-                winding.wire_area = result["wa_list"][i]
+        if "di_list" in result and result["di_list"] is not None:
+            self.windings.wire_diameter[:] = result["di_list"]
+        if "li_list" in result and result["li_list"] is not None:
+            self.windings.layers[:] = result["li_list"]
+        # if "j_cal_list" in result and result["j_cal_list"] is not None:
+        #     self.windings.current_density[:] = result["j_cal_list"]
+        if "wa_list" in result and result["wa_list"] is not None:
+            self.windings.wire_area[:] = result["wa_list"]
 
 
     def __str__(self):
@@ -256,4 +347,94 @@ class TransformerDraft:
             f"  Air gap (lg): {self.lg}\n"
             # f"  hr: {self.hr}\n"
             "=====================================================\n"
-        )
\ No newline at end of file
+        )
+
+
+def calculate_winding_values(spec: TransformerSpec, kl_list, primary_turns, secondary_turns, iedc, delta_i, dmax_cal):
+    """
+    Turns, turns ratio and RMS current of every winding once the primary and main secondary turns are fixed.
+    The primary keeps a turns ratio of None, as in TransformerDraft.update_draft_windings.
+
+    Returns:
+        tuple[list, list, list]: turns_list, turns_ratio_list, irms_list
+    """
+    winding_number = len(spec.turns_ratio_list)
+    turns_list = [whole_turns(primary_turns), whole_turns(secondary_turns)]
+    turns_ratio_list = [None, secondary_turns / primary_turns]
+    irms_0 = calculate_irms(iedc = iedc, deltai = delta_i, d = dmax_cal)
+    irms_list = [irms_0]
+    for i in range(2, winding_number):
+        turns = np.round(calculate_turns_with_ratio(turns_ratio = spec.turns_ratio_list[i], ref_turns = primary_turns))
+        turns_list.append(whole_turns(turns))
+        turns_ratio_list.append(turns / primary_turns)
+    irms_with_ref = irms_with_ref_formula(spec.topology)
+    for i in range(1, winding_number):
+        irms_list.append(irms_with_ref(irms_0 = irms_0, kl = kl_list[i], turns_ratio = turns_ratio_list[i], d_max = dmax_cal))
+    return turns_list[:winding_number], turns_ratio_list[:winding_number], irms_list
+
+
+class TurnsSolution:
+    """
+    Lightweight record of one solution found by TransformerDraft.determine_draft_turns.
+    The spec, options, core and material are shared with the draft that produced the solution, not copied.
+    Use to_draft() to expand the selected solution into a full TransformerDraft.
+
+    Attributes:
+        turns (tuple[int]): Primary and main secondary turns (doc: N0, N1)
+        lg (float): Air gap length [m]. (doc: lg)
+        dmax_cal (float): Duty ratio at these turns.
+        iedc (float): Equivalent DC current of the primary [A].
+        delta_i (float): Primary current ripple [A].
+        strict (bool): True if the solution meets Bsat and Dmax without tolerance.
+    """
+    __slots__ = ("spec", "options", "core", "material", "n0_min", "turns", "lg", "dmax_cal", "iedc", "delta_i", "strict", "_winding_values")
+
+    def __init__(self, draft: TransformerDraft, turns: tuple, lg: float, dmax_cal: float, iedc: float, delta_i: float, strict: bool = False):
+        self.spec = draft.spec
+        self.options = draft.options
+        self.core = draft.core
+        self.material = draft.material
+        self.n0_min = draft.n0_min
+        self.turns = tuple(whole_turns(n) for n in turns)
+        self.lg = lg
+        self.dmax_cal = dmax_cal
+        self.iedc = iedc
+        self.delta_i = delta_i
+        self.strict = bool(strict)
+        self._winding_values = None
+
+    def winding_values(self):
+        """
+        Returns (turns_list, turns_ratio_list, irms_list) for all windings without building Winding objects.
+        """
+        if self._winding_values is None:
+            self._winding_values = calculate_winding_values(
+                spec = self.spec,
+                kl_list = self.spec.kl_list,
+                primary_turns = self.turns[0],
+                secondary_turns = self.turns[1],
+                iedc = self.iedc,
+                delta_i = self.delta_i,
+                dmax_cal = self.dmax_cal
+            )
+        return self._winding_values
+
+    def to_draft(self) -> TransformerDraft:
+        draft = TransformerDraft(
+            core = self.core,
+            material = self.material,
+            n0_min = self.n0_min,
+            lg = self.lg,
+            iedc = self.iedc,
+            delta_i = self.delta_i,
+            dmax_cal = self.dmax_cal
+        )
+        draft.create_draft(spec = self.spec, options = self.options)
+        draft.winding_list[0].turns = self.turns[0]
+        draft.winding_list[1].turns = self.turns[1]
+        draft.update_draft_windings()
+        return draft
+
+    def __str__(self):
+        turns_list, _, _ = self.winding_values()
+        return f"TurnsSolution: turns = {turns_list}, lg = {self.lg}, dmax = {self.dmax_cal}, {'strict' if self.strict else 'tolerant'}"
@@ -92,7 +92,8 @@ class TransformerOption:
                 #  delta_u: float = None,
                  turn_check_tolerance_b = 0.05,
                  turn_check_tolerance_d = 0,
-                 turn_use_tolerance = True
+                 turn_use_tolerance = True,
+                 record_trace = False
     ):
         # self.ji_list = ji_list
         # self.kf = kf
@@ -101,6 +102,7 @@ class TransformerOption:
         self.turn_check_tolerance_b = turn_check_tolerance_b
         self.turn_check_tolerance_d = turn_check_tolerance_d
         self.turn_use_tolerance = turn_use_tolerance
+        self.record_trace = record_trace   # keep the per-iteration record of the turns search in TransformerDraft.trace
     
 
     def __str__(self):
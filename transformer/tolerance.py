@@ -0,0 +1,176 @@
+import numpy as np
+from utils.formulae import calculate_gap, d_formula, calculate_iedc, calculate_deltai, calculate_ippk, calculate_b
+from utils.log import get_logger
+
+logger = get_logger(__name__)
+
+# Distributions of ToleranceSpec
+TOLERANCE_UNIFORM = "uniform"    # nominal * (1 + U(-tol, +tol))
+TOLERANCE_NORMAL = "normal"      # nominal * (1 + N(0, tol / 3)), i.e. tol is the 3-sigma spread
+
+# Checks of ToleranceResult.passes
+TOLERANCE_CHECKS = ("duty", "b_sat", "delta_b", "al")
+
+
+class ToleranceSpec:
+    """
+    Relative spread of the parameters sampled by monte_carlo_tolerance, e.g. al = 0.25 for ±25 % AL.
+    A spread of 0 keeps the parameter at its nominal value.
+
+    Attributes:
+        al (float): Spread of AL, Core.al_value. (doc: AL)
+        core_area (float): Spread of Ae, Core.core_area. (doc: Ae)
+        lm (float): Spread of Lm, TransformerSpec.lm.
+        b_sat (float): Spread of Bsat, Material.b_sat. (doc: Bsat)
+        vp (float): Spread of the primary voltage, TransformerSpec.vp.
+        fs (float): Spread of the switching frequency, TransformerSpec.fs.
+        distribution (str): "uniform" or "normal".
+    """
+    def __init__(
+            self,
+            al: float = 0.25,
+            core_area: float = 0.03,
+            lm: float = 0.1,
+            b_sat: float = 0.05,
+            vp: float = 0.0,
+            fs: float = 0.0,
+            distribution: str = TOLERANCE_UNIFORM
+    ):
+        self.al = al
+        self.core_area = core_area
+        self.lm = lm
+        self.b_sat = b_sat
+        self.vp = vp
+        self.fs = fs
+        self.distribution = distribution
+        self._validate()
+
+    def _validate(self):
+        if self.distribution not in (TOLERANCE_UNIFORM, TOLERANCE_NORMAL):
+            raise ValueError(f"Unknown tolerance distribution '{self.distribution}'. Use '{TOLERANCE_UNIFORM}' or '{TOLERANCE_NORMAL}'.")
+        for key in ("al", "core_area", "lm", "b_sat", "vp", "fs"):
+            if not 0 <= getattr(self, key) < 1:
+                raise ValueError(f"The {key} tolerance must be in [0, 1).")
+
+    def sample(self, rng: np.random.Generator, key: str, nominal, n: int) -> np.ndarray:
+        """
+        n draws of nominal * (1 + e), e from the configured distribution. A missing nominal gives NaN.
+        """
+        if nominal is None:
+            return np.full(n, np.nan)
+        tol = getattr(self, key)
+        if tol == 0:
+            return np.full(n, float(nominal))
+        if self.distribution == TOLERANCE_UNIFORM:
+            e = rng.uniform(-tol, tol, n)
+        else:
+            e = rng.normal(0.0, tol / 3, n)
+        return nominal * (1 + e)
+
+
+class ToleranceResult:
+    """
+    Outcome of monte_carlo_tolerance. Every array has one entry per sample.
+
+    Attributes:
+        turns (tuple): Primary and main secondary turns that were checked (doc: N0, N1)
+        samples (dict[str, np.ndarray]): Sampled al, core_area, lm, b_sat, vp and fs.
+        duty (np.ndarray): Duty ratio.
+        bmax (np.ndarray): Peak flux density [T].
+        delta_b (np.ndarray): Flux density swing [T].
+        lg (np.ndarray): Air gap needed for Lm [m]. (doc: lg)
+        passes (dict[str, np.ndarray]): Mask of the samples that pass each check, see TOLERANCE_CHECKS.
+    """
+    def __init__(self, turns: tuple, samples: dict, duty, bmax, delta_b, lg, passes: dict):
+        self.turns = turns
+        self.samples = samples
+        self.duty = duty
+        self.bmax = bmax
+        self.delta_b = delta_b
+        self.lg = lg
+        self.passes = passes
+
+    def __len__(self):
+        return len(self.duty)
+
+    @property
+    def ok(self) -> np.ndarray:
+        return np.logical_and.reduce([self.passes[key] for key in TOLERANCE_CHECKS])
+
+    @property
+    def yield_rate(self) -> float:
+        # Share of the samples that pass every check.
+        return float(np.count_nonzero(self.ok)) / len(self) if len(self) else 0.0
+
+    def check_rates(self) -> dict[str, float]:
+        return {key: float(np.count_nonzero(self.passes[key])) / len(self) for key in TOLERANCE_CHECKS}
+
+    def percentiles(self, key: str, q = (0.1, 50, 99.9)) -> dict:
+        # e.g. percentiles("lg") for the gap a production lot would need.
+        values = getattr(self, key)
+        return dict(zip(q, (float(v) for v in np.percentile(values, q))))
+
+    def to_dict(self) -> dict:
+        return {
+            "turns": [float(n) for n in self.turns],
+            "samples": len(self),
+            "yield": self.yield_rate,
+            "check_rates": self.check_rates(),
+            **{key: self.percentiles(key) for key in ("duty", "bmax", "delta_b", "lg")}
+        }
+
+    def __str__(self):
+        rates = ", ".join(f"{key} {rate:.2%}" for key, rate in self.check_rates().items())
+        return f"Tolerance analysis of turns {self.turns}: yield {self.yield_rate:.2%} over {len(self)} samples ({rates})"
+
+
+def monte_carlo_tolerance(solution, tolerance: ToleranceSpec = None, samples: int = 100000, seed: int = None) -> ToleranceResult:
+    """
+    Re-check a turns solution against part-to-part spread, vectorized over all samples.
+    Each sample draws AL, Ae, Lm, Bsat (and optionally Vp, fs) and re-evaluates the duty, Bmax, ΔB and gap with the
+    formulae of the turns search. A sample passes when the duty stays within d_max, Bmax below Bsat, ΔB within
+    the material's ΔB and AL * N0^2 reaches Lm (as in the prefilter, a gap only lowers the inductance).
+    Checks whose limit or data is missing (no ΔB, no AL) pass.
+
+    Parameters:
+        solution (TurnsSolution | TransformerDraft): The design to check, with spec, core and material set.
+        tolerance (ToleranceSpec, optional): Parameter spread. Defaults to ToleranceSpec().
+        samples (int): Number of samples.
+        seed (int, optional): Seed for reproducible runs.
+
+    Returns:
+        ToleranceResult
+    """
+    tolerance = tolerance or ToleranceSpec()
+    spec, core, material = solution.spec, solution.core, solution.material
+    turns = tuple(solution.turns) if hasattr(solution, "turns") else (solution.winding_list[0].turns, solution.winding_list[1].turns)
+    n0, n1 = float(turns[0]), float(turns[1])
+    rng = np.random.default_rng(seed)
+
+    s = {
+        "al": tolerance.sample(rng, "al", core.al_value, samples),
+        "core_area": tolerance.sample(rng, "core_area", core.core_area, samples),
+        "lm": tolerance.sample(rng, "lm", spec.lm, samples),
+        "b_sat": tolerance.sample(rng, "b_sat", material.b_sat, samples),
+        "vp": tolerance.sample(rng, "vp", spec.vp, samples),
+        "fs": tolerance.sample(rng, "fs", spec.fs, samples)
+    }
+
+    # Same chain as TransformerDraft._evaluate_turns_grid
+    duty = d_formula(spec.topology)(vpri = s["vp"], vsec = spec.vsec_main, primary_turns = n0, secondary_turns = n1)
+    iedc = calculate_iedc(pin = spec.pin, vin = s["vp"], d = duty)
+    delta_i = calculate_deltai(vin = s["vp"], d = duty, lm = s["lm"], fs = s["fs"])
+    ippk = calculate_ippk(iedc = iedc, deltai = delta_i)
+    bmax = calculate_b(inductance = s["lm"], current = ippk, core_area = s["core_area"], turns = n0)
+    delta_b = calculate_b(voltage = s["vp"], duty = duty, freq = s["fs"], core_area = s["core_area"], turns = n0)
+    lg = calculate_gap(turns = n0, core_area = s["core_area"], lm = s["lm"])
+
+    passes = {
+        "duty": duty <= spec.d_max,
+        "b_sat": (bmax < s["b_sat"]) if material.b_sat is not None else np.ones(samples, dtype = bool),
+        "delta_b": (delta_b <= material.delta_b) if material.delta_b is not None else np.ones(samples, dtype = bool),
+        "al": ~(s["al"] * n0 ** 2 < s["lm"])
+    }
+    result = ToleranceResult(turns = (n0, n1), samples = s, duty = duty, bmax = bmax, delta_b = delta_b, lg = lg, passes = passes)
+    logger.info("%s", result)
+    return result
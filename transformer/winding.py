@@ -1,6 +1,89 @@
+import numpy as np
+
+# Numeric per-winding fields stored column-wise in a WindingTable. Unset values are NaN.
+WINDING_FIELDS = ("turns_ratio", "turns", "i_rms", "wire_diameter", "load_occupying_factor", "wire_area", "layers")
+
+class WindingTable:
+    """
+    Struct-of-arrays storage for all windings of one transformer draft.
+    All numeric fields live in a single (field, winding) float64 array. Each field is exposed as a row view
+    indexed by winding (0 is the primary), so solvers can read e.g. table.i_rms or table.turns directly
+    without copying them out of Winding objects. Unset values are stored as NaN and read back as None through Winding.
+
+    Attributes:
+        role (list[str]): 'primary' or 'secondary' for each winding.
+        turns_ratio, turns, i_rms, wire_diameter, load_occupying_factor, wire_area, layers (np.ndarray):
+            One entry per winding, see Winding for the meaning of each field.
+    """
+    __slots__ = ("role", "_values")
+
+    def __init__(self, size: int = 0):
+        self.role = [None] * size
+        self._values = np.full((len(WINDING_FIELDS), size), np.nan)
+
+    def __len__(self):
+        return len(self.role)
+
+    @classmethod
+    def from_windings(cls, windings: list["Winding"]) -> "WindingTable":
+        table = cls(len(windings))
+        for i, winding in enumerate(windings):
+            table.role[i] = winding.role
+            table._values[:, i] = winding._table._values[:, winding._index]
+        return table
+
+    def append(self, winding: "Winding") -> int:
+        """
+        Add a copy of winding's values as the last column and return its index.
+        Existing Winding views stay valid; row views taken before (e.g. table.turns) do not see the new winding.
+        """
+        self.role.append(winding.role)
+        self._values = np.concatenate((self._values, winding._table._values[:, [winding._index]]), axis = 1)
+        return len(self) - 1
+
+    def views(self) -> tuple["Winding", ...]:
+        return tuple(Winding._view(self, i) for i in range(len(self)))
+
+
+def _table_column(row: int):
+    def getter(self):
+        return self._values[row]
+
+    return property(getter)
+
+for _row, _field in enumerate(WINDING_FIELDS):
+    setattr(WindingTable, _field, _table_column(_row))
+
+
+def whole_turns(value):
+    """
+    Turns count as an int when it is a whole number (the table stores every field as float64), otherwise unchanged.
+    """
+    if isinstance(value, (float, np.floating)) and np.isfinite(value) and float(value).is_integer():
+        return int(value)
+    return value
+
+
+def _winding_field(name: str, convert = None):
+    row = WINDING_FIELDS.index(name)
+
+    def getter(self):
+        value = self._table._values[row, self._index].item()
+        if np.isnan(value):
+            return None
+        return convert(value) if convert else value
+
+    def setter(self, value):
+        self._table._values[row, self._index] = np.nan if value is None else value
+
+    return property(getter, setter)
+
+
 class Winding:
     """
     Represents a winding (primary or secondary) in a transformer.
+    A Winding is a thin view over one row of a WindingTable. A standalone Winding owns a one-row table;
+    once it is handed to a TransformerDraft it is rebound to the draft's table.
 
     Attributes:
         role (str): 'primary' or 'secondary'. Used for identification.
@@ -15,6 +98,8 @@ class Winding:
         wire_area (float): Cross-sectional area of the wire [m²]. (doc: WAi)
         layers (float): Number of wire layers in bobbin window. (doc: mi)
     """
+    __slots__ = ("_table", "_index")
+
     def __init__(
         self,
         role: str = None,
@@ -29,6 +114,8 @@ class Winding:
         wire_area: float = None,
         layers: float = None,
     ):
+        self._table = WindingTable(1)
+        self._index = 0
         self.role = role
         # self.voltage = voltage
         # self.current = current
@@ -43,15 +130,37 @@ class Winding:
 
         self._validate()
 
+    @classmethod
+    def _view(cls, table: WindingTable, index: int) -> "Winding":
+        winding = cls.__new__(cls)
+        winding._table = table
+        winding._index = index
+        return winding
+
+    @property
+    def role(self):
+        return self._table.role[self._index]
+
+    @role.setter
+    def role(self, value):
+        self._table.role[self._index] = value
+
+    turns_ratio = _winding_field("turns_ratio")
+    turns = _winding_field("turns", convert = whole_turns)
+    i_rms = _winding_field("i_rms")
+    wire_diameter = _winding_field("wire_diameter")
+    load_occupying_factor = _winding_field("load_occupying_factor")
+    wire_area = _winding_field("wire_area")
+    layers = _winding_field("layers")
+
     def _validate(self):
         # TODO: validate if the winding is reasonable
-        if self.role == "primary" and self.current != None:
-            raise ValueError("The current attribute for primary winding must be None.")
-        if self.role == "primary" and self.turns_ratio != 1:
+        # The primary's turns ratio is left None by the turns designer, so only other values are rejected.
+        if self.role == "primary" and self.turns_ratio not in (None, 1):
             raise ValueError("The turns ratio of the primary to itself must be 1")
         if self.role == "primary" and self.load_occupying_factor != None:
             raise ValueError("The primary winding do not own a load occupying factor.")
-        
+
     def __str__(self):
         return (
             "----------------------------------------------\n"
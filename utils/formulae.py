@@ -1,43 +1,114 @@
+import functools
 import numpy as np
 from utils.constants import MU_0
 
+# Entries kept per memoized formula, see memoize_scalar
+FORMULA_CACHE_SIZE = 4096
+
+def _is_scalar(value) -> bool:
+    # Python and NumPy scalars (and None) are hashable; arrays, including 0-d arrays, are not.
+    return value is None or isinstance(value, (int, float, str, np.number))
+
+def memoize_scalar(fn):
+    """
+    LRU-cache fn for calls whose arguments are all scalars (the repeated calls inside the search loops).
+    Calls with array arguments skip the cache and evaluate fn directly, so the function still broadcasts.
+    The cache is exposed as fn.cache_info() / fn.cache_clear().
+    """
+    cached = functools.lru_cache(maxsize = FORMULA_CACHE_SIZE)(fn)
+
+    @functools.wraps(fn)
+    def wrapper(*args, **kwargs):
+        if all(map(_is_scalar, args)) and all(map(_is_scalar, kwargs.values())):
+            return cached(*args, **kwargs)
+        return fn(*args, **kwargs)
+
+    wrapper.cache_info = cached.cache_info
+    wrapper.cache_clear = cached.cache_clear
+    wrapper.uncached = fn
+    return wrapper
+
 def calculate_gap(turns, core_area, lm):
     return ((turns **2) * MU_0 * core_area) / lm
 
-def calculate_minimum_turns(core_area,
-                           lm = None,
-                           ipk = None,
-                           delta_i = None,
-                           b_sat = None,
-                           delta_b = None,
-                           voltage = None,
-                           f_sw = None,
-                           duty = None
-                           ):
+def minimum_turns_product(lm = None, ipk = None, delta_i = None, b_sat = None, delta_b = None, voltage = None, f_sw = None, duty = None):
+    """
+    N * Ae of the first calculation path of calculate_minimum_turns that has all its inputs.
+    Every path is proportional to 1 / Ae, so this picks the path once and the result serves any number of core areas.
+
+    Returns:
+        Minimum primary turns times core area [m²]
+
+    Raises:
+        ValueError: If no calculation path has all its inputs
+    """
     # --- Case 1: Use peak current and peak flux density ---
     if lm is not None and ipk is not None and b_sat is not None:
-        return (lm * ipk) / (b_sat * core_area)
+        return (lm * ipk) / b_sat
 
     # --- Case 2: Use ripple current and flux swing ---
     elif lm is not None and delta_i is not None and delta_b is not None:
-        return (lm * delta_i) / (delta_b * core_area)
+        return (lm * delta_i) / delta_b
 
     # --- Case 3: Use volt-second product and flux swing ---
     elif voltage is not None and f_sw is not None and duty is not None and delta_b is not None:
-        return (voltage * duty) / (delta_b * core_area * f_sw)
+        return (voltage * duty) / (delta_b * f_sw)
 
     else:
         raise ValueError("Insufficient or inconsistent inputs for any valid calculation path.")
 
+@memoize_scalar
+def calculate_minimum_turns(core_area,
+                           lm = None,
+                           ipk = None,
+                           delta_i = None,
+                           b_sat = None,
+                           delta_b = None,
+                           voltage = None,
+                           f_sw = None,
+                           duty = None
+                           ):
+    # Broadcasts over array inputs, e.g. core_area of a whole core repository.
+    product = minimum_turns_product(lm = lm, ipk = ipk, delta_i = delta_i, b_sat = b_sat, delta_b = delta_b, voltage = voltage, f_sw = f_sw, duty = duty)
+    return product / core_area
+
 
 # def calculate_minimum_tuns(lm, ilim, b_sat, core_area):
 #     return (lm * ilim) / (b_sat * core_area)
 
+def _irms_with_ref_flyback(irms_0, kl, turns_ratio, d_max):
+    return irms_0 * np.sqrt((1 - d_max) / d_max) * kl / turns_ratio
+
+def _irms_with_ref_forward(irms_0, kl, turns_ratio, d_max):
+    return irms_0 * kl / turns_ratio
+
+_IRMS_WITH_REF_FORMULAE = {
+    "flyback": _irms_with_ref_flyback,
+    "forward": _irms_with_ref_forward
+}
+
+def irms_with_ref_formula(topology: str):
+    """
+    Topology-specific form of calculate_irms_with_ref, f(irms_0, kl, turns_ratio, d_max).
+    Look it up once outside a loop; the returned function broadcasts over NumPy inputs.
+    """
+    try:
+        return _IRMS_WITH_REF_FORMULAE[topology]
+    except KeyError:
+        raise ValueError(f"{topology} topology not implemented") from None
+
+@memoize_scalar
 def calculate_irms_with_ref(irms_0, kl, turns_ratio, d_max, topology):
-    if topology == "flyback":
-        return irms_0 * np.sqrt((1 - d_max) / d_max) * kl / turns_ratio
-    elif topology == "forward":
-        return irms_0 * kl / turns_ratio
+    return irms_with_ref_formula(topology)(irms_0, kl, turns_ratio, d_max)
+
+def calculate_irms_dcm_secondary(ipk, kl, turns_ratio, lm, fs, vsec, main_turns_ratio):
+    """
+    RMS current of a flyback secondary in DCM, where calculate_irms_with_ref no longer applies.
+    The secondary current falls from Ipk / n to zero within D2 = Lm * Ipk * fs * n0 / Vs (n0 and Vs of the main
+    secondary), so Irms = KL * (Ipk / n) * sqrt(D2 / 3). Turns ratios are Ns / Np. Broadcasts over NumPy inputs.
+    """
+    d2 = lm * ipk * fs * main_turns_ratio / vsec
+    return kl * (ipk / turns_ratio) * np.sqrt(d2 / 3)
 
 def calculate_turns_with_ratio(turns_ratio, ref_turns):
     return turns_ratio * ref_turns
@@ -45,18 +116,17 @@ def calculate_turns_with_ratio(turns_ratio, ref_turns):
 def calculate_wire_area(irms, j):
     return irms / j
 
-def calculate_b(inductance, current, turns, core_area):
-    return (inductance * current) / (turns * core_area)
-
+@memoize_scalar
 def calculate_b(turns, core_area, inductance = None, current = None, voltage = None, freq = None, duty = None):
     """
     Calculates flux density B using either:
     - inductance & current, or
-    - volt-second method: voltage * time
+    - volt-second method: voltage * duty / freq
+    Broadcasts over NumPy inputs.
 
     Parameters:
-        turns (int): Number of turns (N)
-        core_area (float): Core cross-sectional area (A_core)
+        turns (int | np.ndarray): Number of turns (N)
+        core_area (float | np.ndarray): Core cross-sectional area (A_core)
         inductance (float, optional): Inductance (L)
         current (float, optional): Current (I)
         voltage (float, optional): Voltage (V)
@@ -64,26 +134,43 @@ def calculate_b(turns, core_area, inductance = None, current = None, voltage = N
         duty (float, optional): Duty (dimensionless)
 
     Returns:
-        float: Calculated B in Tesla
+        float | np.ndarray: Calculated B in Tesla
 
     Raises:
         ValueError: If required parameters are missing or inconsistent
     """
     if inductance is not None and current is not None:
         return (inductance * current) / (turns * core_area)
-    elif voltage is not None and freq is not None:
+    elif voltage is not None and freq is not None and duty is not None:
         return (voltage * duty) / (turns * core_area * freq)
     else:
-        raise ValueError("Insufficient parameters: need (inductance and current) or (voltage and time)")
+        raise ValueError("Insufficient parameters: need (inductance and current) or (voltage, freq and duty)")
+
+
+def _d_flyback(vpri, vsec, primary_turns, secondary_turns):
+    return (vsec * primary_turns) / ((vpri * secondary_turns) + (vsec * primary_turns))
 
+def _d_forward(vpri, vsec, primary_turns, secondary_turns):
+    return (vsec * primary_turns) / (vpri * secondary_turns)
 
+_D_FORMULAE = {
+    "flyback": _d_flyback,
+    "forward": _d_forward
+}
+
+def d_formula(topology: str):
+    """
+    Topology-specific form of calculate_d, f(vpri, vsec, primary_turns, secondary_turns).
+    Look it up once outside a loop; the returned function broadcasts over NumPy inputs.
+    """
+    try:
+        return _D_FORMULAE[topology]
+    except KeyError:
+        raise ValueError(f"{topology} topology not implemented") from None
+
+@memoize_scalar
 def calculate_d(vpri, vsec, primary_turns, secondary_turns, topology):
-    if topology == "flyback":
-        return (vsec * primary_turns) / ((vpri * secondary_turns) + (vsec * primary_turns))
-    elif topology == "forward":
-        return (vsec * primary_turns) / (vpri * secondary_turns)
-    else:
-        raise ValueError(f"{topology} topology not implemented")
+    return d_formula(topology)(vpri, vsec, primary_turns, secondary_turns)
 
 def calculate_iedc(pin, vin, d):
     return pin / (vin * d)
@@ -94,6 +181,7 @@ def calculate_deltai(vin, d, lm, fs):
 def calculate_ippk(iedc, deltai):
     return 0.5 * deltai + iedc
 
+@memoize_scalar
 def calculate_irms(iedc, deltai, d):
     return np.sqrt((iedc ** 2 + ((deltai ** 2) / 12)) * d)
 
@@ -0,0 +1,40 @@
+import importlib
+from utils.log import get_logger
+
+logger = get_logger(__name__)
+
+class LazyModule:
+    """
+    Stand-in for a heavy module that is imported on first attribute access.
+    Use it in place of a module-level import, e.g. cp = lazy_import("cvxpy"), so that importing this
+    package stays cheap and sessions that never touch the dependency never load it.
+    A missing dependency raises ImportError at first use, naming the feature that needs it.
+    """
+    def __init__(self, name: str, needed_for: str = None):
+        self._name = name
+        self._needed_for = needed_for
+        self._module = None
+
+    @property
+    def loaded(self) -> bool:
+        return self._module is not None
+
+    def load(self):
+        if self._module is None:
+            try:
+                self._module = importlib.import_module(self._name)
+            except ImportError as e:
+                reason = f" It is needed for {self._needed_for}." if self._needed_for else ""
+                raise ImportError(f"Optional dependency '{self._name}' is not installed.{reason}") from e
+            logger.debug("Lazily imported %s", self._name)
+        return self._module
+
+    def __getattr__(self, attr):
+        return getattr(self.load(), attr)
+
+    def __repr__(self):
+        return f"<lazy module '{self._name}' ({'loaded' if self.loaded else 'not loaded'})>"
+
+
+def lazy_import(name: str, needed_for: str = None) -> LazyModule:
+    return LazyModule(name, needed_for)
@@ -0,0 +1,26 @@
+import logging
+
+ROOT_LOGGER_NAME = "transformerapp"
+
+# Silent by default: nothing is emitted until configure_logging is called.
+logging.getLogger(ROOT_LOGGER_NAME).addHandler(logging.NullHandler())
+
+def get_logger(name: str) -> logging.Logger:
+    """
+    Returns the per-module logger, e.g. get_logger(__name__) in transformer/tfdraft.py gives "transformerapp.transformer.tfdraft".
+    """
+    return logging.getLogger(f"{ROOT_LOGGER_NAME}.{name}")
+
+def configure_logging(level = logging.INFO, fmt: str = "[%(levelname)s] %(name)s: %(message)s"):
+    """
+    Attach a console handler to the application loggers. Calling it again only updates the level and format.
+    """
+    root = logging.getLogger(ROOT_LOGGER_NAME)
+    root.setLevel(level)
+    handler = next((h for h in root.handlers if getattr(h, "_transformerapp_console", False)), None)
+    if handler is None:
+        handler = logging.StreamHandler()
+        handler._transformerapp_console = True
+        root.addHandler(handler)
+    handler.setFormatter(logging.Formatter(fmt))
+    return root
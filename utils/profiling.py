@@ -0,0 +1,170 @@
+import cProfile
+import functools
+import io
+import pstats
+import threading
+import time
+from contextlib import contextmanager
+from utils.lazy import lazy_import
+from utils.log import get_logger
+
+logger = get_logger(__name__)
+pyinstrument = lazy_import("pyinstrument", needed_for = "the pyinstrument capture mode")
+
+# Capture modes of StageProfiler.capture_next
+PROFILE_CAPTURE_CPROFILE = "cprofile"
+PROFILE_CAPTURE_PYINSTRUMENT = "pyinstrument"
+PROFILE_CAPTURE_MODES = (PROFILE_CAPTURE_CPROFILE, PROFILE_CAPTURE_PYINSTRUMENT)
+# Lines of the cProfile report kept in StageProfiler.last_capture
+PROFILE_REPORT_LINES = 40
+
+# Stages of a design session, in pipeline order (STAGE_WORKSPACE wraps a whole headless run)
+STAGE_WORKSPACE = "workspace"
+STAGE_REPO_LOAD = "repo_load"
+STAGE_SPEC_SUBMIT = "spec_submit"
+STAGE_CIRCUIT = "circuit"
+STAGE_N0_MIN = "n0_min"
+STAGE_TURNS_SEARCH = "turns_search"
+STAGE_WINDINGS = "windings"
+STAGE_WIRE_FIT = "wire_fit"
+
+# Innermost open stage per thread, so solver_timed can charge its time without being handed the profiler.
+_local = threading.local()
+
+
+class StageStats:
+    """
+    Timings of one stage.
+
+    Attributes:
+        name (str): Stage name.
+        calls (int): Number of times the stage ran.
+        wall_time (float): Total wall time [s], including nested stages.
+        solver_time (float): Part of wall_time spent in the wire solvers [s].
+        last_time (float): Wall time of the latest run [s].
+    """
+    __slots__ = ("name", "calls", "wall_time", "solver_time", "last_time")
+
+    def __init__(self, name: str):
+        self.name = name
+        self.calls = 0
+        self.wall_time = 0.0
+        self.solver_time = 0.0
+        self.last_time = 0.0
+
+    def to_dict(self) -> dict:
+        return {"calls": self.calls, "wall_time": self.wall_time, "solver_time": self.solver_time, "last_time": self.last_time}
+
+
+class StageProfiler:
+    """
+    Opt-in per-stage timing of a design session. Disabled, stage() costs one attribute check.
+
+        with state.profiler.stage(STAGE_TURNS_SEARCH):
+            solutions = draft.determine_draft_turns()
+
+    capture_next(mode) additionally runs the next top-level stage under cProfile or pyinstrument and keeps the report
+    in last_capture.
+
+    Attributes:
+        enabled (bool): Record timings.
+        stages (dict[str, StageStats]): Stats per stage, in first-run order.
+        last_capture (str): Report of the latest capture run, None if there was none.
+    """
+    def __init__(self, enabled: bool = False):
+        self.enabled = enabled
+        self.stages = {}
+        self.last_capture = None
+        self._capture_mode = None
+        self._lock = threading.Lock()
+
+    def reset(self):
+        with self._lock:
+            self.stages = {}
+            self.last_capture = None
+
+    def capture_next(self, mode: str = PROFILE_CAPTURE_CPROFILE):
+        if mode not in PROFILE_CAPTURE_MODES:
+            raise ValueError(f"Unknown capture mode '{mode}'. Use one of {list(PROFILE_CAPTURE_MODES)}.")
+        self._capture_mode = mode
+
+    @contextmanager
+    def stage(self, name: str):
+        if not self.enabled:
+            yield
+            return
+        stack = getattr(_local, "stack", None)
+        if stack is None:
+            stack = _local.stack = []
+        with self._lock:
+            stats = self.stages.get(name)
+            if stats is None:
+                stats = self.stages[name] = StageStats(name)
+        capture_mode, capture = None, None
+        if not stack and self._capture_mode is not None:
+            capture_mode, self._capture_mode = self._capture_mode, None
+            capture = self._start_capture(capture_mode)
+        stack.append(stats)
+        start = time.perf_counter()
+        try:
+            yield stats
+        finally:
+            elapsed = time.perf_counter() - start
+            stack.pop()
+            stats.calls += 1
+            stats.wall_time += elapsed
+            stats.last_time = elapsed
+            if capture is not None:
+                self.last_capture = self._stop_capture(capture_mode, capture, name)
+            logger.debug("Stage %s took %.6f s", name, elapsed)
+
+    def _start_capture(self, mode: str):
+        if mode == PROFILE_CAPTURE_PYINSTRUMENT:
+            profiler = pyinstrument.Profiler()
+            profiler.start()
+        else:
+            profiler = cProfile.Profile()
+            profiler.enable()
+        return profiler
+
+    def _stop_capture(self, mode: str, profiler, name: str) -> str:
+        if mode == PROFILE_CAPTURE_PYINSTRUMENT:
+            profiler.stop()
+            return f"pyinstrument capture of stage '{name}':\n" + profiler.output_text()
+        profiler.disable()
+        out = io.StringIO()
+        pstats.Stats(profiler, stream = out).sort_stats("cumulative").print_stats(PROFILE_REPORT_LINES)
+        return f"cProfile capture of stage '{name}':\n" + out.getvalue()
+
+    def to_dict(self) -> dict:
+        return {name: stats.to_dict() for name, stats in self.stages.items()}
+
+    def report(self) -> str:
+        if not self.stages:
+            return "No stage timings recorded."
+        lines = [f"{'stage':<16}{'calls':>7}{'total [ms]':>13}{'last [ms]':>12}{'solver [ms]':>13}"]
+        for stats in self.stages.values():
+            lines.append(f"{stats.name:<16}{stats.calls:>7}{stats.wall_time * 1e3:>13.3f}{stats.last_time * 1e3:>12.3f}{stats.solver_time * 1e3:>13.3f}")
+        return "\n".join(lines)
+
+    def __str__(self):
+        return self.report()
+
+
+def solver_timed(fn):
+    """
+    Charge the time spent in fn to the innermost open stage of this thread as solver time.
+    Costs one lookup when no stage is open.
+    """
+    @functools.wraps(fn)
+    def wrapper(*args, **kwargs):
+        stack = getattr(_local, "stack", None)
+        if not stack:
+            return fn(*args, **kwargs)
+        stats = stack[-1]
+        start = time.perf_counter()
+        try:
+            return fn(*args, **kwargs)
+        finally:
+            stats.solver_time += time.perf_counter() - start
+    return wrapper
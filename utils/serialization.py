@@ -0,0 +1,13 @@
+import numpy as np
+
+def make_yaml_serializable(obj):
+    if isinstance(obj, np.ndarray):
+        return obj.tolist()
+    elif isinstance(obj, (np.float32, np.float64, np.int32, np.int64, np.bool_)):
+        return obj.item()
+    elif isinstance(obj, dict):
+        return {k: make_yaml_serializable(v) for k, v in obj.items()}
+    elif isinstance(obj, (list, tuple)):
+        return [make_yaml_serializable(v) for v in obj]
+    else:
+        return obj